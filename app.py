@@ -1,17 +1,74 @@
 import os
 import json
+import contextvars
+import queue
+import threading
 import random
+import bisect
+import gc
+import heapq
+import inspect
+import sys
+import time
+import traceback
+from array import array
+from collections import Counter, deque
+from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, render_template, request # Removed unused 'session' import
+from flask import Flask, jsonify, render_template, request # Removed unused 'session' import
+from jinja2 import FileSystemBytecodeCache
 from flask_socketio import SocketIO, emit, join_room, leave_room
+from socketio import PubSubManager
 import eventlet # Recommended for stability
+import eventlet.queue
+from eventlet import tpool
 import socket
 
 # --- Basic Setup ---
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'a_super_secret_key_change_me!')
+
+# === SCALE-OUT ===
+# One eventlet process is one core and hosts one venue. router.py runs several of these and pins
+# each room code (and its phones) to one worker. Room names carry the code, and with
+# HFF_MESSAGE_QUEUE set every emit also goes through the queue, so other processes can reach a venue.
+ROOM_CODE_LETTERS = 'BCDFGHJKLMNPQRSTVWXZ' # No vowels (no accidental words) and no 0/O or 1/I
+ROOM_CODE = (os.environ.get('HFF_ROOM_CODE') or ''.join(random.choices(ROOM_CODE_LETTERS, k=4))).upper()
+MESSAGE_QUEUE = os.environ.get('HFF_MESSAGE_QUEUE') # e.g. redis://localhost:6379/0, or local:// for the in-process stand-in
+SERVER_PORT = int(os.environ.get('HFF_PORT', '5000'))
+# eventlet (default) or threading. asgi.py runs the engine in threading mode behind python-socketio's AsyncServer.
+ASYNC_MODE = os.environ.get('HFF_ASYNC_MODE', 'eventlet')
+# HFF_RANDOM_SEED makes question picks and shuffles repeat, so benchmark runs play the same games
+if os.environ.get('HFF_RANDOM_SEED'): random.seed(int(os.environ['HFF_RANDOM_SEED']))
+
+def new_queue():
+    """A queue that blocks the right way for ASYNC_MODE (a greenlet under eventlet, a thread otherwise)."""
+    return eventlet.queue.LightQueue() if ASYNC_MODE == 'eventlet' else queue.Queue()
+
+class LocalQueueManager(PubSubManager):
+    """In-process stand-in for the Redis queue (HFF_MESSAGE_QUEUE=local://). A manager's publishes come back
+    through its own listener, which exercises the queue path in tests without a broker."""
+    name = 'local'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.subscribers = [] # Per manager, so separate SocketIO instances never see each other's emits
+
+    def _publish(self, data):
+        message = json.dumps(data)
+        for inbox in self.subscribers: inbox.put(message)
+
+    def _listen(self):
+        inbox = new_queue(); self.subscribers.append(inbox)
+        while True: yield inbox.get()
+
+socketio_queue_options = {}
+if MESSAGE_QUEUE == 'local://': socketio_queue_options['client_manager'] = LocalQueueManager()
+elif MESSAGE_QUEUE: socketio_queue_options['message_queue'] = MESSAGE_QUEUE
+
 # Use eventlet if installed: pip install eventlet
-socketio = SocketIO(app, async_mode='eventlet', cors_allowed_origins="*")
+socketio = SocketIO(app, async_mode=ASYNC_MODE, cors_allowed_origins="*", **socketio_queue_options)
 
 # === GAME CONFIG ===
 GAME_ROUNDS_TOTAL = 10
@@ -129,12 +186,24 @@ ROUND_TIMINGS = {
     'default': {
         'intro_card': 8,
         'turn_results': 7,
-        'round_summary': 12
+        'round_summary': 12,
+        # Screens advance as soon as the main screen reports display_done, but never before these
+        'intro_card_min': 3,
+        'turn_results_min': 3,
+        'round_summary_min': 5,
+        'team_reveal_min': 3,
+        # Recap card shown instead of an explainer everyone in the lobby has already heard
+        'explainer_recap': 8,
+        'explainer_recap_min': 5,
+        # Answer window per turn (0 = wait for everyone, as before)
+        'answer_deadline': 45
     },
     # Example of overriding a default for a specific round
     'higher_or_lower': {
         'intro_card': 12,
-        'turn_results': 10
+        'turn_results': 10,
+        'answer_deadline': 20,
+        'submission_deadline': 30 # The submitter's own number
     },
     'averagers_assemble': {
         'team_reveal': 8, # A custom timing for this round
@@ -142,39 +211,231 @@ ROUND_TIMINGS = {
     },
     'true_or_false': {
         'intro_card': 9,
+        'answer_deadline': 20
     },
     'tap_the_pic': {
         'intro_card': 9,
     },
     'quick_pairs': {
         'intro_card': 10,
+        'turn_results': 10,
+        'answer_deadline': 60
     },
     'the_top_three': {
         'intro_card': 11,
     },
     'who_didnt_do_it': {
         'intro_card': 12,
+    },
+    'order_up': {
+        'turn_results': 10,
+        'answer_deadline': 60
     }
 }
+# HFF_TIMING_SCALE shrinks every screen and deadline (e.g. 0.05 for load tests); 1 = real pacing
+TIMING_SCALE = float(os.environ.get('HFF_TIMING_SCALE', '1'))
+if TIMING_SCALE != 1:
+    for round_timings in ROUND_TIMINGS.values():
+        for timing_key in round_timings: round_timings[timing_key] *= TIMING_SCALE
+TURN_EXTENSION_SECONDS = 10 # Extra time granted when the deadline hits with most players answered
+TURN_EXTENSION_MIN_ANSWERED = 0.75 # Fraction of players that must have answered to earn an extension
+TURN_MAX_EXTENSIONS = 1 # Extensions per turn
 
 # === GAME STATE ===
 game_state = "waiting"
 current_game_round_num = 0
 selected_rounds_for_game = []
-overall_game_scores = {} # {sid: game_points}
-players = {} # {sid: {'name':'N', 'round_score':0, 'gta_guess':None, 'gty_guess':None}} # Removed WDDI fields
+overall_game_scores = {} # {pid: game_points} (mirrored, in rank order, by leaderboard)
+players = {} # {pid: Player}
+player_slots = [] # {slot: pid} (None = free). A player's slot indexes the turn answer arrays below
 main_screen_sid = None
-# Persistent identity maps (pid survives reconnects; sid does not)
+# All game state is keyed by the persistent pid sent by the controller. The socket sid only
+# lives in this routing table, so a reconnect just repoints two dict entries.
 pid_to_sid = {}   # {pid: sid}
 sid_to_pid = {}   # {sid: pid}
 
+class Player:
+    """Identity, connection and game/round score for one controller. Per-turn answers live in turn_answers."""
+    __slots__ = ('pid', 'slot', 'name', 'connected', 'disconnected_at', 'round_score')
+
+    def __init__(self, pid, slot, name):
+        self.pid = pid
+        self.slot = slot
+        self.name = name
+        self.connected = True
+        self.disconnected_at = None
+        self.round_score = 0
+
+# === TURN ANSWERS ===
+# Whatever round is running stores this turn's guess/submission per player slot. A new turn
+# just allocates fresh arrays (reset_turn_answers) instead of clearing a key on every player.
+turn_answers = [] # {slot: guess/submission} (None = not answered yet)
+turn_answer_times_ms = [] # {slot: completion time} (Quick Pairs tie-break)
+turn_open = False # Set by reset_turn_answers, cleared once the turn's results are processed
+# Every turn gets a new id. Prompts carry it and submissions echo it back, so an answer sent just
+# before a turn closed can't land on the turn that replaced it. (A Higher or Lower submitter's
+# number is matched by its 'turn' index instead, since it may be sent a turn ahead.)
+turn_id = 0
+TURN_PROMPT_EVENTS = {
+    'gta_player_prompt', 'gty_player_prompt', 'wddi_player_prompt', 'ou_player_prompt', 'qp_player_prompt',
+    'true_or_false_player_prompt', 'tap_the_pic_player_prompt', 'top_three_player_prompt', 'hol_guesser_prompt', 'aa_player_prompt'
+}
+
+# === TURN SCORING ===
+# Rounds with a fixed answer score each submission the moment it's accepted, against an answer
+# key worked out once when the turn starts. Closing the turn just awards the stored points.
+turn_answer_key = None # Canonical correct answer for this turn (shape depends on the round)
+turn_results = [] # {slot: result row for the results screen} (None = not answered)
+turn_tally = {'submitted': 0, 'answered': 0, 'correct': 0, 'histogram': {}, 'fastest_correct': None} # submitted = set_turn_answer calls, answered = scored rows; fastest_correct = (time_ms, pid)
+
+# === RESULT VIEWS ===
+# Results screens show the top RESULTS_TOP_N rows plus a bucketed answer distribution, so their
+# HTML stays the same size however many people play. Each phone is told its own rank instead.
+RESULTS_TOP_N = int(os.environ.get('HFF_RESULTS_TOP_N', '8')) # 8 fills the 2x4 results grid
+GTA_DIFF_BUCKETS = ((0, 'Spot on'), (1, '1-2 off'), (3, '3-5 off'), (6, '6-10 off'), (11, '11+ off'))
+GTY_DIFF_BUCKETS = ((0, 'Spot on'), (1, '1-5 off'), (6, '6-10 off'), (11, '11-25 off'), (26, '26+ off'))
+
+# === TURN DEADLINES ===
+# The server owns the clock for every answer window. A background watcher counts down and,
+# when time runs out, closes the turn itself so one idle phone can't stall the room.
+turn_deadline_token = 0 # Bumped on every new deadline/close; a watcher with an old token just exits
+turn_deadline_ends_at = None # time.monotonic() when the current window closes (None = no deadline)
+turn_deadline_extensions = 0
+deadline_stats = {'windows': 0, 'deadline_hits': 0, 'extensions': 0, 'missing_answers': 0}
+
+# === PRESENCE QUORUM ===
+# A turn completes once every *present* player has answered. A dropped phone still counts for
+# PRESENCE_GRACE_SECONDS so a quick reconnect keeps its turn; after that it no longer holds the room.
+PRESENCE_GRACE_SECONDS = 5
+
+# === SESSION EVICTION ===
+# Departed players are kept so they can rejoin, but only for SESSION_TTL_SECONDS. Between
+# games a sweeper drops anything older, so a server left running all week stays flat.
+SESSION_TTL_SECONDS = 15 * 60
+SESSION_SWEEP_INTERVAL = 60 # Seconds between background sweeps
+SESSION_SWEEP_STATES = ('waiting', 'overall_game_over') # Only evict between games
+sessions_evicted_total = 0
+
+# === PLAYER OUTBOUND LOG ===
+# Every event sent to a controller gets a global sequence number and is kept in a small
+# per-pid buffer, so a reconnecting phone can be replayed exactly what it missed.
+PLAYER_OUTBOX_SIZE = 64 # Events kept per player
+PLAYER_SCREEN_EVENTS = { # Events that fully (re)draw the controller screen
+    'gta_player_prompt', 'gta_wait_for_guesses', 'gty_player_prompt', 'gty_wait_for_guesses',
+    'wddi_player_prompt', 'ou_player_prompt', 'qp_player_prompt', 'true_or_false_player_prompt',
+    'tap_the_pic_player_prompt', 'top_three_player_prompt', 'hol_submitter_prompt', 'hol_guesser_prompt',
+    'hol_wait_prompt', 'aa_pick_teammate_prompt', 'aa_wait_prompt', 'aa_player_prompt',
+    'results_on_main_screen', 'overall_game_over_player'
+}
+outbound_seq = 0
+player_outboxes = {} # {pid: deque([(seq, event, payload), ...])}
+last_players_room_event = None # Latest (seq, event, payload) broadcast to everyone, for mid-game joiners
+
+# === LEADERBOARD ===
+# Game scores kept in rank order. Only score changes (award_game_points, joins, evictions, a new
+# game) touch it, so rank, top-N and rank-movement reads never re-sort the room.
+class Leaderboard:
+    """Sorted (-score, pid) keys plus each pid's score. Ranks are competition ranks (ties share one),
+    and rank_change compares against the order before the last award_game_points."""
+    __slots__ = ('keys', 'scores', 'previous_keys', 'previous_scores')
+
+    def __init__(self):
+        self.keys = []; self.scores = {}
+        self.previous_keys = []; self.previous_scores = {}
+
+    def reset(self, pids):
+        self.scores = {pid: 0 for pid in pids}
+        self.keys = sorted((0, pid) for pid in self.scores)
+        self.previous_keys = []; self.previous_scores = {}
+
+    def set(self, pid, score):
+        self.discard(pid)
+        self.scores[pid] = score
+        bisect.insort(self.keys, (-score, pid))
+
+    def discard(self, pid):
+        if pid not in self.scores: return
+        key = (-self.scores.pop(pid), pid)
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key: del self.keys[i]
+
+    def begin_award(self):
+        """Remembers the current order, so rank_change() reports movement caused by this award."""
+        self.previous_keys = list(self.keys); self.previous_scores = dict(self.scores)
+
+    def rank(self, pid):
+        return bisect.bisect_left(self.keys, (-self.scores[pid],)) + 1
+
+    def rank_change(self, pid):
+        """Places gained (positive) or lost since the last award; 0 for anyone not ranked then."""
+        if pid not in self.previous_scores or pid not in self.scores: return 0
+        return bisect.bisect_left(self.previous_keys, (-self.previous_scores[pid],)) + 1 - self.rank(pid)
+
+    def top(self, n=None):
+        """[(pid, score)] best first, for the first n places (everyone if n is None)."""
+        return [(pid, -negative_score) for negative_score, pid in (self.keys if n is None else self.keys[:n])]
+
+leaderboard = Leaderboard()
+
+# === MAIN SCREEN STATE SYNC ===
+# The main screen keeps a versioned copy of the non-HTML game state. We only send
+# what changed since the version it last acknowledged (full snapshot on connect/gap).
+GAME_STATE_DELTA_HISTORY = 32 # How many past deltas we keep to serve a lagging main screen
+game_state_version = 0
+game_state_sent_fields = {} # {field: value} as of game_state_version
+game_state_sent_scores = {} # {pid: {'name', 'game_score'}} as of game_state_version
+game_state_deltas = deque(maxlen=GAME_STATE_DELTA_HISTORY) # (version, fields, scores, removed), keyed by score key
+# A pid is the player's reconnect credential, so it never leaves the server: the main screen sees
+# each player's scores under an opaque key that is never reused.
+score_keys = {} # {pid: score key}
+next_score_key = 0
+score_dirty_pids = set() # Players whose name/score may have changed since the last update
+main_screen_acked_version = None # None = main screen needs a full snapshot
+main_screen_sent_version = None # Last version pushed to the main screen (acked or not)
+
+# === DISPLAY PACING ===
+# Every fragment sent to the main screen gets a display_id. The main screen answers with
+# display_ready once it is injected and display_done once its animations have finished.
+main_screen_display_id = 0 # Last fragment sent
+main_screen_display_ready_id = 0 # Last fragment the main screen has shown
+main_screen_display_done_id = 0 # Last fragment whose animations have finished
+display_hold_id = 0
+display_hold = None # The screen being held: {'id', 'display_id', 'timing_key', 'started', 'min_s', 'max_s', 'guard', 'then', 'args'}
+pacing_stats = {'holds': 0, 'advanced_on_ack': 0, 'hit_max': 0, 'seconds_held': 0.0}
+
+# === CUE TIMELINES ===
+# The intro, explainer and game-over sequences are sent as one timeline of timestamped cues.
+# The main screen runs them against its synced copy of the server clock (clock_sync) and the
+# server moves on by itself when the timeline ends - no "finished" handshake to lose.
+CUE_LEAD_SECONDS = 0.5 # Timelines start this far ahead so the first cue never arrives late
+INTRO_THEME_LEAD_SECONDS = 37 # Theme music plays alone this long before the announcer
+AUDIO_DURATION_FALLBACK = 30 # Used when an audio file can't be measured
+cue_timeline_id = 0
+cue_timeline_skipped_id = 0 # Last timeline the main screen can't play (muted), so there's nothing to wait for
+cue_timeline_waiter = None # (timeline_id, guard, then, args): the flow step to run when the timeline ends
+current_cue_timeline = None # Latest timeline payload, re-sent to a reconnecting main screen
+audio_durations = {} # {filename: seconds}
+
+# === EXPLAINER HISTORY ===
+# Explainers each player has already heard, kept for the life of the server so a regular
+# group isn't read the same rules every game. 'recap' shows the how-to-play card briefly
+# without audio, 'skip' goes straight to the round, 'full' always plays the explainer.
+EXPLAINER_REPEAT_MODE = os.environ.get('HFF_EXPLAINER_REPEAT', 'recap')
+explainers_heard = {} # {round_type: {pid, ...}}
+force_explainers = False # Host asked for full explainers this game
+explainer_stats = {'played': 0, 'recapped': 0, 'skipped': 0}
+
 # === GUESS THE AGE STATE ===
+# Lower totals win Guess the Age/Year, so a player who never answers (the deadline or the
+# presence quorum closed the turn) is charged the worst possible miss instead of nothing
+GTA_NO_ANSWER_DIFF = 120 # Top of the accepted 0-120 guess range
 gta_celebrities = []; gta_shuffled_celebrities_this_round = []
 gta_current_celebrity = None; gta_current_celebrity_index = -1; gta_actual_turns_this_round = 0
 
 # === GUESS THE YEAR STATE ===
 gty_questions = []; gty_shuffled_questions_this_round = []
 gty_current_question = None; gty_current_question_index = -1; gty_actual_turns_this_round = 0
+gty_year_span = 0 # Newest minus oldest year in the bank (set on load): the least a missing guess is charged
 
 # === WHO DIDN'T DO IT STATE ===
 wddi_questions = [] # Holds all loaded questions
@@ -183,7 +444,7 @@ wddi_current_question = None # Holds the question data for the current turn
 wddi_current_question_index = -1 # Index for the current turn within the round
 wddi_actual_turns_this_round = 0 # Number of turns/questions in this specific round (usually 10)
 wddi_current_shuffled_options = [] # Holds the shuffled options for the *current* turn
-# Note: We will add wddi_current_guess to the players dict later
+wddi_current_option_ids = [] # Option IDs in the same (shuffled) order
 
 # === ORDER UP STATE ===  # 
 ou_questions = []  # Holds all loaded "Order Up!" questions
@@ -192,6 +453,7 @@ ou_current_question_data = None # Holds the full data for the current turn's que
 ou_current_question_index = -1 # Index for the current turn/question
 ou_actual_turns_this_round = 0 # Number of turns for this round
 ou_current_items_to_order = None
+ou_current_item_ids = None # Item IDs in the same (shuffled) order
 
 # === QUICK PAIRS STATE ===  # 
 qp_questions = []  # Holds all loaded "Quick Pairs" questions
@@ -199,9 +461,11 @@ qp_shuffled_questions_this_round = [] # Holds questions selected for the current
 qp_current_question_data = None # Holds the full data for the current turn's question (incl. correct pairs)
 qp_current_list_a_items = None
 qp_current_list_b_items = None
+qp_current_list_a_ids = None # Item IDs in the same (shuffled) order as the lists
+qp_current_list_b_ids = None
 qp_current_question_index = -1
 qp_actual_turns_this_round = 0
-# qp_player_completion_times = {} # Will store {sid: completion_time_ms} for players who get all pairs correct
+# qp_player_completion_times = {} # Will store {pid: completion_time_ms} for players who get all pairs correct
 
 # === TRUE OR FALSE STATE ===  # 
 tf_questions = []
@@ -224,6 +488,8 @@ ttt_current_question = None
 ttt_current_question_index = -1
 ttt_actual_turns_this_round = 0
 ttt_current_options_shuffled = None
+ttt_current_option_ids = None # Option IDs in the same (shuffled) order
+TTT_POINTS_BY_NUM_CORRECT = {3: 3, 2: 1} # 1 or 0 correct scores nothing
 
 # === HIGHER OR LOWER STATE ===
 hol_questions = []
@@ -231,10 +497,15 @@ hol_shuffled_questions_this_round = []
 hol_current_question = None
 hol_current_turn_index = -1
 hol_actual_turns_this_round = 0
-hol_player_submitter_queue = [] # A queue of player SIDs who need to submit a number
-hol_current_submitter_sid = None # The SID of the player submitting the number this turn
+hol_player_submitter_queue = [] # A queue of player pids who need to submit a number
+hol_current_submitter_pid = None # The pid of the player submitting the number this turn
 hol_submitter_guess = None # The number the submitter guessed
 hol_current_turn_stage = None # Can be 'AWAITING_SUBMISSION' or 'AWAITING_GUESSES'
+# Pipelined mode: the next turn's submitter gets their question as soon as they are free (their
+# own H/L guess is in, or they just submitted), so stage 1 overlaps the current turn's guessing/results.
+HOL_PIPELINE = os.environ.get('HFF_HOL_PIPELINE', '1') != '0'
+hol_presubmitted_guesses = {} # {turn_index: number} sent ahead by that turn's submitter
+hol_ahead_prompted_turn = -1 # Latest turn whose submitter was prompted ahead of time
 
 # === AVERAGERS, ASSEMBLE STATE ===
 aa_questions = []
@@ -243,13 +514,79 @@ aa_current_question = None
 aa_current_turn_index = -1
 aa_actual_turns_this_round = 0
 aa_round_phase = None # Tracks the phase: 'selection' or 'gameplay'
-aa_teams = [] # List of finalized teams. e.g. [{'name':'Team Cap', 'members':[sid1, sid2]}]
-aa_unpicked_players = [] # Sorted list of SIDs for the picking draft
-aa_current_picker_sid = None # The SID of the player currently picking a teammate
-AA_TEAM_NAMES = ["Team Cap", "Team Iron Man", "Team Thor", "Team Spidey"] # Hardcoded team names
+aa_teams = [] # List of finalized teams. e.g. [{'name':'Team Cap', 'members':[pid1, pid2]}]
+aa_unpicked_players = [] # Sorted list of pids for the picking draft
+aa_current_picker_pid = None # The pid of the player currently picking a teammate
+AA_TEAM_NAMES = ["Team Cap", "Team Iron Man", "Team Thor", "Team Spidey"] # Themed names for the first teams
+AA_EXTRA_TEAM_HEROES = ["Hulk", "Widow", "Hawkeye", "Panther", "Strange", "Wanda", "Vision", "Falcon"] # Generated names after those
+# Auto-draft skips the pick-a-teammate draft and deals balanced teams from the game scores instead
+AA_AUTO_DRAFT = os.environ.get('HFF_AA_AUTO_DRAFT', '0') == '1'
+AA_TEAM_SIZE = 2
 
 # === ROOMS ===
-MAIN_ROOM = 'main_room'; PLAYERS_ROOM = 'players_room'
+MAIN_ROOM = f'main_room:{ROOM_CODE}'; PLAYERS_ROOM = f'players_room:{ROOM_CODE}' # Unique per venue across a message queue
+
+# === QUESTION BANKS ===
+def intern_value(value):
+    """Interns strings and turns (nested) lists into tuples, so repeated options/items share storage."""
+    if isinstance(value, str): return sys.intern(value)
+    if isinstance(value, (list, tuple)): return tuple(intern_value(v) for v in value)
+    return value
+
+def export_value(value):
+    """Inverse of intern_value for handing a record to round code/templates (tuples back to lists)."""
+    return [export_value(v) for v in value] if isinstance(value, tuple) else value
+
+class QuestionBank:
+    """
+    Column-oriented, read-only store for one round's loaded questions. Text and list fields are
+    interned tuples, integer answer fields are typed arrays. Round setup only materialises dicts
+    for the questions it actually samples.
+    """
+    __slots__ = ('name', 'count', 'columns')
+
+    def __init__(self, name, records, int_fields=()):
+        self.name = name
+        self.count = len(records)
+        fields = list(dict.fromkeys(k for r in records for k in r))
+        self.columns = {}
+        for field in fields:
+            values = [r.get(field) for r in records]
+            if field in int_fields: self.columns[sys.intern(field)] = array('l', values)
+            else: self.columns[sys.intern(field)] = tuple(intern_value(v) for v in values)
+
+    def __len__(self): return self.count
+
+    def record(self, index):
+        """The question at index as a fresh dict, in the same shape as the JSON entry."""
+        return {field: export_value(column[index]) for field, column in self.columns.items()}
+
+    def sample(self, k):
+        """k distinct random questions as dicts (same contract as random.sample on the old lists)."""
+        return [self.record(i) for i in random.sample(range(self.count), k)]
+
+    def where(self, field, predicate):
+        """Indices of questions whose field satisfies predicate, scanning only that column."""
+        return [i for i, value in enumerate(self.columns[field]) if predicate(value)]
+
+    def nbytes(self):
+        """Approximate memory held by the columns (shared interned strings counted once)."""
+        seen = set(); total = sys.getsizeof(self.columns)
+        def walk(value):
+            nonlocal total
+            if id(value) in seen: return
+            seen.add(id(value)); total += sys.getsizeof(value)
+            if isinstance(value, tuple):
+                for v in value: walk(v)
+        for column in self.columns.values():
+            if isinstance(column, array): total += sys.getsizeof(column)
+            else: walk(column)
+        return total
+
+def build_question_bank(tag, records, int_fields=()):
+    bank = QuestionBank(tag, records, int_fields)
+    print(f"[{tag}] Columnar bank: {len(bank)} questions, ~{bank.nbytes() // 1024}KB")
+    return bank
 
 # === DATA LOADING ===
 def load_guess_the_age_data(filename="celebrities.json"):
@@ -265,16 +602,17 @@ def load_guess_the_age_data(filename="celebrities.json"):
                 c['age'] = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
                 processed.append(c)
             except Exception as e: print(f"[GTAData] Skip Err({e}): {c.get('name')}")
-        gta_celebrities = processed; print(f"[GTAData] OK: {len(gta_celebrities)}")
+        gta_celebrities = build_question_bank('GTAData', processed, int_fields=('age',)); print(f"[GTAData] OK: {len(gta_celebrities)}")
     except Exception as e: print(f"[GTAData] Load Fail: {e}")
 
 def load_guess_the_year_data(filename="guess_the_year_questions.json"):
-    global gty_questions; gty_questions = []
+    global gty_questions, gty_year_span; gty_questions = []
     try:
         with open(filename, 'r', encoding='utf-8') as f: data = json.load(f)
         print(f"[GTYData] Loaded {len(data)} potential from {filename}")
-        gty_questions = [q for q in data if q.get('question') and q.get('year') and isinstance(q.get('year'), int) and q.get('image_url')] # Ensure image_url exists
+        gty_questions = build_question_bank('GTYData', [q for q in data if q.get('question') and q.get('year') and isinstance(q.get('year'), int) and q.get('image_url')], int_fields=('year',)) # Ensure image_url exists
         print(f"[GTYData] OK: {len(gty_questions)} valid.")
+        if gty_questions: gty_year_span = max(gty_questions.columns['year']) - min(gty_questions.columns['year'])
         if not gty_questions: print("[GTYData] WARN: No valid questions.")
     except Exception as e: print(f"[GTYData] Load Fail: {e}")
 
@@ -298,9 +636,10 @@ def load_who_didnt_do_it_data(filename="who_didnt_do_it_questions.json"):
                 continue
             # Add optional image_url if present, otherwise set to None
             q['image_url'] = q.get('image_url', None)
+            q['answer_id'] = q['options'].index(q['correct_answer']) # Option IDs are positions in 'options'
             processed_questions.append(q)
 
-        wddi_questions = processed_questions
+        wddi_questions = build_question_bank('WDDI_Data', processed_questions, int_fields=('answer_id',))
         print(f"[WDDI_Data] OK: {len(wddi_questions)} valid questions loaded.")
         if not wddi_questions:
             print("[WDDI_Data] WARN: No valid questions loaded for 'Who Didn't Do It?'.")
@@ -335,9 +674,10 @@ def load_order_up_data(filename="order_up_questions.json"): # <-- Add this new f
             # if len(q['items_in_correct_order']) != 4:
             #     print(f"[OU_Data] WARN: Question (Index {q_idx}) does not have exactly 4 items. Q: {q.get('question')}")
 
+            # Item IDs are positions in the correct order, so the answer key is always the identity permutation
             processed_questions.append(q)
 
-        ou_questions = processed_questions
+        ou_questions = build_question_bank('OU_Data', processed_questions)
         print(f"[OU_Data] OK: {len(ou_questions)} valid 'Order Up!' questions loaded.")
         if not ou_questions:
             print("[OU_Data] WARN: No valid questions loaded for 'Order Up!'.")
@@ -376,9 +716,10 @@ def load_quick_pairs_data(filename="quick_pairs_questions.json"): # <-- Add this
             if not valid_pairs:
                 continue
 
+            # Both halves of pair i get ID i, so a correct pairing is always [i, i]
             processed_questions.append(q_data)
 
-        qp_questions = processed_questions
+        qp_questions = build_question_bank('QP_Data', processed_questions)
         print(f"[QP_Data] OK: {len(qp_questions)} valid 'Quick Pairs' questions loaded.")
         if not qp_questions:
             print("[QP_Data] WARN: No valid questions loaded for 'Quick Pairs'.")
@@ -396,7 +737,7 @@ def load_true_or_false_data(filename="true_or_false_questions.json"):
             data = json.load(f)
         print(f"[TF_Data] Loaded {len(data)} potential questions from {filename}")
         # Basic validation
-        tf_questions = [q for q in data if 'statement' in q and 'correct_answer' in q and isinstance(q['correct_answer'], bool)]
+        tf_questions = build_question_bank('TF_Data', [q for q in data if 'statement' in q and 'correct_answer' in q and isinstance(q['correct_answer'], bool)])
         print(f"[TF_Data] OK: {len(tf_questions)} valid 'True or False' questions loaded.")
     except Exception as e:
         print(f"[TF_Data] Load Fail: {e}")
@@ -408,7 +749,8 @@ def load_tap_the_pic_data(filename="tap_the_pic_questions.json"):
             data = json.load(f)
         print(f"[TTP_Data] Loaded {len(data)} potential questions from {filename}")
         # Validate required fields
-        ttp_questions = [q for q in data if all(k in q for k in ('question_text', 'image_url', 'num_options', 'correct_answer'))]
+        ttp_questions = build_question_bank('TTP_Data', [q for q in data if all(k in q for k in ('question_text', 'image_url', 'num_options', 'correct_answer'))],
+                                            int_fields=('num_options', 'correct_answer'))
         print(f"[TTP_Data] OK: {len(ttp_questions)} valid 'Tap The Pic' questions loaded.")
     except Exception as e:
         print(f"[TTP_Data] Load Fail: {e}")
@@ -420,12 +762,15 @@ def load_top_three_data(filename="top_three_questions.json"):
             data = json.load(f)
         print(f"[TTT_Data] Loaded {len(data)} potential questions from {filename}")
         # Validate that each question has the required keys and correct structure
-        ttt_questions = [
+        valid = [
             q for q in data if all(k in q for k in ('question_text', 'options', 'correct_answers')) and
             isinstance(q.get('options'), list) and
             isinstance(q.get('correct_answers'), list) and
-            len(q.get('correct_answers')) == 3
+            len(q.get('correct_answers')) == 3 and all(a in q['options'] for a in q['correct_answers'])
         ]
+        for q in valid: # Option IDs are positions in 'options'; the answer key is a bitmask of the three correct IDs
+            q['answer_mask'] = sum(1 << i for i, option in enumerate(q['options']) if option in q['correct_answers'])
+        ttt_questions = build_question_bank('TTT_Data', valid, int_fields=('answer_mask',))
         print(f"[TTT_Data] OK: {len(ttt_questions)} valid 'The Top Three' questions loaded.")
     except Exception as e:
         print(f"[TTT_Data] Load Fail: {e}")
@@ -437,10 +782,10 @@ def load_higher_or_lower_data(filename="higher_or_lower_questions.json"):
         with open(filename, 'r', encoding='utf-8') as f:
             data = json.load(f)
         print(f"[HOL_Data] Loaded {len(data)} potential questions from {filename}")
-        hol_questions = [
+        hol_questions = build_question_bank('HOL_Data', [
             q for q in data if all(k in q for k in ('question', 'answer')) and
             isinstance(q.get('answer'), int)
-        ]
+        ], int_fields=('answer',))
         print(f"[HOL_Data] OK: {len(hol_questions)} valid 'Higher or Lower' questions loaded.")
     except Exception as e:
         print(f"[HOL_Data] Load Fail: {e}")
@@ -452,117 +797,581 @@ def load_averagers_assemble_data(filename="averagers_assemble_questions.json"):
         with open(filename, 'r', encoding='utf-8') as f:
             data = json.load(f)
         print(f"[AA_Data] Loaded {len(data)} potential questions from {filename}")
-        aa_questions = [
+        aa_questions = build_question_bank('AA_Data', [
             q for q in data if all(k in q for k in ('question', 'answer')) and
             isinstance(q.get('answer'), int)
-        ]
+        ], int_fields=('answer',))
         print(f"[AA_Data] OK: {len(aa_questions)} valid 'Averagers, Assemble' questions loaded.")
     except Exception as e:
         print(f"[AA_Data] Load Fail: {e}")
 
+# === RENDER OFFLOAD ===
+# Jinja rendering is CPU work; done on the eventlet hub it stalls every other greenlet
+# (including other players' submissions). Renders run in eventlet's OS thread pool instead.
+# Without eventlet the engine is already on OS threads, so there is no hub to keep free.
+RENDER_OFFLOAD = ASYNC_MODE == 'eventlet' and os.environ.get('HFF_RENDER_OFFLOAD', '1') != '0'
+render_stats = {'renders': 0, 'queue_ms_total': 0.0, 'queue_ms_max': 0.0, 'render_ms_total': 0.0, 'render_ms_max': 0.0}
+
+def run_offloaded(fn, *args, **kwargs):
+    """
+    Runs fn in the tpool thread pool with the caller's Flask contexts, yielding the hub meanwhile.
+    Returns (result, queue_ms, run_ms).
+    """
+    timing = {'submitted': time.perf_counter()}
+    def task():
+        timing['started'] = time.perf_counter()
+        try: return fn(*args, **kwargs)
+        finally: timing['finished'] = time.perf_counter()
+    context = contextvars.copy_context() # Carries the app/request context into the worker thread
+    result = tpool.execute(context.run, task) if RENDER_OFFLOAD else task()
+    return result, (timing['started'] - timing['submitted']) * 1000, (timing['finished'] - timing['started']) * 1000
+
+def render_fragment(template_name, context):
+    """Renders a template off the hub and records queueing/render time."""
+    html_content, queue_ms, render_ms = run_offloaded(render_template, template_name, **context)
+    render_stats['renders'] += 1
+    render_stats['queue_ms_total'] += queue_ms; render_stats['queue_ms_max'] = max(render_stats['queue_ms_max'], queue_ms)
+    render_stats['render_ms_total'] += render_ms; render_stats['render_ms_max'] = max(render_stats['render_ms_max'], render_ms)
+    print(f"[RENDER] {template_name} queued={queue_ms:.1f}ms render={render_ms:.1f}ms")
+    return html_content
+
+def render_pool_stats():
+    """Render counts plus average/max queueing and render time (ms)."""
+    n = render_stats['renders'] or 1
+    return {'offloaded': RENDER_OFFLOAD, 'renders': render_stats['renders'],
+            'queue_ms_avg': round(render_stats['queue_ms_total'] / n, 2), 'queue_ms_max': round(render_stats['queue_ms_max'], 2),
+            'render_ms_avg': round(render_stats['render_ms_total'] / n, 2), 'render_ms_max': round(render_stats['render_ms_max'], 2)}
+
 # === HELPERS ===
 def update_main_screen_html(target_selector, template_name, context):
     """Renders a template fragment and sends it to the main screen."""
     print(f"[UPDATE_HTML] target={target_selector} state={game_state}")
     if main_screen_sid:
         try:
-            html_content = render_template(template_name, **context)
-            socketio.emit('update_html', {
-                'target_selector': target_selector,
-                'html': html_content
-            }, room=main_screen_sid)
+            html_content = render_fragment(template_name, context)
+            emit_main_screen_html(target_selector, html_content)
         except Exception as e:
             print(f"ERROR rendering template {template_name}: {e}")
 
-def emit_player_list_update():
-    """Sends updated player list HTML."""
-    player_names = [p['name'] for p in players.values()]
-    update_main_screen_html('#player-list', '_player_list.html', {'player_names': player_names})
+def emit_main_screen_html(target_selector, html_content):
+    """Sends already-rendered HTML (e.g. from the game plan) to the main screen."""
+    global main_screen_display_id
+    if main_screen_sid:
+        main_screen_display_id += 1
+        socketio.emit('update_html', {
+            'target_selector': target_selector,
+            'html': html_content,
+            'display_id': main_screen_display_id
+        }, room=main_screen_sid)
+
+def flow_guard():
+    """What a scheduled flow step must still find when it runs: the same game, in the same state."""
+    return game_plan_id, game_state
+
+def run_flow_step(guard, then, args):
+    if flow_guard() != guard:
+        print(f"[FLOW] Not running {then.__name__}: game state went from {guard[1]} to {game_state} while it waited")
+        return
+    then(*args)
 
-def migrate_player_sid(old_sid, new_sid):
+def continue_after(seconds, then, *args):
+    """Runs the next step of the game flow after a pause, unless a reset or new game got there first."""
+    venue_call_after(seconds, run_flow_step, flow_guard(), then, args)
+
+def close_turn_after(seconds, process):
+    """Runs a turn's results step after a short pause, unless that turn closed (quorum, deadline) or the game moved on first."""
+    venue_call_after(seconds, run_turn_step, flow_guard(), turn_id, process)
+
+def run_turn_step(guard, scheduled_turn_id, process):
+    if turn_id != scheduled_turn_id or not turn_open:
+        print(f"[FLOW] Not running {process.__name__}: turn {scheduled_turn_id} already closed"); return
+    run_flow_step(guard, process, ())
+
+def hold_display(timing_key, then, *args, audio=None):
     """
-    Moves a player's state from old_sid -> new_sid, and updates any round state
-    that stores SIDs (HOL / Averagers Assemble etc).
+    Keeps the current main-screen fragment up until the main screen acknowledges display_done,
+    bounded by ROUND_TIMINGS '<timing_key>_min' and '<timing_key>' (the maximum), then runs
+    then(*args). If audio (a static/audio file) plays with the fragment, the maximum is at least its
+    (TIMING_SCALE'd) length, so the main screen's wait for it isn't cut short. Returns straight away;
+    the release arrives later as a venue event.
     """
-    global players, overall_game_scores
-    global hol_player_submitter_queue, hol_current_submitter_sid
-    global aa_unpicked_players, aa_current_picker_sid, aa_teams
-
-    if not old_sid or not new_sid or old_sid == new_sid:
-        return
+    global display_hold_id, display_hold
+    audio_s = audio_duration(audio) * TIMING_SCALE if audio else 0
+    max_s = max(get_round_timing(timing_key), audio_s)
+    min_s = min(get_round_timing(f'{timing_key}_min'), max_s)
+    display_hold_id += 1
+    display_hold = {'id': display_hold_id, 'display_id': main_screen_display_id, 'timing_key': timing_key, 'started': time.monotonic(),
+                    'min_s': min_s, 'max_s': max_s, 'guard': flow_guard(), 'then': then, 'args': args}
+    venue_call_after(min_s, release_display_hold, display_hold_id)
+    venue_call_after(max_s, release_display_hold, display_hold_id, True)
+
+def release_display_hold(hold_id, at_max=False):
+    """Venue event: the hold's minimum or maximum is up, or display_done arrived after the minimum."""
+    global display_hold
+    hold = display_hold
+    if hold is None or hold['id'] != hold_id: return # Already released
+    done = main_screen_display_done_id >= hold['display_id']
+    if not (done or at_max): return # The maximum (or display_done) will release it
+    display_hold = None
+    held = time.monotonic() - hold['started']
+    pacing_stats['holds'] += 1; pacing_stats['seconds_held'] += held
+    if done: pacing_stats['advanced_on_ack'] += 1
+    else: pacing_stats['hit_max'] += 1
+    print(f"[PACING] {hold['timing_key']} held {held:.1f}s (min {hold['min_s']}s, max {hold['max_s']}s, done={done})")
+    run_flow_step(hold['guard'], hold['then'], hold['args'])
+
+MP3_BITRATES_KBPS = [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320] # MPEG-1 Layer III
+MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+def audio_duration(filename):
+    """Length of a static/audio mp3 in seconds, from its Xing frame count or its (constant) bitrate."""
+    if filename in audio_durations: return audio_durations[filename]
+    seconds = AUDIO_DURATION_FALLBACK
+    try:
+        with open(os.path.join(app.static_folder, 'audio', filename), 'rb') as f: data = f.read()
+        offset = 0
+        if data[:3] == b'ID3': offset = 10 + ((data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9])
+        while offset < len(data) - 4 and not (data[offset] == 0xFF and data[offset + 1] & 0xE0 == 0xE0): offset += 1
+        header = int.from_bytes(data[offset:offset + 4], 'big')
+        version = (header >> 19) & 3
+        sample_rate = MP3_SAMPLE_RATES[version][(header >> 10) & 3]
+        samples_per_frame = 1152 if version == 3 else 576
+        xing = max(data.find(b'Xing', offset, offset + 200), data.find(b'Info', offset, offset + 200))
+        if xing != -1 and data[xing + 7] & 1: # Frame count present
+            seconds = int.from_bytes(data[xing + 8:xing + 12], 'big') * samples_per_frame / sample_rate
+        else:
+            seconds = (len(data) - offset) * 8 / (MP3_BITRATES_KBPS[(header >> 12) & 15] * 1000)
+    except (OSError, IndexError, KeyError, ZeroDivisionError) as e:
+        print(f"[CUES] Can't measure {filename} ({e}), assuming {AUDIO_DURATION_FALLBACK}s")
+    audio_durations[filename] = round(seconds, 2)
+    return audio_durations[filename]
 
-    # Move per-player state
-    if old_sid in players and new_sid not in players:
-        players[new_sid] = players.pop(old_sid)
-    elif old_sid in players and new_sid in players:
-        # Extremely rare: if new_sid somehow already exists, prefer preserving new_sid but merge "connected"
-        players[new_sid].update(players.pop(old_sid))
-
-    # Move overall score
-    if old_sid in overall_game_scores and new_sid not in overall_game_scores:
-        overall_game_scores[new_sid] = overall_game_scores.pop(old_sid)
-    elif old_sid in overall_game_scores:
-        overall_game_scores[new_sid] = max(overall_game_scores.get(new_sid, 0), overall_game_scores.pop(old_sid))
-
-    # Update HOL (Higher or Lower) SID references
-    hol_player_submitter_queue = [new_sid if s == old_sid else s for s in hol_player_submitter_queue]
-    if hol_current_submitter_sid == old_sid:
-        hol_current_submitter_sid = new_sid
-
-    # Update Averagers Assemble SID references
-    aa_unpicked_players = [new_sid if s == old_sid else s for s in aa_unpicked_players]
-    if aa_current_picker_sid == old_sid:
-        aa_current_picker_sid = new_sid
-    for team in aa_teams:
-        team['members'] = [new_sid if s == old_sid else s for s in team.get('members', [])]
+def send_cue_timeline(name, cues):
+    """
+    Sends a timeline to the main screen and returns (timeline_id, duration). Each cue is
+    {'at': seconds from start, 'action': ..., ...}; the last cue's 'at' is the timeline's end.
+    """
+    global cue_timeline_id, current_cue_timeline
+    cue_timeline_id += 1
+    duration = max((cue['at'] for cue in cues), default=0)
+    current_cue_timeline = {'timeline_id': cue_timeline_id, 'name': name, 'cues': cues, 'duration': duration,
+                            'start_at_ms': (time.time() + CUE_LEAD_SECONDS) * 1000}
+    if main_screen_sid: socketio.emit('cue_timeline', current_cue_timeline, room=main_screen_sid)
+    print(f"[CUES] {name} timeline #{cue_timeline_id}: {len(cues)} cues over {duration:.1f}s")
+    return cue_timeline_id, duration
+
+def after_cue_timeline(timeline_id, duration, then, *args):
+    """Runs then(*args) once the timeline ends, or sooner if the main screen says it can't play it."""
+    global cue_timeline_waiter
+    cue_timeline_waiter = (timeline_id, flow_guard(), then, args)
+    venue_call_after(CUE_LEAD_SECONDS + duration, finish_cue_timeline, timeline_id)
+
+def finish_cue_timeline(timeline_id):
+    """Venue event: a timeline ran its length or was skipped. Does nothing if a newer timeline replaced it."""
+    global cue_timeline_waiter
+    if cue_timeline_waiter is None or cue_timeline_waiter[0] != timeline_id or cue_timeline_id != timeline_id: return
+    _, guard, then, args = cue_timeline_waiter
+    cue_timeline_waiter = None
+    run_flow_step(guard, then, args)
+
+def intro_timeline():
+    announcer_at = INTRO_THEME_LEAD_SECONDS
+    host_at = announcer_at + audio_duration('announcer_intro.mp3') + 1
+    end_at = host_at + audio_duration('host_welcome.mp3')
+    return [
+        {'at': 0, 'action': 'play_audio', 'audio': 'main-theme.mp3', 'volume': 0.4},
+        {'at': announcer_at, 'action': 'fade_audio', 'audio': 'main-theme.mp3', 'volume': 0.1, 'over': 2},
+        {'at': announcer_at, 'action': 'play_audio', 'audio': 'announcer_intro.mp3'},
+        {'at': host_at, 'action': 'play_audio', 'audio': 'host_welcome.mp3'},
+        {'at': end_at, 'action': 'advance'},
+    ]
+
+def explainer_timeline(audio_file):
+    return [
+        {'at': 0, 'action': 'play_audio', 'audio': audio_file},
+        {'at': audio_duration(audio_file), 'action': 'advance'},
+    ]
+
+def game_over_timeline():
+    congrats_at = audio_duration('we_are_the_champions.mp3')
+    return [
+        {'at': 0, 'action': 'play_audio', 'audio': 'we_are_the_champions.mp3', 'volume': 0.5},
+        {'at': congrats_at, 'action': 'play_audio', 'audio': 'host_congrats.mp3'},
+        {'at': congrats_at + audio_duration('host_congrats.mp3'), 'action': 'enable_play_again'},
+    ]
 
-    # Ensure connected after a successful migrate
-    if new_sid in players:
-        players[new_sid]['connected'] = True
+def emit_player_list_update():
+    """Sends updated player list HTML."""
+    player_names = [p.name for p in players.values()]
+    update_main_screen_html('#player-list', '_player_list.html', {'player_names': player_names})
 
+def current_player_pid():
+    """The pid behind the socket that sent the current event (the sid itself for unregistered sockets)."""
+    return sid_to_pid.get(request.sid, request.sid)
 
-def emit_game_state_update():
-    """Sends non-HTML game state info (scores, round nums, etc.)."""
-    print(f"[GAME_STATE_UPDATE] state={game_state} round={current_game_round_num} players={len(players)}")
-    if main_screen_sid:
-        scores_list = sorted([{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)}
-                              for sid, p in players.items()], key=lambda x: x['game_score'], reverse=True)
-        payload = {
-            'game_state': game_state,
-            'current_game_round_num': current_game_round_num,
-            'game_rounds_total': GAME_ROUNDS_TOTAL,
-            'overall_scores': scores_list,
-            'current_round_type': selected_rounds_for_game[current_game_round_num-1] if 0 < current_game_round_num <= len(selected_rounds_for_game) else None
-        }
-        socketio.emit('game_state_update', payload, room=main_screen_sid)
+def allocate_player_slot(player_pid):
+    """Gives a new player the lowest free slot."""
+    try:
+        slot = player_slots.index(None); player_slots[slot] = player_pid
+    except ValueError:
+        slot = len(player_slots); player_slots.append(player_pid)
+    return slot
+
+def reset_turn_answers(answer_key=None):
+    """Clears every player's answer (and scored result) for a new turn."""
+    global turn_answers, turn_answer_times_ms, turn_open, turn_answer_key, turn_results, turn_tally
+    turn_answers = [None] * len(player_slots)
+    turn_answer_times_ms = [float('inf')] * len(player_slots)
+    turn_answer_key = answer_key
+    turn_results = [None] * len(player_slots)
+    turn_tally = {'submitted': 0, 'answered': 0, 'correct': 0, 'histogram': {}, 'fastest_correct': None}
+    turn_open = True
+    global turn_id; turn_id += 1
+
+def is_current_turn_submission(player_pid, data):
+    """True if a submission echoes the current turn's id. Anything else answers a prompt that has
+    since been replaced, so the player is told and it is dropped."""
+    if isinstance(data, dict) and data.get('turn_id') == turn_id: return True
+    print(f"[TURN] Dropped a submission for turn {data.get('turn_id') if isinstance(data, dict) else None} (now {turn_id}) from {player_pid[:4]}")
+    tell_turn_closed(player_pid)
+    return False
+
+def tell_turn_closed(player_pid):
+    """For an answer that arrived after its turn closed (set_turn_answer refused it)."""
+    emit_to_player(player_pid, 'message', {'data': 'Too late, that question has closed.'})
+
+def close_turn():
+    """Stops accepting answers and cancels the deadline. Returns False if the turn was already closed."""
+    global turn_open
+    if not turn_open: return False
+    turn_open = False
+    cancel_turn_deadline()
+    return True
+
+def turn_answer(player_pid):
+    """This turn's answer from a player, or None if they have not answered."""
+    slot = players[player_pid].slot
+    return turn_answers[slot] if slot < len(turn_answers) else None
+
+def is_present(player, now=None):
+    """Connected, or disconnected less than PRESENCE_GRACE_SECONDS ago."""
+    if player.connected: return True
+    return player.disconnected_at is not None and (now or time.time()) - player.disconnected_at < PRESENCE_GRACE_SECONDS
+
+def quorum_pids():
+    """Players whose answer this turn is waited for. The Higher or Lower submitter never guesses."""
+    now = time.time()
+    return [pid for pid, p in players.items()
+            if is_present(p, now) and not (game_state == 'higher_or_lower_ongoing' and pid == hol_current_submitter_pid)]
+
+def turn_quorum_reached():
+    """Every present player has answered. Nobody present means nothing to wait for yet (the deadline still runs)."""
+    pids = quorum_pids()
+    return bool(pids) and all(turn_answer(pid) is not None for pid in pids)
+
+def turn_waiting_on():
+    """How many present players have yet to answer (the phones' 'waiting on N'), without scanning answers."""
+    return max(0, len(quorum_pids()) - turn_tally['submitted'])
+
+def turn_answer_time_ms(player_pid):
+    slot = players[player_pid].slot
+    return turn_answer_times_ms[slot] if slot < len(turn_answer_times_ms) else float('inf')
+
+def set_turn_answer(player_pid, answer, time_ms=None):
+    """Records a player's answer for this turn (players who joined mid-turn grow the arrays)."""
+    if not turn_open: return False # Deadline already closed the turn
+    slot = players[player_pid].slot
+    if slot >= len(turn_answers):
+        turn_answers.extend([None] * (slot + 1 - len(turn_answers)))
+        turn_answer_times_ms.extend([float('inf')] * (slot + 1 - len(turn_answer_times_ms)))
+    if turn_answers[slot] is None: turn_tally['submitted'] += 1
+    turn_answers[slot] = answer
+    if time_ms is not None: turn_answer_times_ms[slot] = time_ms
+    return True
+
+def record_turn_result(player_pid, row, points=0, correct=False, bucket=None, time_ms=None):
+    """Stores an accepted answer's scored result row and folds it into this turn's tally."""
+    slot = players[player_pid].slot
+    if slot >= len(turn_results): turn_results.extend([None] * (slot + 1 - len(turn_results)))
+    row['points_this_turn'] = points
+    turn_results[slot] = row
+    turn_tally['answered'] += 1
+    turn_tally['histogram'][bucket] = turn_tally['histogram'].get(bucket, 0) + 1
+    if correct:
+        turn_tally['correct'] += 1
+        fastest = turn_tally['fastest_correct']
+        if time_ms is not None and (fastest is None or time_ms < fastest[0]):
+            turn_tally['fastest_correct'] = (time_ms, player_pid)
+
+def turn_result(player_pid):
+    slot = players[player_pid].slot
+    return turn_results[slot] if slot < len(turn_results) else None
+
+def collect_turn_results(missing_row):
+    """Awards the points scored at submission time and returns every player's result row.
+    missing_row(player) builds the row for anyone who never answered."""
+    rows = []
+    for pid, p in players.items():
+        row = turn_result(pid)
+        if row is None:
+            row = missing_row(p); row['points_this_turn'] = 0
+        p.round_score += row['points_this_turn']
+        row['round_score'] = p.round_score
+        rows.append(row)
+    print(f"   Tally: {turn_tally['correct']}/{turn_tally['answered']} correct, answers: {turn_tally['histogram']}")
+    return rows
+
+def results_view(entries, rank_key):
+    """
+    entries: [(pid, result row)], lower rank_key = better. The screen's top rows come from a heap
+    selection, and each player's rank (ties share one) from counting keys: a running total over the
+    distinct keys, of which a round has a handful, so no list of rows is ever sorted.
+    Returns (top rows, number of rows left off, {pid: rank}).
+    """
+    top = heapq.nsmallest(RESULTS_TOP_N, entries, key=lambda e: (rank_key(e[1]), e[1]['name']))
+    key_counts = Counter(rank_key(row) for _, row in entries)
+    rank_of_key = {}; ahead = 0
+    for key in sorted(key_counts):
+        rank_of_key[key] = ahead + 1; ahead += key_counts[key]
+    ranks = {pid: rank_of_key[rank_key(row)] for pid, row in entries}
+    return [row for _, row in top], len(entries) - len(top), ranks
+
+def distribution_view(counts, buckets):
+    """[{'label', 'count', 'pct'}] for each (bucket, label), in the order given."""
+    total = sum(counts.get(bucket, 0) for bucket, _ in buckets) or 1
+    return [{'label': label, 'count': counts.get(bucket, 0), 'pct': round(100 * counts.get(bucket, 0) / total)}
+            for bucket, label in buckets]
+
+def turn_answer_distribution(buckets, total):
+    """distribution_view over this turn's answer histogram, plus everyone who didn't answer."""
+    counts = dict(turn_tally['histogram']); counts[None] = total - turn_tally['answered']
+    return distribution_view(counts, list(buckets) + [(None, 'No answer')])
+
+def emit_player_ranks(ranks):
+    """The usual 'look at the main screen' nudge, with each player's own rank attached."""
+    for pid, rank in ranks.items():
+        emit_to_player(pid, 'results_on_main_screen', {'rank': rank, 'of': len(ranks)})
+
+def round_rankings_view(sorted_pids, points_awarded):
+    """Round summary rows for the top RESULTS_TOP_N of an already ranked pid list (award_game_points
+    needs the full order anyway); every player gets their own rank. Returns (rows, rows left off)."""
+    ranked = [pid for pid in sorted_pids if pid in players]
+    rankings = [{'rank': rank + 1, 'name': players[pid].name, 'round_score': players[pid].round_score,
+                 'points_awarded': points_awarded.get(pid, 0)} for rank, pid in enumerate(ranked[:RESULTS_TOP_N])]
+    emit_player_ranks({pid: rank + 1 for rank, pid in enumerate(ranked)})
+    return rankings, len(ranked) - len(rankings)
+
+def emit_to_player(player_pid, event, payload=None):
+    """Sends an event to one controller and records it in that player's outbound log."""
+    global outbound_seq
+    outbound_seq += 1
+    payload = dict(payload or {}); payload['seq'] = outbound_seq
+    if event in TURN_PROMPT_EVENTS: payload['turn_id'] = turn_id
+    if player_pid not in player_outboxes: player_outboxes[player_pid] = deque(maxlen=PLAYER_OUTBOX_SIZE)
+    player_outboxes[player_pid].append((outbound_seq, event, payload))
+    player_sid = pid_to_sid.get(player_pid)
+    if player_sid: socketio.emit(event, payload, room=player_sid)
+
+def emit_to_players(event, payload=None):
+    """Broadcasts an event to every controller, logging one shared entry per player."""
+    global outbound_seq, last_players_room_event
+    outbound_seq += 1
+    payload = dict(payload or {}); payload['seq'] = outbound_seq
+    if event in TURN_PROMPT_EVENTS: payload['turn_id'] = turn_id
+    entry = (outbound_seq, event, payload)
+    for pid in players:
+        if pid not in player_outboxes: player_outboxes[pid] = deque(maxlen=PLAYER_OUTBOX_SIZE)
+        player_outboxes[pid].append(entry)
+    last_players_room_event = entry
+    socketio.emit(event, payload, room=PLAYERS_ROOM)
+
+def replay_player_outbox(player_pid, last_seq=None):
+    """Re-sends, in order, the logged events a (re)connecting controller has not seen. Returns the count."""
+    outbox = player_outboxes.get(player_pid)
+    if not outbox and last_players_room_event and game_state != 'waiting':
+        # Joined mid-game with no history: start them from the latest broadcast
+        outbox = player_outboxes[player_pid] = deque([last_players_room_event], maxlen=PLAYER_OUTBOX_SIZE)
+    if not outbox:
+        return 0
+    try: last_seq = int(last_seq or 0)
+    except (TypeError, ValueError): last_seq = 0
+
+    entries = list(outbox)
+    if last_seq > 0:
+        missed = [e for e in entries if e[0] > last_seq]
+    else:
+        # Fresh page with nothing on screen: start from the latest event that draws a full screen
+        start = next((i for i in range(len(entries) - 1, -1, -1) if entries[i][1] in PLAYER_SCREEN_EVENTS), 0)
+        missed = entries[start:]
+    player_sid = pid_to_sid.get(player_pid)
+    for seq, event, payload in missed:
+        socketio.emit(event, payload, room=player_sid)
+    print(f"[REPLAY] {getattr(players.get(player_pid), 'name', '?')} last_seq={last_seq} replayed={len(missed)}")
+    return len(missed)
+
+def evict_stale_sessions(now=None):
+    """Drops players who have been disconnected longer than the TTL, plus any orphaned registry entries."""
+    global sessions_evicted_total
+    if game_state not in SESSION_SWEEP_STATES:
+        return 0
+    now = now or time.time()
+    stale = [pid for pid, p in players.items()
+             if not p.connected and p.disconnected_at and now - p.disconnected_at >= SESSION_TTL_SECONDS]
+    for pid in stale:
+        print(f"[SESSIONS] Evicting {players[pid].name} ({pid[:4]})")
+        player_slots[players.pop(pid).slot] = None
+        overall_game_scores.pop(pid, None); leaderboard.discard(pid); player_outboxes.pop(pid, None)
+        for heard in explainers_heard.values(): heard.discard(pid)
+        old_sid = pid_to_sid.pop(pid, None)
+        if old_sid: sid_to_pid.pop(old_sid, None)
+        mark_scores_dirty(pid)
+    # Anything no longer backed by a player (e.g. a full game's rejected joiners) goes too
+    for pid in [pid for pid in player_outboxes if pid not in players]: player_outboxes.pop(pid)
+    for pid in [pid for pid in overall_game_scores if pid not in players]: overall_game_scores.pop(pid); leaderboard.discard(pid); mark_scores_dirty(pid)
+    for sid in [sid for sid, pid in sid_to_pid.items() if pid not in players]: pid_to_sid.pop(sid_to_pid.pop(sid), None)
+
+    if stale:
+        sessions_evicted_total += len(stale)
+        emit_player_list_update()
+        emit_game_state_update()
+    return len(stale)
+
+def session_registry_stats():
+    """Entry counts and approximate memory (bytes) held by the per-player registries."""
+    def size_of(obj, depth=2):
+        size = sys.getsizeof(obj)
+        if depth and hasattr(obj, '__slots__'): size += sum(size_of(getattr(obj, a), 0) for a in obj.__slots__)
+        elif depth and isinstance(obj, dict): size += sum(size_of(k, 0) + size_of(v, depth - 1) for k, v in obj.items())
+        elif depth and isinstance(obj, (list, tuple, set, deque)): size += sum(size_of(v, depth - 1) for v in obj)
+        return size
+    registries = {'players': players, 'player_slots': player_slots, 'overall_game_scores': overall_game_scores, 'pid_to_sid': pid_to_sid,
+                  'sid_to_pid': sid_to_pid, 'player_outboxes': player_outboxes}
+    stats = {name: {'entries': len(reg), 'bytes': size_of(reg)} for name, reg in registries.items()}
+    stats['connected_players'] = sum(1 for p in players.values() if p.connected)
+    stats['evicted_total'] = sessions_evicted_total
+    return stats
+
+def session_sweeper():
+    """Background task: periodically evicts stale sessions and logs registry sizes."""
+    while True:
+        socketio.sleep(SESSION_SWEEP_INTERVAL)
+        venue_call(sweep_stale_sessions)
+
+def sweep_stale_sessions():
+    """Venue event from session_sweeper: evicts and logs registry sizes when anything went."""
+    if evict_stale_sessions():
+        stats = session_registry_stats()
+        total_bytes = sum(v['bytes'] for v in stats.values() if isinstance(v, dict))
+        print(f"[SESSIONS] players={stats['players']['entries']} connected={stats['connected_players']} "
+              f"routes={stats['sid_to_pid']['entries']} ~{total_bytes // 1024}KB evicted_total={stats['evicted_total']}")
+
+def mark_scores_dirty(*pids):
+    """Flags players whose scoreboard entry must be re-checked on the next state update."""
+    score_dirty_pids.update(pids)
+
+def record_game_state_changes():
+    """Diffs the current state against what was last versioned and records a delta if anything changed."""
+    global game_state_version
+    fields = {
+        'game_state': game_state,
+        'current_game_round_num': current_game_round_num,
+        'game_rounds_total': GAME_ROUNDS_TOTAL,
+        'current_round_type': selected_rounds_for_game[current_game_round_num-1] if 0 < current_game_round_num <= len(selected_rounds_for_game) else None,
+        'leaderboard': [score_key(pid) for pid, _ in leaderboard.top(RESULTS_TOP_N)] # Status bar order, so the main screen never sorts
+    }
+    changed_fields = {k: v for k, v in fields.items() if k not in game_state_sent_fields or game_state_sent_fields[k] != v}
+
+    # Only players flagged dirty are compared, so the cost follows the number of changes, not players
+    changed_scores = {}; removed_scores = []
+    for pid in score_dirty_pids:
+        if pid in players:
+            entry = {'name': players[pid].name, 'game_score': overall_game_scores.get(pid, 0),
+                     'rank_change': leaderboard.rank_change(pid)}
+            if game_state_sent_scores.get(pid) != entry: changed_scores[pid] = entry
+        elif pid in game_state_sent_scores:
+            removed_scores.append(pid)
+    score_dirty_pids.clear()
+
+    if not (changed_fields or changed_scores or removed_scores):
+        return
+    game_state_version += 1
+    game_state_sent_fields.update(changed_fields)
+    game_state_sent_scores.update(changed_scores)
+    for pid in removed_scores: game_state_sent_scores.pop(pid, None)
+    game_state_deltas.append((game_state_version, changed_fields, {score_key(pid): entry for pid, entry in changed_scores.items()},
+                              [score_keys.pop(pid) for pid in removed_scores if pid in score_keys]))
+
+def score_key(pid):
+    """The opaque key the main screen knows this player's scores by."""
+    global next_score_key
+    if pid not in score_keys:
+        next_score_key += 1; score_keys[pid] = next_score_key
+    return score_keys[pid]
+
+def build_game_state_delta(since_version):
+    """Merges the recorded deltas after since_version, or returns None if they are no longer held."""
+    if not game_state_deltas or game_state_deltas[0][0] > since_version + 1:
+        return None
+    fields = {}; scores = {}; removed = set()
+    for version, d_fields, d_scores, d_removed in game_state_deltas:
+        if version <= since_version: continue
+        fields.update(d_fields)
+        for key, entry in d_scores.items(): scores[key] = entry; removed.discard(key)
+        for key in d_removed: scores.pop(key, None); removed.add(key)
+    return {'full': False, 'version': game_state_version, 'base_version': since_version,
+            'fields': fields, 'scores': scores, 'removed_scores': list(removed)}
+
+def emit_game_state_update(full=False):
+    """Sends non-HTML game state info (scores, round nums, etc.) as a versioned delta or snapshot."""
+    global main_screen_sent_version
+    record_game_state_changes()
+    print(f"[GAME_STATE_UPDATE] state={game_state} round={current_game_round_num} players={len(players)} v={game_state_version}")
+    if not main_screen_sid:
+        return
+    if not full and main_screen_sent_version == game_state_version:
+        return # Nothing new since the last push
+    payload = None
+    if not full and main_screen_acked_version is not None:
+        payload = build_game_state_delta(main_screen_acked_version)
+    if payload is None:
+        payload = {'full': True, 'version': game_state_version, 'fields': dict(game_state_sent_fields),
+                   'scores': {score_key(pid): entry for pid, entry in game_state_sent_scores.items()}}
+    main_screen_sent_version = game_state_version
+    socketio.emit('game_state_update', payload, room=main_screen_sid)
 
 # <<< Corrected Stableford Scoring Logic >>>
-def award_game_points(sorted_player_sids_by_round_score):
-    global overall_game_scores; num_players = len(sorted_player_sids_by_round_score);
+def overall_scores_view(limit=None):
+    """Game scores best first (top `limit`), with rank and movement since the last round, read straight off the leaderboard."""
+    return [{'rank': leaderboard.rank(pid), 'name': getattr(players.get(pid), 'name', '?'), 'game_score': score,
+             'rank_change': leaderboard.rank_change(pid)} for pid, score in leaderboard.top(limit)]
+
+def award_game_points(sorted_player_pids_by_round_score):
+    global overall_game_scores; num_players = len(sorted_player_pids_by_round_score);
     if num_players == 0: return {}
     print(f"Awarding points for {num_players} players...")
     points_by_rank = {}
     for rank in range(1, num_players + 1): points_by_rank[rank] = (num_players + 1) if rank == 1 and num_players > 1 else (2 if rank == 1 and num_players == 1 else num_players - rank + 1)
     print(f"  Points structure (Rank: Points): {points_by_rank}"); points_awarded_this_round = {}; i = 0
+    leaderboard.begin_award()
     while i < num_players:
-        current_sid = sorted_player_sids_by_round_score[i]; current_player_info = players.get(current_sid)
+        current_pid = sorted_player_pids_by_round_score[i]; current_player_info = players.get(current_pid)
         if not current_player_info: i += 1; continue
-        current_round_score = current_player_info.get('round_score', None); tied_sids = [current_sid]; j = i + 1
+        current_round_score = current_player_info.round_score; tied_pids = [current_pid]; j = i + 1
         while j < num_players:
-            next_sid=sorted_player_sids_by_round_score[j]; next_player_info=players.get(next_sid)
-            if not next_player_info or next_player_info.get('round_score', None) != current_round_score: break
-            tied_sids.append(next_sid); j += 1
-        num_tied = len(tied_sids); rank_start = i + 1; rank_end = i + num_tied
+            next_pid=sorted_player_pids_by_round_score[j]; next_player_info=players.get(next_pid)
+            if not next_player_info or next_player_info.round_score != current_round_score: break
+            tied_pids.append(next_pid); j += 1
+        num_tied = len(tied_pids); rank_start = i + 1; rank_end = i + num_tied
         if num_tied == 1: points = points_by_rank.get(rank_start, 0)
         else: sum_points = sum(points_by_rank.get(r, 0) for r in range(rank_start, rank_end + 1)); points = round(sum_points / num_tied, 1); print(f"  Tie ranks {rank_start}-{rank_end} avg: {points}")
-        for tied_sid in tied_sids:
-            if tied_sid in overall_game_scores: points_awarded_this_round[tied_sid] = points; overall_game_scores[tied_sid] = overall_game_scores.get(tied_sid, 0) + points; print(f"  - {players.get(tied_sid,{}).get('name','?')} gets {points} pts. Total: {overall_game_scores[tied_sid]}")
+        for tied_pid in tied_pids:
+            if tied_pid in overall_game_scores: mark_scores_dirty(tied_pid); points_awarded_this_round[tied_pid] = points; overall_game_scores[tied_pid] = overall_game_scores.get(tied_pid, 0) + points; leaderboard.set(tied_pid, overall_game_scores[tied_pid]); print(f"  - {getattr(players.get(tied_pid), 'name', '?')} gets {points} pts. Total: {overall_game_scores[tied_pid]}")
         i += num_tied
     return points_awarded_this_round
 
 # Helpers for checking guesses
-def check_all_guesses_received_gta(): return all(p.get('gta_current_guess') is not None for p in players.values()) if players else True
-def check_all_guesses_received_gty(): return all(p.get('gty_current_guess') is not None for p in players.values()) if players else True
+def check_all_guesses_received_gta(): return turn_quorum_reached()
+def check_all_guesses_received_gty(): return turn_quorum_reached()
 # REMOVED WDDI check
 
 def get_round_timing(timing_key):
@@ -575,6 +1384,63 @@ def get_round_timing(timing_key):
     # Return the specific timing if it exists, otherwise return the default
     return round_specific_timings.get(timing_key, ROUND_TIMINGS['default'].get(timing_key, 5))
 
+def start_turn_deadline(on_expire, timing_key='answer_deadline'):
+    """Opens a server-timed answer window for this turn; on_expire closes the turn when it runs out."""
+    global turn_deadline_token, turn_deadline_ends_at, turn_deadline_extensions
+    turn_deadline_token += 1; turn_deadline_extensions = 0
+    seconds = get_round_timing(timing_key)
+    deadline_stats['windows'] += 1
+    if not seconds: turn_deadline_ends_at = None; return
+    turn_deadline_ends_at = time.monotonic() + seconds
+    emit_turn_deadline()
+    socketio.start_background_task(watch_turn_deadline, turn_deadline_token, on_expire)
+
+def cancel_turn_deadline():
+    global turn_deadline_token, turn_deadline_ends_at
+    if turn_deadline_ends_at is None: return
+    turn_deadline_token += 1; turn_deadline_ends_at = None
+    emit_turn_deadline()
+
+def emit_turn_deadline(to=None):
+    """Sends the remaining seconds (None = no countdown). Clients count down locally from there."""
+    seconds_left = None if turn_deadline_ends_at is None else max(0.0, round(turn_deadline_ends_at - time.monotonic(), 2))
+    payload = {'seconds_left': seconds_left}
+    if to: socketio.emit('turn_deadline', payload, room=to); return
+    socketio.emit('turn_deadline', payload, room=PLAYERS_ROOM)
+    if main_screen_sid: socketio.emit('turn_deadline', payload, room=MAIN_ROOM)
+
+def turn_answer_progress():
+    """(answered, expected) for the current turn, counting only players in the quorum."""
+    expected = quorum_pids()
+    return sum(1 for pid in expected if turn_answer(pid) is not None), len(expected)
+
+def watch_turn_deadline(token, on_expire):
+    """Background countdown for one answer window. Exits quietly once the turn closes another way."""
+    while True:
+        # Read the deadline before the token: in threading mode a close can run between the two
+        # (bumping the token, then clearing the deadline), so a valid token never meets a None here
+        ends_at = turn_deadline_ends_at
+        if token != turn_deadline_token or ends_at is None: return
+        remaining = ends_at - time.monotonic()
+        if remaining > 0: socketio.sleep(min(remaining, 1.0)); continue
+        venue_call(expire_turn_deadline, token, on_expire)
+        return
+
+def expire_turn_deadline(token, on_expire):
+    """Venue event for a window that ran out: extends it once if most have answered, otherwise closes the turn."""
+    global turn_deadline_ends_at, turn_deadline_extensions
+    if token != turn_deadline_token: return # The turn closed while this was queued
+    answered, expected = turn_answer_progress()
+    if (expected and answered < expected and answered >= expected * TURN_EXTENSION_MIN_ANSWERED
+            and turn_deadline_extensions < TURN_MAX_EXTENSIONS):
+        turn_deadline_extensions += 1; deadline_stats['extensions'] += 1
+        turn_deadline_ends_at = time.monotonic() + TURN_EXTENSION_SECONDS
+        print(f"[TURN_DEADLINE] {answered}/{expected} answered, extending by {TURN_EXTENSION_SECONDS}s")
+        emit_turn_deadline(); socketio.start_background_task(watch_turn_deadline, token, on_expire); return
+    deadline_stats['deadline_hits'] += 1; deadline_stats['missing_answers'] += expected - answered
+    print(f"[TURN_DEADLINE] Time's up in {game_state}: {answered}/{expected} answered, closing the turn")
+    on_expire()
+
 def get_rank_suffix(rank):
     """Returns the correct suffix (st, nd, rd, th) for a given rank number."""
     if 11 <= rank <= 13:
@@ -609,133 +1475,402 @@ def get_points_structure(num_players):
         
     return sorted(structure, key=lambda x: x['points'], reverse=True)
 
+# === STARTUP ===
+# Boot only loads the banks the configured rounds need (in parallel), compiles every template
+# up front so no render pays compile cost mid-game, and records how long each step took.
+ROUND_DATA_LOADERS = {
+    'guess_the_age': load_guess_the_age_data,
+    'guess_the_year': load_guess_the_year_data,
+    'who_didnt_do_it': load_who_didnt_do_it_data,
+    'order_up': load_order_up_data,
+    'quick_pairs': load_quick_pairs_data,
+    'true_or_false': load_true_or_false_data,
+    'tap_the_pic': load_tap_the_pic_data,
+    'the_top_three': load_top_three_data,
+    'higher_or_lower': load_higher_or_lower_data,
+    'averagers_assemble': load_averagers_assemble_data,
+}
+server_ready = False
+startup_timings = {} # {step: seconds}
+
+def load_round_data(round_types=None):
+    """Runs the loaders for the given round types (default: AVAILABLE_ROUND_TYPES) concurrently."""
+    loaders = [ROUND_DATA_LOADERS[r] for r in dict.fromkeys(round_types or AVAILABLE_ROUND_TYPES) if r in ROUND_DATA_LOADERS]
+    with ThreadPoolExecutor(max_workers=max(1, len(loaders))) as pool:
+        list(pool.map(lambda loader: loader(), loaders))
+    return len(loaders)
+
+def warm_template_cache():
+    """Compiles every template now (persisting bytecode to disk for the next boot). Returns the count."""
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+    names = app.jinja_env.list_templates(filter_func=lambda name: name.endswith('.html'))
+    for name in names: app.jinja_env.get_template(name)
+    return len(names)
+
+def get_lan_ip():
+    """The machine's LAN address from its own interfaces (no outbound probe). HFF_HOST_IP overrides."""
+    if os.environ.get('HFF_HOST_IP'): return os.environ['HFF_HOST_IP']
+    try:
+        addresses = [info[4][0] for info in socket.getaddrinfo(socket.gethostname(), None, socket.AF_INET)]
+    except OSError:
+        addresses = []
+    candidates = [a for a in dict.fromkeys(addresses) if not a.startswith('127.')]
+    private = [a for a in candidates if a.startswith(('192.168.', '10.')) or (a.startswith('172.') and 16 <= int(a.split('.')[1]) <= 31)]
+    return (private or candidates or ['127.0.0.1'])[0]
+
+def run_startup():
+    """Loads data and warms caches, filling startup_timings. Returns the LAN IP to advertise."""
+    global server_ready
+    boot_start = time.perf_counter()
+    step_start = boot_start
+    def mark(step):
+        nonlocal step_start
+        now = time.perf_counter(); startup_timings[step] = round(now - step_start, 4); step_start = now
+    num_banks = load_round_data(); mark('load_round_data')
+    num_templates = warm_template_cache(); mark('warm_templates')
+    local_ip = get_lan_ip(); mark('lan_ip')
+    startup_timings['total'] = round(time.perf_counter() - boot_start, 4)
+    server_ready = True
+    print(f"[STARTUP] Ready in {startup_timings['total']*1000:.0f}ms ({num_banks} banks, {num_templates} templates): {startup_timings}")
+    return local_ip
+
+def freeze_shared_state():
+    """
+    Called once the banks and templates are loaded, just before a pre-fork master forks its workers.
+    Moves everything allocated so far into the GC's permanent generation, so collections in the
+    workers never write to (and un-share) those copy-on-write pages. Returns the number of objects frozen.
+    """
+    gc.collect(); gc.freeze()
+    return gc.get_freeze_count()
+
+def configure_venue(room_code, port):
+    """Points a forked worker at its own venue: room code, room names and port (set from the env when run directly)."""
+    global ROOM_CODE, MAIN_ROOM, PLAYERS_ROOM, SERVER_PORT
+    ROOM_CODE = room_code.upper(); SERVER_PORT = port
+    MAIN_ROOM = f'main_room:{ROOM_CODE}'; PLAYERS_ROOM = f'players_room:{ROOM_CODE}'
+
+def serve(local_ip):
+    """Prints the connect banner and runs the server until it stops."""
+    port = SERVER_PORT
+    print("\n" + "*"*50)
+    print("*" + " "*48 + "*")
+    print(f"*  Handley's Fun Factory is running! {' '*10}*")
+    print("*" + " "*48 + "*")
+    print(f"*  Connect player devices to: {' '*14}*")
+    print(f"*  http://{local_ip}:{port} {' '*(27-len(local_ip)-len(str(port)))}*")
+    print(f"*  Room code: {ROOM_CODE} {' '*(35-len(ROOM_CODE))}*")
+    print("*" + " "*48 + "*")
+    print("*"*50 + "\n")
+
+    socketio.start_background_task(session_sweeper)
+    print("Starting Flask-SocketIO server..."); use_debug = False
+    # Threading mode serves from Werkzeug; fine for a LAN party, which is all this ever is
+    socketio.run(app, host='0.0.0.0', port=port, debug=use_debug, **({'allow_unsafe_werkzeug': True} if ASYNC_MODE == 'threading' else {}))
+    print("Server stopped.")
+
 # === ROUTES ===
 @app.route('/')
 def index(): return render_template('index.html')
 @app.route('/main')
 def main_screen_route(): return render_template('main_screen.html')
+@app.route('/metrics')
+def metrics_route():
+    """Runtime counters for the render pool, session registries, display pacing, turn deadlines, explainers and the venue actor."""
+    return jsonify({'render_pool': render_pool_stats(), 'sessions': session_registry_stats(), 'pacing': pacing_stats,
+                    'deadlines': deadline_stats, 'explainers': explainer_stats, 'venue_actor': dict(actor_stats, queued=venue_inbox.qsize())})
+@app.route('/ready')
+def readiness_route():
+    """Readiness probe: 200 once data is loaded and templates are compiled, 503 before. The router also reads the venue's occupancy here."""
+    return jsonify({'ready': server_ready, 'startup_timings': startup_timings, 'room_code': ROOM_CODE,
+                    'main_screen': main_screen_sid is not None, 'players': len(players), 'game_state': game_state}), (200 if server_ready else 503)
+
+# === VENUE ACTOR ===
+# Run as separate greenlets, game handlers would interleave: a second submission or a disconnect
+# could run a turn processor while another was still inside it. Instead the venue owns one inbox,
+# and a single greenlet runs every state-changing event from it, one at a time and in arrival
+# order. Nothing it runs ever sleeps: every wait in the game flow (screen holds, cue timelines,
+# pauses, deadlines, the presence grace re-check) is a timer that posts the next step into the
+# same inbox, so joins, reconnects and answers are handled within milliseconds at any point.
+# Acks (game_state_ack, display_*, cue_timeline_skip, clock_sync) only bump counters, so they
+# skip the queue; display_done and cue_timeline_skip post a release when a flow step is waiting.
+VENUE_ACTOR = os.environ.get('HFF_VENUE_ACTOR', '1') != '0' # 0 = run handlers directly, as before
+venue_inbox = new_queue() # (fn, args, environ, sid, namespace, event, queued_at)
+venue_actor_thread = None
+venue_actor_start_lock = threading.Lock() # Threading mode: two first events must not start two actors
+actor_stats = {'events': 0, 'timers': 0, 'dropped': 0, 'errors': 0, 'max_queued': 0, 'max_wait_ms': 0.0}
+
+def post_to_venue(fn, args=(), environ=None, sid=None, namespace=None, event=None):
+    """Queues one message for the venue actor, starting the actor on first use."""
+    global venue_actor_thread
+    with venue_actor_start_lock:
+        if venue_actor_thread is None: venue_actor_thread = socketio.start_background_task(run_venue_actor)
+    venue_inbox.put((fn, args, environ, sid, namespace, event, time.monotonic()))
+    actor_stats['max_queued'] = max(actor_stats['max_queued'], venue_inbox.qsize())
+
+def run_venue_actor():
+    """The venue's only game-state greenlet: runs queued events to completion, one at a time."""
+    while True:
+        fn, args, environ, sid, namespace, event, queued_at = venue_inbox.get()
+        actor_stats['max_wait_ms'] = max(actor_stats['max_wait_ms'], (time.monotonic() - queued_at) * 1000)
+        if sid and event != 'disconnect' and not socketio.server.manager.is_connected(sid, namespace):
+            actor_stats['dropped'] += 1; continue # Sent just before its client left; its disconnect is queued behind it
+        actor_stats['events' if sid else 'timers'] += 1
+        # Socket events get their own request back (request.sid, emit and join_room rely on it);
+        # timers get a bare one because results templates use url_for
+        with (app.request_context(environ) if environ else app.test_request_context('/')):
+            if sid: request.sid = sid; request.namespace = namespace
+            try: fn(*args)
+            except Exception:
+                actor_stats['errors'] += 1
+                print(f"ERROR in venue event {fn.__name__}:"); traceback.print_exc()
+
+def venue_event(handler):
+    """Socket.IO handler decorator (below @socketio.on): the handler runs on the venue actor."""
+    if not VENUE_ACTOR: return handler
+    num_params = len(inspect.signature(handler).parameters) # e.g. disconnect's reason is dropped for handlers without one
+    @wraps(handler)
+    def enqueue(*args):
+        post_to_venue(handler, args[:num_params], request.environ, request.sid, request.namespace, request.event['message'])
+    return enqueue
+
+def venue_call(fn, *args):
+    """Runs fn on the venue actor (from a timer or background task)."""
+    if VENUE_ACTOR: post_to_venue(fn, args); return
+    with app.test_request_context('/'): fn(*args)
+
+def venue_call_after(seconds, fn, *args):
+    """Delivers fn to the venue actor after `seconds`; other events keep running meanwhile."""
+    socketio.start_background_task(lambda: (socketio.sleep(seconds), venue_call(fn, *args)))
 
 # === SOCKET.IO HANDLERS ===
 @socketio.on('connect')
 def handle_connect(): print(f"Client connected: {request.sid}")
 
 @socketio.on('disconnect')
+@venue_event
 def handle_disconnect():
     player_sid = request.sid; global main_screen_sid
     print(f"[DISCONNECT] sid={request.sid} state={game_state}")
     if player_sid == main_screen_sid: print("Main Screen disconnected."); main_screen_sid = None; leave_room(MAIN_ROOM, player_sid)
-    elif player_sid in players:
-        player_name = players[player_sid].get('name', '?')
-        players[player_sid]['connected'] = False  # <-- NEW: mark offline, keep state
+    elif sid_to_pid.get(player_sid) in players:
+        player_pid = sid_to_pid.pop(player_sid)
+        if pid_to_sid.get(player_pid) == player_sid: pid_to_sid.pop(player_pid)
+        player_name = players[player_pid].name
+        players[player_pid].connected = False  # <-- NEW: mark offline, keep state
+        players[player_pid].disconnected_at = time.time() # Evicted between games once past SESSION_TTL_SECONDS
         print(f"Player {player_name} disconnected (state preserved).")
         leave_room(PLAYERS_ROOM, player_sid)
         emit_player_list_update()
         emit_game_state_update()
-        # Check results conditions for GTA and GTY only
-        if game_state == 'guess_age_ongoing' and check_all_guesses_received_gta(): process_guess_age_turn_results()
-        elif game_state == 'guess_the_year_ongoing' and check_all_guesses_received_gty(): process_guess_the_year_turn_results()
-        elif game_state == 'who_didnt_do_it_ongoing' and check_all_guesses_received_wddi(): process_who_didnt_do_it_turn_results()
-        elif game_state == 'order_up_ongoing' and check_all_submissions_received_ou(): process_order_up_turn_results()   
-        elif game_state == 'quick_pairs_ongoing' and check_all_submissions_received_qp(): process_quick_pairs_turn_results()
-        elif game_state == 'true_or_false_ongoing' and check_all_guesses_received_tf(): process_true_or_false_turn_results()
-        elif game_state == 'tap_the_pic_ongoing' and check_all_guesses_received_ttp(): process_tap_the_pic_turn_results()
-        elif game_state == 'the_top_three_ongoing' and check_all_submissions_received_ttt(): process_the_top_three_turn_results()
-        elif game_state == 'higher_or_lower_ongoing' and hol_current_turn_stage == 'AWAITING_GUESSES' and check_all_guesses_received_hol(): process_results_higher_or_lower()
-        elif game_state == 'averagers_assemble_ongoing' and aa_round_phase == 'gameplay' and check_all_guesses_received_aa(): process_results_aa()
+        reevaluate_turn_quorum() # In case everyone else has answered already
+        socketio.start_background_task(reevaluate_quorum_after_grace)
     else: print(f"Unregistered client disconnected: {player_sid}")
 
 @socketio.on('register_main_screen')
+@venue_event
 def handle_register_main_screen():
     print(f"[MAIN_REGISTER] sid={request.sid} state={game_state}")
-    global main_screen_sid; player_sid = request.sid
+    global main_screen_sid, main_screen_acked_version, main_screen_sent_version; player_sid = request.sid
     if main_screen_sid and main_screen_sid != player_sid: print(f"WARN: New main screen {player_sid}.")
     leave_room(PLAYERS_ROOM, player_sid); join_room(MAIN_ROOM, player_sid); main_screen_sid = player_sid
+    main_screen_acked_version = None; main_screen_sent_version = None # (Re)connect always starts from a snapshot
     print(f"Main Screen registered: {main_screen_sid}")
-    emit_player_list_update(); emit_game_state_update()
+    emit_player_list_update(); emit_game_state_update(full=True)
+    if current_cue_timeline and (current_cue_timeline['name'] == 'game_over' and game_state == 'overall_game_over'
+                                 or time.time() * 1000 < current_cue_timeline['start_at_ms'] + current_cue_timeline['duration'] * 1000):
+        emit('cue_timeline', current_cue_timeline, room=player_sid) # Resumes at the right offset
+
+@socketio.on('game_state_ack')
+def handle_game_state_ack(data):
+    """The main screen confirms which state version it has applied."""
+    global main_screen_acked_version
+    if request.sid != main_screen_sid: return
+    try: version = int((data or {}).get('version'))
+    except (TypeError, ValueError): return
+    if 0 <= version <= game_state_version and (main_screen_acked_version is None or version > main_screen_acked_version):
+        main_screen_acked_version = version
+
+@socketio.on('request_game_state_snapshot')
+@venue_event
+def handle_request_game_state_snapshot():
+    """The main screen detected a version gap and wants a full snapshot."""
+    if request.sid != main_screen_sid: return
+    print(f"[GAME_STATE_UPDATE] Snapshot requested by main screen (acked={main_screen_acked_version}).")
+    emit_game_state_update(full=True)
+
+@socketio.on('display_ready')
+def handle_display_ready(data):
+    """The main screen has injected fragment display_id."""
+    global main_screen_display_ready_id
+    if request.sid != main_screen_sid: return
+    try: display_id = int((data or {}).get('display_id'))
+    except (TypeError, ValueError): return
+    main_screen_display_ready_id = max(main_screen_display_ready_id, min(display_id, main_screen_display_id))
+
+@socketio.on('display_done')
+def handle_display_done(data):
+    """The main screen has finished animating fragment display_id; a held screen may advance."""
+    global main_screen_display_done_id
+    if request.sid != main_screen_sid: return
+    try: display_id = int((data or {}).get('display_id'))
+    except (TypeError, ValueError): return
+    main_screen_display_done_id = max(main_screen_display_done_id, min(display_id, main_screen_display_id))
+    hold = display_hold
+    if hold and main_screen_display_done_id >= hold['display_id'] and time.monotonic() - hold['started'] >= hold['min_s']:
+        venue_call(release_display_hold, hold['id']) # Past its minimum already, so the screen can move on now
 
 @socketio.on('register_player')
+@venue_event
 def handle_register_player(data):
     global pid_to_sid, sid_to_pid
 
     player_sid = request.sid
     player_name = str(data.get('name', f'P_{player_sid[:4]}')).strip()[:15] or f'P_{player_sid[:4]}'
-    pid = str(data.get('pid', '')).strip()
+    player_pid = str(data.get('pid', '')).strip() or player_sid # Old clients without a pid are keyed by their sid
 
     if player_sid == main_screen_sid:
         return
 
-    # --- PID-based reconnect handling (SID migration) ---
-    if pid:
-        old_sid = pid_to_sid.get(pid)
-        if old_sid and old_sid != player_sid and old_sid in players:
-            migrate_player_sid(old_sid, player_sid)
-            sid_to_pid.pop(old_sid, None)
-
-        pid_to_sid[pid] = player_sid
-        sid_to_pid[player_sid] = pid
-
-    # Now enforce max players ONLY for truly new players
-    if len(players) >= MAX_PLAYERS and player_sid not in players:
+    # Enforce max players ONLY for truly new players
+    if len(players) >= MAX_PLAYERS and player_pid not in players:
         emit('message', {'data': 'Game full.'}, room=player_sid)
         return
 
+    # --- Reconnect handling: only the sid<->pid routing changes ---
+    old_sid = pid_to_sid.get(player_pid)
+    if old_sid and old_sid != player_sid:
+        sid_to_pid.pop(old_sid, None)
+        leave_room(PLAYERS_ROOM, old_sid)
+    pid_to_sid[player_pid] = player_sid
+    sid_to_pid[player_sid] = player_pid
+
     # Ensure this socket is in the players room (CRITICAL for reconnects)
     join_room(PLAYERS_ROOM, player_sid)
 
-    if player_sid not in players:
+    if player_pid not in players:
         # Initialize player
-        players[player_sid] = {
-            'name': player_name,
-            'connected': True,
-            'round_score': 0,
-            'gta_current_guess': None,
-            'gty_current_guess': None,
-            'wddi_current_guess': None,
-            'ou_current_submission': None,
-            'qp_current_submission': None,
-            'qp_submission_time_ms': float('inf'),
-            'tf_current_guess': None,
-            'ttp_current_guess': None,
-            'ttt_current_submission': None,
-            'hol_current_guess': None,
-            'aa_current_guess': None
-        }
-        overall_game_scores[player_sid] = 0
-        print(f"Player registered: {player_name} ({player_sid[:4]})")
+        players[player_pid] = Player(player_pid, allocate_player_slot(player_pid), player_name)
+        overall_game_scores[player_pid] = 0; leaderboard.set(player_pid, 0)
+        mark_scores_dirty(player_pid)
+        print(f"Player registered: {player_name} ({player_pid[:4]})")
         emit('message', {'data': f'Welcome {player_name}!'}, room=player_sid)
     else:
-        players[player_sid]['name'] = player_name
-        players[player_sid]['connected'] = True
+        players[player_pid].name = player_name
+        players[player_pid].connected = True
+        players[player_pid].disconnected_at = None
+        mark_scores_dirty(player_pid)
         emit('message', {'data': f'Rejoined as {player_name}.'}, room=player_sid)
 
     emit_player_list_update()
     emit_game_state_update()
 
-    # Better join mid-game handling: re-send the current prompt
-    if game_state.endswith('_ongoing'):
-        resend_current_prompt_to_player(player_sid)
-    elif game_state.endswith('_results') or game_state.endswith('_results_display') or game_state in ('hol_results_display', 'aa_results_display'):
-        emit('results_on_main_screen', room=player_sid)
-    elif game_state == 'overall_game_over':
-        emit('overall_game_over_player', room=player_sid)
-    elif game_state == 'waiting':
+    # Catch the controller up by replaying whatever it missed from its outbound log
+    replayed = replay_player_outbox(player_pid, data.get('last_seq'))
+    if not replayed and game_state == 'waiting':
         emit('message', {'data': f'Welcome {player_name}! Waiting...'}, room=player_sid)
-
-
+    if turn_deadline_ends_at is not None: emit_turn_deadline(to=player_sid) # Resume the countdown
+
+
+
+# === GAME PLAN ===
+# While the game intro plays, a background task samples every round's questions, pre-shuffles
+# their option orders and pre-renders the static round screens. Round transitions then just
+# read from game_plan; anything missing (plan not ready, player count changed) falls back to
+# doing the work inline as before. The task only sees a snapshot of its inputs and hands each
+# round back as a venue event, so game_plan is only ever touched by the venue actor.
+ROUND_QUESTION_SOURCES = { # round type -> (bank, turns to plan for)
+    'guess_the_age': lambda: (gta_celebrities, gta_target_turns),
+    'guess_the_year': lambda: (gty_questions, gty_target_turns),
+    'who_didnt_do_it': lambda: (wddi_questions, wddi_target_turns),
+    'order_up': lambda: (ou_questions, ou_target_turns or len(ou_questions)),
+    'quick_pairs': lambda: (qp_questions, qp_target_turns),
+    'true_or_false': lambda: (tf_questions, tf_target_turns),
+    'tap_the_pic': lambda: (ttp_questions, ttp_target_turns),
+    'the_top_three': lambda: (ttt_questions, ttt_target_turns),
+    'higher_or_lower': lambda: (hol_questions, get_hol_turn_config(len(players))['turns']),
+    'averagers_assemble': lambda: (aa_questions, aa_target_turns),
+}
+game_plan = {} # {game round num: {'round_type', 'questions', 'intro_html', 'how_to_play_html'}}
+game_plan_id = 0 # Bumped per game so a stale planner never writes into a newer game's plan
+
+def shuffled(items):
+    """A shuffled copy of items."""
+    items = list(items); random.shuffle(items)
+    return items
+
+def plan_question_orders(round_type, question):
+    """Pre-shuffles the option ID order a turn would otherwise shuffle when it starts."""
+    if round_type in ('who_didnt_do_it', 'the_top_three'): question['planned_order'] = shuffled(range(len(question['options'])))
+    elif round_type == 'order_up': question['planned_order'] = shuffled(range(len(question['items_in_correct_order'])))
+    elif round_type == 'quick_pairs':
+        question['planned_order_a'] = shuffled(range(len(question['pairs'])))
+        question['planned_order_b'] = shuffled(range(len(question['pairs'])))
+    return question
+
+def turn_option_order(question, plan_key, count):
+    """This turn's display order as option IDs: the game plan's shuffle, or a fresh one."""
+    return question.get(plan_key) or shuffled(range(count))
+
+def valid_option_ids(ids, count, length=None):
+    """A list of distinct option IDs in range(count) (of the given length, if any)."""
+    return isinstance(ids, list) and (length is None or len(ids) == length) and len(set(ids)) == len(ids) and \
+        all(type(i) is int and 0 <= i < count for i in ids)
+
+def precompute_game_plan(plan_id, rounds, sources):
+    """Background task: plans every selected round from sources ({round type: (bank, turns)}, snapshotted
+    on the venue actor) and publishes each one with venue_call."""
+    started = time.perf_counter()
+    with app.test_request_context('/'): # Templates use url_for
+        for round_num, round_type in enumerate(rounds, start=1):
+            if plan_id != game_plan_id: return # A newer game started; publish_game_plan_round would drop it anyway
+            bank, turns = sources[round_type]
+            entry = {'round_type': round_type, 'questions': [], 'intro_html': None, 'how_to_play_html': None}
+            if bank and turns:
+                entry['questions'] = [plan_question_orders(round_type, q) for q in bank.sample(min(turns, len(bank)))]
+            try:
+                entry['intro_html'] = render_fragment('_round_intro.html', {'game_round_num': round_num, 'game_rounds_total': GAME_ROUNDS_TOTAL,
+                    'round_type_name': ROUND_DISPLAY_NAMES.get(round_type, round_type), 'round_rules': ROUND_RULES.get(round_type, "No rules.")})
+                if round_type in ROUND_EXPLAINER_INFO:
+                    entry['how_to_play_html'] = render_fragment('_how_to_play.html', ROUND_EXPLAINER_INFO[round_type])
+            except Exception as e:
+                print(f"[GAME_PLAN] Render failed for {round_type}: {e}")
+            venue_call(publish_game_plan_round, plan_id, round_num, entry)
+            socketio.sleep(0) # Let handlers run between rounds
+    print(f"[GAME_PLAN] Planned {len(rounds)} rounds in {(time.perf_counter() - started)*1000:.0f}ms")
+
+def publish_game_plan_round(plan_id, round_num, entry):
+    """Venue event from precompute_game_plan: stores one planned round, unless it's for an earlier game."""
+    if plan_id == game_plan_id: game_plan[round_num] = entry
+
+def take_planned_questions(round_type, bank, count):
+    """The current round's questions from the game plan, or a fresh sample if the plan can't cover it."""
+    plan = game_plan.get(current_game_round_num)
+    if plan and plan['round_type'] == round_type and len(plan['questions']) >= count:
+        return plan['questions'][:count]
+    print(f"[GAME_PLAN] No plan for {round_type} x{count}; sampling inline.")
+    return bank.sample(count)
 
 # === OVERALL GAME FLOW ===
 @socketio.on('start_game_request')
-def handle_start_overall_game_request():
-    global game_state, current_game_round_num, selected_rounds_for_game, overall_game_scores
+@venue_event
+def handle_start_overall_game_request(data=None):
+    global game_state, current_game_round_num, selected_rounds_for_game, overall_game_scores, last_players_room_event
+    global force_explainers
     if request.sid != main_screen_sid or game_state != "waiting": return
+    force_explainers = bool((data or {}).get('force_explainers'))
     if not players or not AVAILABLE_ROUND_TYPES: print("ERR: Cannot start."); return
     
     print("--- Overall Game start request received ---");
+    evict_stale_sessions() # Long-gone players should not be dealt into the new game
+    if not players: print("ERR: Cannot start."); return
     
     # --- Step 1: Basic Game Setup ---
     game_state = "game_intro" # New state
     current_game_round_num = 0
-    overall_game_scores = {sid: 0 for sid in players};
+    overall_game_scores = {pid: 0 for pid in players}; leaderboard.reset(players)
+    mark_scores_dirty(*players)
+    player_outboxes.clear(); last_players_room_event = None # Previous game's events are never replayed
+    global game_plan_id; game_plan_id += 1; game_plan.clear()
     # Select rounds for the game (this logic is unchanged)
     num_avail = len(AVAILABLE_ROUND_TYPES)
     if num_avail >= GAME_ROUNDS_TOTAL: selected_rounds_for_game = random.sample(AVAILABLE_ROUND_TYPES, GAME_ROUNDS_TOTAL)
@@ -745,7 +1880,7 @@ def handle_start_overall_game_request():
     # --- Step 2: Prepare data for the intro screen ---
     num_players = len(players)
     points_structure = get_points_structure(num_players)
-    player_names = [p['name'] for p in players.values()]
+    player_names = [p.name for p in players.values()]
 
     intro_context = {
         'total_rounds': GAME_ROUNDS_TOTAL,
@@ -758,24 +1893,22 @@ def handle_start_overall_game_request():
     # We will use the #results-area div, as it's a full-screen takeover
     update_main_screen_html('#results-area', '_game_intro.html', intro_context)
     
-    # --- Step 4: Tell the main screen to start its audio/visual sequence ---
-    socketio.emit('start_game_intro_sequence', {}, room=main_screen_sid)
-    
-    # The server now WAITS. It will not proceed until the main screen tells it the intro is finished.
-    print("   Game intro screen displayed. Waiting for client to signal completion...")
+    # --- Step 4: Send the intro's audio timeline; we move on when it ends ---
+    timeline_id, duration = send_cue_timeline('game_intro', intro_timeline())
 
-@socketio.on('game_intro_finished')
-def handle_game_intro_finished():
-    """Called by the main screen when its intro audio sequence is done."""
+    # Use the intro's runtime to plan every round in the background
+    plan_sources = {round_type: ROUND_QUESTION_SOURCES[round_type]() for round_type in set(selected_rounds_for_game)}
+    socketio.start_background_task(precompute_game_plan, game_plan_id, list(selected_rounds_for_game), plan_sources)
+
+    print("   Game intro screen displayed. Running the intro timeline...")
+    after_cue_timeline(timeline_id, duration, finish_game_intro)
+
+def finish_game_intro():
     global game_state
-    if request.sid != main_screen_sid or game_state != "game_intro":
-        return
-    
-    print("--- Client signaled game intro finished. Starting first round. ---")
+    print("--- Game intro finished. Starting first round. ---")
     game_state = "game_ongoing" # Update state
     emit_game_state_update()
-    socketio.sleep(1) # Small pause for transition
-    start_next_game_round()
+    continue_after(1, start_next_game_round) # Small pause for transition
 
 def start_next_game_round():
     global current_game_round_num, game_state
@@ -798,31 +1931,60 @@ def start_next_game_round():
     if jingle_file and main_screen_sid:
         socketio.emit('play_round_jingle', {'jingle_file': jingle_file}, room=main_screen_sid)
     
-    intro_context = {'game_round_num': current_game_round_num, 'game_rounds_total': GAME_ROUNDS_TOTAL, 'round_type_name': round_type_name, 'round_rules': round_rules }
-    update_main_screen_html('#results-area', '_round_intro.html', intro_context)
+    plan = game_plan.get(current_game_round_num, {})
+    if plan.get('intro_html'):
+        emit_main_screen_html('#results-area', plan['intro_html'])
+    else:
+        intro_context = {'game_round_num': current_game_round_num, 'game_rounds_total': GAME_ROUNDS_TOTAL, 'round_type_name': round_type_name, 'round_rules': round_rules }
+        update_main_screen_html('#results-area', '_round_intro.html', intro_context)
     
-    socketio.sleep(get_round_timing('intro_card'))
-    if game_state != "round_intro": return # State check
-
-    # --- Step 2: Check for and show "How to Play" screen ---
-    if round_type_key in ROUND_EXPLAINER_INFO:
+    hold_display('intro_card', show_round_explainer, round_type_key, audio=jingle_file if main_screen_sid else None)
+
+def show_round_explainer(round_type_key):
+    """Step 2 of a round's intro: the "How to Play" screen (in full, as a recap, or skipped), then the round."""
+    plan = game_plan.get(current_game_round_num, {})
+    explainer_mode = explainer_mode_for(round_type_key)
+    if explainer_mode == 'skip':
+        print(f"   Everyone has heard the {round_type_key} explainer. Skipping it.")
+        explainer_stats['skipped'] += 1
+        start_round_logic(round_type_key)
+    elif explainer_mode == 'recap':
+        print(f"   Everyone has heard the {round_type_key} explainer. Showing a quick recap card.")
+        explainer_stats['recapped'] += 1
+        if plan.get('how_to_play_html'): emit_main_screen_html('#results-area', plan['how_to_play_html'])
+        else: update_main_screen_html('#results-area', '_how_to_play.html', ROUND_EXPLAINER_INFO[round_type_key])
+        hold_display('explainer_recap', start_round_logic, round_type_key)
+    elif explainer_mode == 'full':
         print(f"   Found explainer for {round_type_key}. Showing how-to-play screen.")
         explainer_data = ROUND_EXPLAINER_INFO[round_type_key]
+        explainer_stats['played'] += 1
         
         # Update the main screen with the explainer template
-        update_main_screen_html('#results-area', '_how_to_play.html', explainer_data)
+        if plan.get('how_to_play_html'): emit_main_screen_html('#results-area', plan['how_to_play_html'])
+        else: update_main_screen_html('#results-area', '_how_to_play.html', explainer_data)
         
-        # Tell the client to play the audio and start its sequence
-        socketio.emit('show_how_to_play', {'audio_file': explainer_data['audio_file']}, room=main_screen_sid)
-        
-        # The server now STOPS and waits for the client to signal it's done.
-        return # End the function here for now.
+        # Play the explainer as a timeline and start the round when it ends
+        timeline_id, duration = send_cue_timeline('how_to_play', explainer_timeline(explainer_data['audio_file']))
+        after_cue_timeline(timeline_id, duration, finish_round_explainer, round_type_key)
     
     # --- Step 3: If no explainer, start the round directly ---
     else:
         print(f"   No explainer for {round_type_key}. Starting round directly.")
         start_round_logic(round_type_key) # Use a helper to avoid repetition
 
+def finish_round_explainer(round_type_key):
+    explainers_heard.setdefault(round_type_key, set()).update(players)
+    print("--- How-to-play finished. Starting round logic. ---")
+    start_round_logic(round_type_key)
+
+
+def explainer_mode_for(round_type_key):
+    """'full', 'recap', 'skip', or None (no explainer) for this round with the current lobby."""
+    if round_type_key not in ROUND_EXPLAINER_INFO: return None
+    if force_explainers or EXPLAINER_REPEAT_MODE == 'full': return 'full'
+    heard = explainers_heard.get(round_type_key, set())
+    if any(pid not in heard for pid in players): return 'full' # Someone new needs the whole thing
+    return 'skip' if EXPLAINER_REPEAT_MODE == 'skip' else 'recap'
 
 # We need a new helper function to avoid repeating the big if/else block
 def start_round_logic(round_type_key):
@@ -839,21 +2001,27 @@ def start_round_logic(round_type_key):
     elif round_type_key == 'averagers_assemble': setup_averagers_assemble_round()
     else:
         print(f"ERR: Unknown round type '{round_type_key}' in start_round_logic. Skipping.")
-        socketio.sleep(1)
-        start_next_game_round()
-
-# And we need the new listener for the handshake
-@socketio.on('how_to_play_finished')
-def handle_how_to_play_finished():
-    """Called by the main screen when the explainer audio is done."""
-    if request.sid != main_screen_sid or game_state != "round_intro":
-        return
-
-    print("--- Client signaled how-to-play finished. Starting round logic. ---")
-    round_type_key = selected_rounds_for_game[current_game_round_num - 1]
-    start_round_logic(round_type_key)
+        continue_after(1, start_next_game_round)
+
+@socketio.on('clock_sync')
+def handle_clock_sync(data):
+    """Clock sync probe from the main screen: echoes its timestamp with ours (NTP-style, via the ack)."""
+    return {'client_ts': (data or {}).get('client_ts'), 'server_ts': time.time() * 1000}
+
+@socketio.on('cue_timeline_skip')
+def handle_cue_timeline_skip(data):
+    """The main screen can't play this timeline (muted/no audio), so don't wait out its length."""
+    global cue_timeline_skipped_id
+    if request.sid != main_screen_sid: return
+    try: timeline_id = int((data or {}).get('timeline_id'))
+    except (TypeError, ValueError): return
+    if timeline_id == cue_timeline_id and current_cue_timeline and current_cue_timeline['name'] != 'game_over':
+        cue_timeline_skipped_id = timeline_id
+        print(f"[CUES] Main screen skipped timeline #{timeline_id}")
+        venue_call(finish_cue_timeline, timeline_id)
 
 @socketio.on('request_reset_game')
+@venue_event
 def handle_request_reset_game():
     """Triggered by the 'Play Again' button. Resets the game to the lobby."""
     global game_state
@@ -863,6 +2031,7 @@ def handle_request_reset_game():
     print("--- Reset request received. Returning to waiting state. ---")
     game_state = "waiting"
     emit_game_state_update()
+    evict_stale_sessions()
     # Tell the main screen it's ready for a new game, which should take it to the lobby.
     socketio.emit('ready_for_new_game', room=main_screen_sid)
 
@@ -872,9 +2041,7 @@ def end_overall_game():
     game_state = "overall_game_over"
     emit_game_state_update()
     
-    final_scores = []
-    sorted_players = sorted(overall_game_scores.items(), key=lambda item: item[1], reverse=True)
-    final_scores = [{'rank': r+1, 'name': players.get(sid, {}).get('name', '?'), 'game_score': score} for r, (sid, score) in enumerate(sorted_players)]
+    final_scores = overall_scores_view()
     
     print("Final Scores:", final_scores)
     
@@ -882,232 +2049,13 @@ def end_overall_game():
     update_main_screen_html('#overall-game-over-area', '_overall_game_over.html', {'scores': final_scores})
     
     # Tell players to look at the main screen.
-    socketio.emit('overall_game_over_player', room=PLAYERS_ROOM)
+    emit_to_players('overall_game_over_player')
     
-    # NOW, tell the client to start the audio sequence.
+    # NOW, send the victory audio timeline (it enables Play Again when it ends).
     # A tiny delay ensures the HTML has time to render on the client.
-    socketio.sleep(0.1) 
-    socketio.emit('start_game_over_sequence', {}, room=main_screen_sid)
+    continue_after(0.1, send_cue_timeline, 'game_over', game_over_timeline())
     
-    print("Sent overall game over notices and sequence trigger.")
-
-def resend_current_prompt_to_player(player_sid):
-    """If a player rejoins mid-round, re-send the *current* prompt just to them."""
-    if player_sid not in players:
-        return
-
-    # If the game isn't in an active "prompting" moment, just tell them where to look.
-    if game_state in ("waiting", "game_intro", "round_intro"):
-        emit('message', {'data': 'Connected. Waiting for next prompt...'}, room=player_sid)
-        return
-
-    if game_state == "overall_game_over":
-        emit('overall_game_over_player', room=player_sid)
-        return
-
-    # -------------------------
-    # GUESS THE AGE (GTA)
-    # -------------------------
-    if game_state == "guess_age_ongoing":
-        if players[player_sid].get('gta_current_guess') is None:
-            if gta_current_celebrity:
-                socketio.emit('gta_player_prompt', {'celebrity_name': gta_current_celebrity['name']}, room=player_sid)  # :contentReference[oaicite:6]{index=6}
-            else:
-                emit('message', {'data': 'Round loading...'}, room=player_sid)
-        else:
-            remaining = sum(1 for p in players.values() if p.get('gta_current_guess') is None)
-            emit('gta_wait_for_guesses', {'waiting_on': remaining}, room=player_sid)  # 
-        return
-
-    # -------------------------
-    # GUESS THE YEAR (GTY)
-    # -------------------------
-    if game_state == "guess_the_year_ongoing":
-        if players[player_sid].get('gty_current_guess') is None:
-            if gty_current_question:
-                socketio.emit('gty_player_prompt', {'question': gty_current_question['question']}, room=player_sid)  # :contentReference[oaicite:8]{index=8}
-            else:
-                emit('message', {'data': 'Round loading...'}, room=player_sid)
-        else:
-            remaining = sum(1 for p in players.values() if p.get('gty_current_guess') is None)
-            emit('gty_wait_for_guesses', {'waiting_on': remaining}, room=player_sid)  # 
-        return
-
-    # -------------------------
-    # WHO DIDN'T DO IT (WDDI)
-    # -------------------------
-    if game_state == "who_didnt_do_it_ongoing":
-        # index.html expects: { question: "...", shuffled_options: [...] } :contentReference[oaicite:10]{index=10}
-        if players[player_sid].get('wddi_current_guess') is None:
-            if wddi_current_question and wddi_current_shuffled_options:
-                socketio.emit(
-                    'wddi_player_prompt',
-                    {'question': wddi_current_question.get('question', ''), 'shuffled_options': wddi_current_shuffled_options},
-                    room=player_sid
-                )
-            else:
-                emit('message', {'data': 'Round loading...'}, room=player_sid)
-        else:
-            emit('message', {'data': 'Guess locked in! Waiting for others...'}, room=player_sid)
-        return
-
-    # -------------------------
-    # ORDER UP (OU)
-    # -------------------------
-    if game_state == "order_up_ongoing":
-        if players[player_sid].get('ou_current_submission') is None:
-            if ou_current_question_data and ou_current_items_to_order:
-                socketio.emit(
-                    'ou_player_prompt',
-                    {'question': ou_current_question_data['question'], 'items_to_order': ou_current_items_to_order},
-                    room=player_sid
-                )
-            else:
-                emit('message', {'data': 'Round loading...'}, room=player_sid)
-        else:
-            emit('message', {'data': 'Order submitted! Waiting for others...'}, room=player_sid)
-        return
-
-    # -------------------------
-    # QUICK PAIRS (QP)
-    # -------------------------
-    if game_state == "quick_pairs_ongoing":
-        # IMPORTANT: align these keys with your index.html listener.
-        # Typical shape: { prompt: "...", list_a: [...], list_b: [...], num_pairs: N }
-        if players[player_sid].get('qp_current_submission') is None:
-            if qp_current_question_data:
-                socketio.emit(
-                    'qp_player_prompt',
-                    {
-                        'category_prompt': qp_current_question_data['category_prompt'],
-                        'list_a': qp_current_list_a_items,
-                        'list_b': qp_current_list_b_items,
-                        'num_pairs_to_make': QP_NUM_PAIRS_PER_QUESTION
-                    },
-                    room=player_sid
-                )
-            else:
-                emit('message', {'data': 'Round loading...'}, room=player_sid)
-        else:
-            emit('message', {'data': 'Pairs submitted! Waiting for others...'}, room=player_sid)
-        return
-
-    # -------------------------
-    # TRUE OR FALSE (TF)
-    # -------------------------
-    if game_state == "true_or_false_ongoing":
-        # IMPORTANT: align these keys with index.html.
-        # Typical: { statement: "..." }
-        if players[player_sid].get('tf_current_guess') is None:
-            if tf_current_question:
-                socketio.emit('true_or_false_player_prompt', {'statement': tf_current_question.get('statement', '')}, room=player_sid)
-            else:
-                emit('message', {'data': 'Round loading...'}, room=player_sid)
-        else:
-            emit('message', {'data': 'Answer locked in! Waiting for others...'}, room=player_sid)
-        return
-
-    # -------------------------
-    # TAP THE PIC (TTP)
-    # -------------------------
-    if game_state == "tap_the_pic_ongoing":
-        # IMPORTANT: align these keys with index.html.
-        # Typical: { question: "...", num_options: 4 } (or similar)
-        if players[player_sid].get('ttp_current_guess') is None:
-            if ttp_current_question:
-                socketio.emit(
-                    'tap_the_pic_player_prompt',
-                    {
-                        'question': ttp_current_question.get('question', ttp_current_question.get('question_text', '')),
-                        'num_options': ttp_current_question.get('num_options', 4),
-                    },
-                    room=player_sid
-                )
-            else:
-                emit('message', {'data': 'Round loading...'}, room=player_sid)
-        else:
-            emit('message', {'data': 'Answer locked in! Waiting for others...'}, room=player_sid)
-        return
-
-    # -------------------------
-    # THE TOP THREE (TTT)
-    # -------------------------
-    if game_state == "the_top_three_ongoing":
-        if players[player_sid].get('ttt_current_submission') is None:
-            if ttt_current_question and ttt_current_options_shuffled:
-                socketio.emit(
-                    'top_three_player_prompt',
-                    {
-                        'question': ttt_current_question['question_text'],
-                        'options': ttt_current_options_shuffled,
-                    },
-                    room=player_sid
-                )
-            else:
-                emit('message', {'data': 'Round loading...'}, room=player_sid)
-        else:
-            emit('message', {'data': 'Submission locked in! Waiting for others...'}, room=player_sid)
-        return
-
-    # -------------------------
-    # HIGHER OR LOWER (HOL)
-    # -------------------------
-    if game_state == "higher_or_lower_ongoing":
-        # Stages + event names confirmed in your code :contentReference[oaicite:11]{index=11}
-        if not hol_current_question:
-            emit('message', {'data': 'Round loading...'}, room=player_sid)
-            return
-
-        if player_sid == hol_current_submitter_sid:
-            if hol_current_turn_stage == 'AWAITING_SUBMISSION':
-                socketio.emit('hol_submitter_prompt', {'question': hol_current_question['question']}, room=player_sid)
-            else:
-                socketio.emit('hol_wait_prompt', {'wait_message': "Waiting for others to guess Higher or Lower."}, room=player_sid)
-        else:
-            if hol_current_turn_stage == 'AWAITING_GUESSES' and players[player_sid].get('hol_current_guess') is None:
-                socketio.emit('hol_guesser_prompt', {}, room=player_sid)
-            else:
-                socketio.emit('hol_wait_prompt', {'wait_message': "Waiting..."}, room=player_sid)
-        return
-
-    # -------------------------
-    # AVERAGERS ASSEMBLE (AA)
-    # -------------------------
-    if game_state == "averagers_assemble_ongoing":
-        # Gameplay prompt is confirmed :contentReference[oaicite:12]{index=12}
-        if aa_round_phase == 'gameplay':
-            if players[player_sid].get('aa_current_guess') is None and aa_current_question:
-                socketio.emit('aa_player_prompt', {'question': aa_current_question['question']}, room=player_sid)
-            else:
-                emit('message', {'data': 'Waiting for others...'}, room=player_sid)
-            return
-
-        # Selection phase: IMPORTANT — align this payload with your index.html 'aa_pick_teammate_prompt' listener.
-        if aa_round_phase == 'selection':
-            picker_name = players.get(aa_current_picker_sid, {}).get('name', 'a player')
-
-            if player_sid == aa_current_picker_sid:
-                choosable_players = [
-                    {'sid': sid, 'name': players[sid]['name']}
-                    for sid in aa_unpicked_players
-                    if sid != aa_current_picker_sid and sid in players
-                ]
-                socketio.emit(
-                    'aa_pick_teammate_prompt',
-                    {'players_to_choose_from': choosable_players},
-                    room=player_sid
-                )
-            else:
-                socketio.emit(
-                    'aa_wait_prompt',
-                    {'wait_message': f"Waiting for {picker_name} to pick a teammate..."},
-                    room=player_sid
-                )
-            return
-
-    # Fallback
-    emit('message', {'data': 'Connected. Waiting for next prompt...'}, room=player_sid)
-
+    print("Sent overall game over notices; the sequence follows.")
 
 # === GUESS THE AGE LOGIC ===
 # (setup_guess_age_round, next_guess_age_turn, handle_submit_gta_guess, process_guess_age_turn_results, end_guess_age_round - Reverted to the state before WDDI was added, includes debug logs)
@@ -1115,35 +2063,44 @@ def setup_guess_age_round():
     global game_state, gta_shuffled_celebrities_this_round, gta_current_celebrity_index, gta_actual_turns_this_round, gta_celebrities, gta_target_turns
     print("--- Setup GTA Round ---"); game_state = "guess_age_ongoing"
     if not gta_celebrities: print("ERR: No celebs for GTA."); start_next_game_round(); return
-    for sid in players: players[sid]['round_score'] = 0; players[sid]['gta_current_guess'] = None
-    gta_actual_turns_this_round = min(gta_target_turns, len(gta_celebrities)); gta_shuffled_celebrities_this_round = random.sample(gta_celebrities, gta_actual_turns_this_round)
-    gta_current_celebrity_index = -1; print(f"GTA Round: {gta_actual_turns_this_round} turns."); emit_game_state_update(); socketio.sleep(0.5); next_guess_age_turn()
+    for pid in players: players[pid].round_score = 0
+    gta_actual_turns_this_round = min(gta_target_turns, len(gta_celebrities)); gta_shuffled_celebrities_this_round = take_planned_questions('guess_the_age', gta_celebrities, gta_actual_turns_this_round)
+    gta_current_celebrity_index = -1; print(f"GTA Round: {gta_actual_turns_this_round} turns."); emit_game_state_update(); continue_after(0.5, next_guess_age_turn)
 def next_guess_age_turn():
     global game_state, gta_current_celebrity, gta_current_celebrity_index, gta_actual_turns_this_round
     gta_current_celebrity_index += 1;
     if gta_current_celebrity_index >= gta_actual_turns_this_round: end_guess_age_round(); return
     game_state = "guess_age_ongoing"; gta_current_celebrity = gta_shuffled_celebrities_this_round[gta_current_celebrity_index]
-    for sid in players: players[sid]['gta_current_guess'] = None
+    reset_turn_answers()
     print(f"\n-- GTA Turn {gta_current_celebrity_index + 1}/{gta_actual_turns_this_round} -- Celeb: {gta_current_celebrity['name']}")
-    context = {'turn': gta_current_celebrity_index + 1, 'total_turns': gta_actual_turns_this_round,'celebrity': gta_current_celebrity, 'players_status': [{'name': p['name']} for p in players.values()]}
-    update_main_screen_html('#round-content-area', '_gta_turn_display.html', context); player_payload = { 'celebrity_name': gta_current_celebrity['name'] }; socketio.emit('gta_player_prompt', player_payload, room=PLAYERS_ROOM)
+    context = {'turn': gta_current_celebrity_index + 1, 'total_turns': gta_actual_turns_this_round,'celebrity': gta_current_celebrity, 'players_status': [{'name': p.name} for p in players.values()]}
+    update_main_screen_html('#round-content-area', '_gta_turn_display.html', context); player_payload = { 'celebrity_name': gta_current_celebrity['name'] }; emit_to_players('gta_player_prompt', player_payload)
+    start_turn_deadline(process_guess_age_turn_results)
 @socketio.on('submit_gta_guess')
+@venue_event
 def handle_submit_gta_guess(data):
-    player_sid = request.sid;
-    if player_sid in players and game_state == "guess_age_ongoing":
+    player_pid = current_player_pid()
+    if player_pid in players and game_state == "guess_age_ongoing" and is_current_turn_submission(player_pid, data):
         try:
             guess = int(data.get('guess')); assert 0 <= guess <= 120
-            if players[player_sid].get('gta_current_guess') is None:
-                players[player_sid]['gta_current_guess'] = guess; player_name = players[player_sid]['name']; print(f"GTA Guess {guess} from {player_name}({player_sid[:4]})")
-                remaining = sum(1 for p in players.values() if p.get('gta_current_guess') is None); emit('gta_wait_for_guesses', {'waiting_on': remaining}, room=player_sid)
-                safe_name_id = player_name.replace('[^a-zA-Z0-9-_]', '_'); socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
-                if check_all_guesses_received_gta(): print("All GTA guesses received."); socketio.sleep(0.5); process_guess_age_turn_results()
-            else: emit('message', {'data': 'Already guessed.'}, room=player_sid)
-        except Exception as e: emit('message', {'data': 'Invalid guess (0-120).'}, room=player_sid); print(f"Invalid GTA guess: {e}")
+            if turn_answer(player_pid) is None:
+                if not set_turn_answer(player_pid, guess): tell_turn_closed(player_pid); return
+                player_name = players[player_pid].name; print(f"GTA Guess {guess} from {player_name}({player_pid[:4]})")
+                remaining = turn_waiting_on(); emit_to_player(player_pid, 'gta_wait_for_guesses', {'waiting_on': remaining})
+                socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
+                if check_all_guesses_received_gta(): print("All GTA guesses received."); close_turn_after(0.5, process_guess_age_turn_results)
+            else: emit_to_player(player_pid, 'message', {'data': 'Already guessed.'})
+        except Exception as e: emit_to_player(player_pid, 'message', {'data': 'Invalid guess (0-120).'}); print(f"Invalid GTA guess: {e}")
+
+def diff_bucket(diff, buckets):
+    """The key of the (low, label) bucket a guess's diff falls in (None = no guess)."""
+    if not isinstance(diff, int): return None
+    return next(low for low, _ in reversed(buckets) if diff >= low)
 
 def process_guess_age_turn_results():
     global game_state; print(f"DEBUG: Entered process_guess_age_turn_results. State: {game_state}");
     if game_state != "guess_age_ongoing": print("DEBUG: Exiting GTA process early."); return; print("--- Processing GTA Turn Results ---");
+    if not close_turn(): print("DEBUG: GTA turn already closed."); return
     # Add 'image_url' to the context definition
     results_context = { 'results': [], 'actual_age': None, 'image_url': None }; 
     print("DEBUG: Defined results_context GTA.");
@@ -1155,17 +2112,19 @@ def process_guess_age_turn_results():
 
         print(f"Actual Age: {actual_age}"); round_results_list = []
         active_players_copy = list(players.items()); print(f"DEBUG: GTA Processing for {len(active_players_copy)} players.");
-        for sid, p_info in active_players_copy:
-            print(f"DEBUG: GTA Loop - Player {p_info.get('name', '?')}"); guess = p_info.get('gta_current_guess'); print(f"DEBUG:   -> Guess: {guess}"); score_diff = abs(actual_age - guess) if guess is not None else None; print(f"DEBUG:   -> Diff: {score_diff}");
-            if 'round_score' not in p_info: p_info['round_score'] = 0
-            if score_diff is not None: p_info['round_score'] = p_info.get('round_score', 0) + score_diff; print(f"DEBUG:   -> New Rnd Score: {p_info['round_score']}")
-            result_entry = {'name': p_info.get('name', '?'),'guess': guess if guess is not None else 'N/A','diff': score_diff if score_diff is not None else '-','round_score': p_info.get('round_score', 0)}; round_results_list.append(result_entry); print(f"DEBUG:   -> Appended: {result_entry}")
-        print(f"DEBUG: GTA finished loop. List size: {len(round_results_list)}"); results_context['results'] = sorted(round_results_list, key=lambda r: r['diff'] if isinstance(r['diff'], int) else float('inf')); print(f"DEBUG: Final GTA results context: {results_context}")
+        for pid, p_info in active_players_copy:
+            guess = turn_answer(pid); score_diff = abs(actual_age - guess) if guess is not None else GTA_NO_ANSWER_DIFF
+            p_info.round_score = p_info.round_score + score_diff
+            result_entry = {'name': p_info.name,'guess': guess if guess is not None else 'N/A','diff': score_diff,'round_score': p_info.round_score}; round_results_list.append(result_entry)
+        print(f"DEBUG: GTA finished loop. List size: {len(round_results_list)}")
+        entries = [(pid, row) for (pid, _), row in zip(active_players_copy, round_results_list)]
+        results_context['results'], results_context['results_more'], ranks = results_view(entries, lambda r: r['diff'])
+        results_context['distribution'] = distribution_view(Counter(diff_bucket(r['diff'] if r['guess'] != 'N/A' else None, GTA_DIFF_BUCKETS) for r in round_results_list), GTA_DIFF_BUCKETS + ((None, 'No guess'),))
+        print(f"DEBUG: Final GTA results context: {results_context}")
         update_main_screen_html('#results-area', '_gta_turn_results.html', results_context)
+        emit_player_ranks(ranks)
     else: print("Error: process_gta_turn_results - no celeb.")
-    socketio.sleep(get_round_timing('turn_results'));
-    if game_state == "guess_age_ongoing": print("DEBUG: Proceeding next GTA turn."); next_guess_age_turn()
-    else: print(f"DEBUG: State changed GTA sleep ({game_state}).")
+    hold_display('turn_results', next_guess_age_turn)
 def end_guess_age_round():
     global game_state;
     game_state = "guess_age_results"; # Set state FIRST
@@ -1173,16 +2132,16 @@ def end_guess_age_round():
     # Don't emit game state update yet, scores haven't been awarded
 
     # 1. Determine rankings (lower round_score is better rank)
-    active_players = [(sid, p.get('round_score', float('inf'))) for sid, p in players.items()]
+    active_players = [(pid, p.round_score) for pid, p in players.items()]
     # Sort by score (ascending), then name alphabetically for stable tie ranks
-    sorted_by_round = sorted(active_players, key=lambda item: (item[1], players.get(item[0],{}).get('name','')))
-    sorted_sids = [item[0] for item in sorted_by_round]
+    sorted_by_round = sorted(active_players, key=lambda item: (item[1], getattr(players.get(item[0]), 'name', '')))
+    sorted_pids = [item[0] for item in sorted_by_round]
 
     # <<< Log BEFORE awarding points >>>
     print(f"DEBUG: Overall scores BEFORE award_game_points: {overall_game_scores}")
 
     # 2. Award game points (This modifies the global overall_game_scores)
-    points_awarded = award_game_points(sorted_sids)
+    points_awarded = award_game_points(sorted_pids)
 
     # <<< Log AFTER awarding points >>>
     print(f"DEBUG: Overall scores AFTER award_game_points: {overall_game_scores}")
@@ -1193,26 +2152,16 @@ def end_guess_age_round():
     emit_game_state_update()
 
     # 3. Prepare payload using the *updated* global scores for the summary screen
-    rankings_this_round = []
-    for rank, sid in enumerate(sorted_sids):
-        if sid in players: # Check player still exists
-            rankings_this_round.append({
-                'rank': rank + 1,
-                'name': players[sid]['name'],
-                'round_score': players[sid]['round_score'],
-                'points_awarded': points_awarded.get(sid, 0) # Include points awarded
-            })
+    rankings_this_round, rankings_more = round_rankings_view(sorted_pids, points_awarded)
 
     # Generate the overall scores list *now* based on the updated global dictionary
-    current_overall_scores_list = [{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)}
-                                   for sid, p in players.items()]
-    # Sort this list for display consistency (e.g., by score descending)
-    current_overall_scores_list.sort(key=lambda x: x['game_score'], reverse=True)
+    current_overall_scores_list = overall_scores_view(RESULTS_TOP_N) # Already in rank order
 
 
     summary_context = {
         'round_type': ROUND_DISPLAY_NAMES.get('guess_the_age', 'Guess The Age'),
         'rankings': rankings_this_round,
+        'rankings_more': rankings_more,
         'overall_scores': current_overall_scores_list # Use the freshly generated list
     }
     print(f"DEBUG: Summary Context being sent: {summary_context}") # Log context
@@ -1222,15 +2171,7 @@ def end_guess_age_round():
     print("Sent 'round_over_summary' HTML.")
 
     # 4. Pause and move to the next *game* round
-    round_summary_display_time = 12;
-    print(f"Waiting {round_summary_display_time}s before next game round...")
-    socketio.sleep(get_round_timing('round_summary'))
-
-    # Check state hasn't changed during sleep before proceeding
-    if game_state == "guess_age_results":
-        start_next_game_round()
-    else:
-        print(f"WARN: Game state changed during round summary sleep ({game_state}). Not proceeding automatically.")
+    hold_display('round_summary', start_next_game_round)
 
 # === GUESS THE YEAR LOGIC ===
 # (setup_guess_the_year_round, next_guess_the_year_turn, handle_submit_gty_guess, process_guess_the_year_turn_results, end_guess_the_year_round - Reverted to state before WDDI, includes debug logs)
@@ -1238,35 +2179,39 @@ def setup_guess_the_year_round():
     global game_state, gty_shuffled_questions_this_round, gty_current_question_index, gty_actual_turns_this_round, gty_questions, gty_target_turns
     print("--- Setup GTY Round ---"); game_state = "guess_the_year_ongoing";
     if not gty_questions: print("ERR: No questions GTY."); start_next_game_round(); return
-    for sid in players: players[sid]['round_score'] = 0; players[sid]['gty_current_guess'] = None
-    gty_actual_turns_this_round = min(gty_target_turns, len(gty_questions)); gty_shuffled_questions_this_round = random.sample(gty_questions, gty_actual_turns_this_round)
-    gty_current_question_index = -1; print(f"GTY Round: {gty_actual_turns_this_round} turns."); emit_game_state_update(); socketio.sleep(0.5); next_guess_the_year_turn()
+    for pid in players: players[pid].round_score = 0
+    gty_actual_turns_this_round = min(gty_target_turns, len(gty_questions)); gty_shuffled_questions_this_round = take_planned_questions('guess_the_year', gty_questions, gty_actual_turns_this_round)
+    gty_current_question_index = -1; print(f"GTY Round: {gty_actual_turns_this_round} turns."); emit_game_state_update(); continue_after(0.5, next_guess_the_year_turn)
 def next_guess_the_year_turn():
     global game_state, gty_current_question, gty_current_question_index, gty_actual_turns_this_round
     gty_current_question_index += 1;
     if gty_current_question_index >= gty_actual_turns_this_round: end_guess_the_year_round(); return
     game_state = "guess_the_year_ongoing"; gty_current_question = gty_shuffled_questions_this_round[gty_current_question_index]
-    for sid in players: players[sid]['gty_current_guess'] = None
+    reset_turn_answers()
     print(f"\n-- GTY Turn {gty_current_question_index + 1}/{gty_actual_turns_this_round} -- Q: {gty_current_question['question']}"); print(f"   (Ans: {gty_current_question['year']})")
-    context = {'turn': gty_current_question_index + 1, 'total_turns': gty_actual_turns_this_round,'question_data': gty_current_question,'players_status': [{'name': p['name']} for p in players.values()]}
-    update_main_screen_html('#round-content-area', '_gty_turn_display.html', context); player_payload = { 'question': gty_current_question['question'] }; socketio.emit('gty_player_prompt', player_payload, room=PLAYERS_ROOM)
+    context = {'turn': gty_current_question_index + 1, 'total_turns': gty_actual_turns_this_round,'question_data': gty_current_question,'players_status': [{'name': p.name} for p in players.values()]}
+    update_main_screen_html('#round-content-area', '_gty_turn_display.html', context); player_payload = { 'question': gty_current_question['question'] }; emit_to_players('gty_player_prompt', player_payload)
+    start_turn_deadline(process_guess_the_year_turn_results)
 @socketio.on('submit_gty_guess')
+@venue_event
 def handle_submit_gty_guess(data):
-    player_sid = request.sid;
-    if player_sid in players and game_state == "guess_the_year_ongoing":
+    player_pid = current_player_pid()
+    if player_pid in players and game_state == "guess_the_year_ongoing" and is_current_turn_submission(player_pid, data):
         try:
             guess = int(data.get('guess')); assert -10000 <= guess <= datetime.now().year + 100
-            if players[player_sid].get('gty_current_guess') is None:
-                players[player_sid]['gty_current_guess'] = guess; player_name = players[player_sid]['name']; print(f"GTY Guess {guess} from {player_name}({player_sid[:4]})")
-                remaining = sum(1 for p in players.values() if p.get('gty_current_guess') is None); emit('gty_wait_for_guesses', {'waiting_on': remaining}, room=player_sid)
-                safe_name_id = player_name.replace('[^a-zA-Z0-9-_]', '_'); socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
-                if check_all_guesses_received_gty(): print("All GTY guesses received."); socketio.sleep(0.5); process_guess_the_year_turn_results()
-            else: emit('message', {'data': 'Already guessed.'}, room=player_sid)
-        except Exception as e: emit('message', {'data': 'Invalid year.'}, room=player_sid); print(f"Invalid GTY guess: {e}")
+            if turn_answer(player_pid) is None:
+                if not set_turn_answer(player_pid, guess): tell_turn_closed(player_pid); return
+                player_name = players[player_pid].name; print(f"GTY Guess {guess} from {player_name}({player_pid[:4]})")
+                remaining = turn_waiting_on(); emit_to_player(player_pid, 'gty_wait_for_guesses', {'waiting_on': remaining})
+                socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
+                if check_all_guesses_received_gty(): print("All GTY guesses received."); close_turn_after(0.5, process_guess_the_year_turn_results)
+            else: emit_to_player(player_pid, 'message', {'data': 'Already guessed.'})
+        except Exception as e: emit_to_player(player_pid, 'message', {'data': 'Invalid year.'}); print(f"Invalid GTY guess: {e}")
 
 def process_guess_the_year_turn_results():
     global game_state; print(f"DEBUG: Entered process_gty_turn_results. State: {game_state}");
     if game_state != "guess_the_year_ongoing": print("DEBUG: Exiting GTY process early."); return; print("--- Processing GTY Turn Results ---");
+    if not close_turn(): print("DEBUG: GTY turn already closed."); return
     # Add 'image_url' to the context definition
     results_context = { 'results': [], 'correct_year': None, 'question_text': '', 'image_url': None }; 
     print("DEBUG: Defined results_context GTY.");
@@ -1279,17 +2224,21 @@ def process_guess_the_year_turn_results():
 
         print(f"Actual Year: {correct_year}"); round_results_list = []
         active_players_copy = list(players.items()); print(f"DEBUG: GTY Processing for {len(active_players_copy)} players.");
-        for sid, p_info in active_players_copy:
-            print(f"DEBUG: GTY Loop - Player {p_info.get('name', '?')}"); guess = p_info.get('gty_current_guess'); print(f"DEBUG:   -> Guess: {guess}"); score_diff = abs(correct_year - guess) if guess is not None else None; print(f"DEBUG:   -> Diff: {score_diff}");
-            if 'round_score' not in p_info: p_info['round_score'] = 0
-            if score_diff is not None: p_info['round_score'] = p_info.get('round_score', 0) + score_diff; print(f"DEBUG:   -> New Rnd Score: {p_info['round_score']}")
-            result_entry = {'name': p_info.get('name', '?'),'guess': guess if guess is not None else 'N/A','diff': score_diff if score_diff is not None else '-','round_score': p_info.get('round_score', 0)}; round_results_list.append(result_entry); print(f"DEBUG:   -> Appended GTY: {result_entry}")
-        print(f"DEBUG: GTY finished loop. List size: {len(round_results_list)}"); results_context['results'] = sorted(round_results_list, key=lambda r: r['diff'] if isinstance(r['diff'], int) else float('inf')); print(f"DEBUG: Final GTY results context: {results_context}")
+        # A missing guess costs the bank's span of years, or the worst real miss this turn if that was further out
+        no_answer_diff = max([gty_year_span] + [abs(correct_year - guess) for guess in map(turn_answer, players) if guess is not None])
+        for pid, p_info in active_players_copy:
+            guess = turn_answer(pid); score_diff = abs(correct_year - guess) if guess is not None else no_answer_diff
+            p_info.round_score = p_info.round_score + score_diff
+            result_entry = {'name': p_info.name,'guess': guess if guess is not None else 'N/A','diff': score_diff,'round_score': p_info.round_score}; round_results_list.append(result_entry)
+        print(f"DEBUG: GTY finished loop. List size: {len(round_results_list)}")
+        entries = [(pid, row) for (pid, _), row in zip(active_players_copy, round_results_list)]
+        results_context['results'], results_context['results_more'], ranks = results_view(entries, lambda r: r['diff'])
+        results_context['distribution'] = distribution_view(Counter(diff_bucket(r['diff'] if r['guess'] != 'N/A' else None, GTY_DIFF_BUCKETS) for r in round_results_list), GTY_DIFF_BUCKETS + ((None, 'No guess'),))
+        print(f"DEBUG: Final GTY results context: {results_context}")
         update_main_screen_html('#results-area', '_gty_turn_results.html', results_context)
+        emit_player_ranks(ranks)
     else: print("Error: process_gty_turn_results - no question.")
-    socketio.sleep(get_round_timing('turn_results'));
-    if game_state == "guess_the_year_ongoing": print("DEBUG: Proceeding next GTY turn."); next_guess_the_year_turn()
-    else: print(f"DEBUG: State changed GTY sleep ({game_state}).")
+    hold_display('turn_results', next_guess_the_year_turn)
 
 def end_guess_the_year_round():
     global game_state;
@@ -1298,16 +2247,16 @@ def end_guess_the_year_round():
     # Don't emit game state update yet, scores haven't been awarded
 
     # 1. Determine rankings (lower round_score is better rank)
-    active_players = [(sid, p.get('round_score', float('inf'))) for sid, p in players.items()]
+    active_players = [(pid, p.round_score) for pid, p in players.items()]
     # Sort by score (ascending), then name alphabetically for stable tie ranks
-    sorted_by_round = sorted(active_players, key=lambda item: (item[1], players.get(item[0],{}).get('name','')))
-    sorted_sids = [item[0] for item in sorted_by_round]
+    sorted_by_round = sorted(active_players, key=lambda item: (item[1], getattr(players.get(item[0]), 'name', '')))
+    sorted_pids = [item[0] for item in sorted_by_round]
 
     # <<< Log BEFORE awarding points >>>
     print(f"DEBUG: Overall scores BEFORE award_game_points: {overall_game_scores}")
 
     # 2. Award game points (Modifies global overall_game_scores)
-    points_awarded = award_game_points(sorted_sids)
+    points_awarded = award_game_points(sorted_pids)
 
     # <<< Log AFTER awarding points >>>
     print(f"DEBUG: Overall scores AFTER award_game_points: {overall_game_scores}")
@@ -1317,23 +2266,14 @@ def end_guess_the_year_round():
     emit_game_state_update() # Updates status bar
 
     # 3. Prepare payload using updated scores
-    rankings_this_round = []
-    for rank, sid in enumerate(sorted_sids):
-        if sid in players:
-            rankings_this_round.append({
-                'rank': rank + 1,
-                'name': players[sid]['name'],
-                'round_score': players[sid]['round_score'],
-                'points_awarded': points_awarded.get(sid, 0)
-            })
-
-    current_overall_scores_list = [{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)}
-                                   for sid, p in players.items()]
-    current_overall_scores_list.sort(key=lambda x: x['game_score'], reverse=True) # Sort display list
+    rankings_this_round, rankings_more = round_rankings_view(sorted_pids, points_awarded)
+
+    current_overall_scores_list = overall_scores_view(RESULTS_TOP_N) # Already in rank order
 
     summary_context = {
         'round_type': ROUND_DISPLAY_NAMES.get('guess_the_year', 'Guess The Year'),
         'rankings': rankings_this_round,
+        'rankings_more': rankings_more,
         'overall_scores': current_overall_scores_list
     }
     print(f"DEBUG: Summary Context being sent: {summary_context}")
@@ -1343,22 +2283,13 @@ def end_guess_the_year_round():
     print("Sent 'round_over_summary' HTML.")
 
     # 4. Pause and move to next game round
-    round_summary_display_time = 12;
-    print(f"Waiting {round_summary_display_time}s before next game round...")
-    socketio.sleep(get_round_timing('round_summary'))
-
-    if game_state == "guess_the_year_results":
-        start_next_game_round()
-    else:
-         print(f"WARN: Game state changed during round summary sleep ({game_state}). Not proceeding.")
+    hold_display('round_summary', start_next_game_round)
 
 # === WHO DIDN'T DO IT LOGIC ===
 # Helper to check if all players have submitted their guess for the current WDDI turn
 def check_all_guesses_received_wddi():
     """Checks if all connected players have submitted a WDDI guess for the current turn."""
-    if not players:
-        return True # No players, so technically all received
-    return all(p.get('wddi_current_guess') is not None for p in players.values())
+    return turn_quorum_reached()
 
 def setup_who_didnt_do_it_round():
     """Sets up the state for a 'Who Didn't Do It?' round."""
@@ -1373,25 +2304,23 @@ def setup_who_didnt_do_it_round():
         return
 
     # Reset round scores and guesses for all players
-    for sid in players:
-        players[sid]['round_score'] = 0 # Reset round score (higher is better here)
-        players[sid]['wddi_current_guess'] = None # Reset guess for the round start
+    for pid in players:
+        players[pid].round_score = 0 # Reset round score (higher is better here)
 
     # Select questions for the round
     wddi_actual_turns_this_round = min(wddi_target_turns, len(wddi_questions))
-    wddi_shuffled_questions_this_round = random.sample(wddi_questions, wddi_actual_turns_this_round)
+    wddi_shuffled_questions_this_round = take_planned_questions('who_didnt_do_it', wddi_questions, wddi_actual_turns_this_round)
     wddi_current_question_index = -1 # Start before the first turn
 
     print(f"WDDI Round starting with {wddi_actual_turns_this_round} questions.")
     emit_game_state_update() # Update main screen status bar
-    socketio.sleep(0.5) # Short pause before first turn
-    next_who_didnt_do_it_turn() # Start the first turn
+    continue_after(0.5, next_who_didnt_do_it_turn) # Short pause before first turn
 
 def next_who_didnt_do_it_turn():
     """Advances to the next turn/question in the WDDI round."""
     global game_state, wddi_current_question, wddi_current_question_index
     global wddi_shuffled_questions_this_round, wddi_actual_turns_this_round
-    global wddi_current_shuffled_options # Store shuffled options for validation
+    global wddi_current_shuffled_options, wddi_current_option_ids
 
     wddi_current_question_index += 1
 
@@ -1404,13 +2333,11 @@ def next_who_didnt_do_it_turn():
     wddi_current_question = wddi_shuffled_questions_this_round[wddi_current_question_index]
 
     # Clear previous guesses for all players
-    for sid in players:
-        players[sid]['wddi_current_guess'] = None
+    reset_turn_answers(answer_key=wddi_current_question['answer_id'])
 
     # --- Prepare options and shuffle them ---
-    original_options = list(wddi_current_question['options']) # Make a copy
-    wddi_current_shuffled_options = original_options # Assign before shuffling for context
-    random.shuffle(wddi_current_shuffled_options) # Shuffle the list in place
+    wddi_current_option_ids = turn_option_order(wddi_current_question, 'planned_order', len(wddi_current_question['options']))
+    wddi_current_shuffled_options = [wddi_current_question['options'][i] for i in wddi_current_option_ids]
 
     print(f"\n-- WDDI Turn {wddi_current_question_index + 1}/{wddi_actual_turns_this_round} --")
     print(f"   Q: {wddi_current_question['question']}")
@@ -1425,7 +2352,7 @@ def next_who_didnt_do_it_turn():
         'question_text': wddi_current_question['question'],
         'image_url': wddi_current_question.get('image_url'), # Include image_url if present
         'shuffled_options': wddi_current_shuffled_options, # Send shuffled options
-        'players_status': [{'name': p['name']} for p in players.values()] # For showing who hasn't guessed
+        'players_status': [{'name': p.name} for p in players.values()] # For showing who hasn't guessed
     }
     # Assuming you have/will create '_wddi_turn_display.html' in templates/
     update_main_screen_html('#round-content-area', '_wddi_turn_display.html', main_screen_context)
@@ -1434,51 +2361,57 @@ def next_who_didnt_do_it_turn():
     # Payload for the player devices (index.html's JS)
     player_payload = {
         'question': wddi_current_question['question'],
-        'shuffled_options': wddi_current_shuffled_options # Send the same shuffled list
+        'shuffled_options': wddi_current_shuffled_options, # Send the same shuffled list
+        'option_ids': wddi_current_option_ids # Players answer with the ID, not the text
         # image_url could be sent here too if players need to see it on their device
     }
     # We need a unique event name for this round's player prompt
-    socketio.emit('wddi_player_prompt', player_payload, room=PLAYERS_ROOM)
+    emit_to_players('wddi_player_prompt', player_payload)
     print("   Sent question and shuffled options to players.")
+    start_turn_deadline(process_who_didnt_do_it_turn_results)
 
 @socketio.on('submit_wddi_guess')
+@venue_event
 def handle_submit_wddi_guess(data):
     """Handles a player submitting their guess for the current WDDI turn."""
-    player_sid = request.sid
-    if player_sid not in players or game_state != "who_didnt_do_it_ongoing":
-        print(f"WARN: Guess rejected from {player_sid[:4]}. State: {game_state}")
+    player_pid = current_player_pid()
+    if player_pid not in players or game_state != "who_didnt_do_it_ongoing":
+        print(f"WARN: Guess rejected from {player_pid[:4]}. State: {game_state}")
         return # Ignore if player not registered or not in the correct game state
+    if not is_current_turn_submission(player_pid, data): return
 
-    guess_text = data.get('guess_text') # Expecting the text of the chosen option
+    option_id = data.get('option_id') # Expecting the ID of the chosen option
 
     # Basic validation: is the guess one of the options sent?
-    if not guess_text or guess_text not in wddi_current_shuffled_options:
-         emit('message', {'data': 'Invalid selection.'}, room=player_sid)
-         print(f"WDDI Invalid guess received: '{guess_text}' from {players[player_sid]['name']}")
+    if not valid_option_ids([option_id], len(wddi_current_question['options'])):
+         emit_to_player(player_pid, 'message', {'data': 'Invalid selection.'})
+         print(f"WDDI Invalid guess received: {option_id!r} from {players[player_pid].name}")
          return
+    guess_text = wddi_current_question['options'][option_id]
 
-    if players[player_sid].get('wddi_current_guess') is None:
+    if turn_answer(player_pid) is None:
         # Store the submitted text as the guess
-        players[player_sid]['wddi_current_guess'] = guess_text
-        player_name = players[player_sid]['name']
-        print(f"WDDI Guess '{guess_text}' received from {player_name}({player_sid[:4]})")
+        if not set_turn_answer(player_pid, option_id): tell_turn_closed(player_pid); return
+        player_name = players[player_pid].name
+        was_correct = option_id == turn_answer_key
+        record_turn_result(player_pid, {'name': player_name, 'guess': guess_text, 'is_correct': was_correct},
+                           points=int(was_correct), correct=was_correct, bucket=option_id)
+        print(f"WDDI Guess '{guess_text}' received from {player_name}({player_pid[:4]})")
 
         # Notify player their guess was received (optional)
-        # emit('wddi_wait_for_others', room=player_sid) # Or similar feedback
+        # emit_to_player(player_pid, 'wddi_wait_for_others') # Or similar feedback
 
         # Update main screen to show player has guessed (optional, good UI)
-        safe_name_id = player_name.replace('[^a-zA-Z0-9-_]', '_') # Create a CSS-safe ID
         socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
 
         # Check if all players have now guessed
         if check_all_guesses_received_wddi():
             print("   All WDDI guesses received.")
-            socketio.sleep(0.5) # Brief pause before showing results
-            process_who_didnt_do_it_turn_results()
+            close_turn_after(0.5, process_who_didnt_do_it_turn_results) # Brief pause before showing results
     else:
         # Player already submitted a guess for this turn
-        emit('message', {'data': 'You already guessed for this question.'}, room=player_sid)
-        print(f"WDDI Duplicate guess attempt from {players[player_sid]['name']}")
+        emit_to_player(player_pid, 'message', {'data': 'You already guessed for this question.'})
+        print(f"WDDI Duplicate guess attempt from {players[player_pid].name}")
 
 def process_who_didnt_do_it_turn_results():
     """Processes guesses, calculates scores, and sends results for a WDDI turn."""
@@ -1488,33 +2421,17 @@ def process_who_didnt_do_it_turn_results():
         print(f"WARN: Skipping WDDI results processing. State: {game_state}, Question: {wddi_current_question is not None}")
         return # Avoid processing if state changed or question missing
 
+    if not close_turn(): return # Already closed by the quorum, the deadline or a queued call
     game_state = "who_didnt_do_it_results_display" # Temp state while showing results
 
     correct_answer_text = wddi_current_question['correct_answer']
-    turn_results_list = []
-
     print(f"   Correct Answer was: '{correct_answer_text}'")
 
-    active_players_copy = list(players.items()) # Copy to avoid issues if player disconnects during loop
-    for sid, p_info in active_players_copy:
-        guess = p_info.get('wddi_current_guess')
-        was_correct = (guess == correct_answer_text)
-        turn_score = 1 if was_correct else 0
-
-        # Update the player's *round score* (cumulative correct answers)
-        if 'round_score' not in p_info: p_info['round_score'] = 0 # Ensure exists
-        p_info['round_score'] += turn_score
-        print(f"   - Player: {p_info['name']}, Guess: '{guess}', Correct: {was_correct}, New Round Score: {p_info['round_score']}")
-
-        turn_results_list.append({
-            'name': p_info['name'],
-            'guess': guess if guess is not None else 'N/A',
-            'is_correct': was_correct,
-            'round_score': p_info['round_score'] # Cumulative round score
-        })
+    # Guesses were scored as they came in; this just awards the points (1 per correct guess)
+    turn_results_list = collect_turn_results(lambda p: {'name': p.name, 'guess': 'N/A', 'is_correct': False})
 
-    # Sort results (e.g., by correctness then name) for display
-    turn_results_list.sort(key=lambda x: (-int(x['is_correct']), x['name']))
+    # Top rows (correct first, then by name) for display; everyone else just gets their rank
+    shown_results, results_more, ranks = results_view(list(zip(players, turn_results_list)), lambda r: -int(r['is_correct']))
 
     # --- Send results to Main Screen ---
     # Context for the results template (_wddi_turn_results.html - Needs creating)
@@ -1523,26 +2440,21 @@ def process_who_didnt_do_it_turn_results():
         'image_url': wddi_current_question.get('image_url'),
         'shuffled_options': wddi_current_shuffled_options, # Show options again
         'correct_answer': correct_answer_text,
-        'results': turn_results_list, # List of player results for the turn
+        'results': shown_results, # Top player results for the turn
+        'results_more': results_more,
+        'distribution': turn_answer_distribution(
+            [(option_id, wddi_current_question['options'][option_id]) for option_id in wddi_current_option_ids], len(turn_results_list)),
         'turn': wddi_current_question_index + 1,
         'total_turns': wddi_actual_turns_this_round
     }
     # NOTE: You will need to create a '_wddi_turn_results.html' template file!
     update_main_screen_html('#results-area', '_wddi_turn_results.html', results_context)
     print(f"   Sent WDDI turn results to main screen.")
-    # Send simple notification to players that results are shown
-    socketio.emit('results_on_main_screen', room=PLAYERS_ROOM)
+    # Send simple notification to players that results are shown (with their rank)
+    emit_player_ranks(ranks)
 
-    # Pause to show results
-    turn_results_display_time = 7 # Seconds to show turn results
-    socketio.sleep(turn_results_display_time)
-
-    # Check state hasn't changed during sleep before proceeding
-    if game_state == "who_didnt_do_it_results_display":
-        print(f"   Proceeding to next WDDI turn/end of round.")
-        next_who_didnt_do_it_turn() # Move to the next turn
-    else:
-        print(f"WARN: Game state changed during WDDI results sleep ({game_state}). Not proceeding automatically.")
+    # Pause to show results, then move to the next turn
+    hold_display('turn_results', next_who_didnt_do_it_turn)
 
 
 def end_who_didnt_do_it_round():
@@ -1552,16 +2464,16 @@ def end_who_didnt_do_it_round():
     print("\n--- Ending WDDI Round ---")
 
     # 1. Determine rankings based on round_score (higher is better for WDDI)
-    active_players = [(sid, p.get('round_score', 0)) for sid, p in players.items()]
+    active_players = [(pid, p.round_score) for pid, p in players.items()]
     # Sort by score (descending), then name alphabetically for stable tie ranks
-    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], players.get(item[0],{}).get('name','')))
-    sorted_sids = [item[0] for item in sorted_by_round]
-    print(f"   WDDI Round Ranks (SID, Score): {sorted_by_round}")
+    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], getattr(players.get(item[0]), 'name', '')))
+    sorted_pids = [item[0] for item in sorted_by_round]
+    print(f"   WDDI Round Ranks (pid, Score): {sorted_by_round}")
 
     # 2. Award Stableford game points (using existing helper)
     print(f"   Overall scores BEFORE award_game_points: {overall_game_scores}")
-    # Pass the SIDs sorted by rank (higher score = better rank for WDDI)
-    points_awarded = award_game_points(sorted_sids)
+    # Pass the pids sorted by rank (higher score = better rank for WDDI)
+    points_awarded = award_game_points(sorted_pids)
     print(f"   Overall scores AFTER award_game_points: {overall_game_scores}")
     print(f"   Points awarded this round: {points_awarded}")
 
@@ -1569,24 +2481,15 @@ def end_who_didnt_do_it_round():
     emit_game_state_update()
 
     # 4. Prepare payload for the round summary screen using updated scores
-    rankings_this_round = []
-    for rank, sid in enumerate(sorted_sids):
-        if sid in players: # Check player still exists
-            rankings_this_round.append({
-                'rank': rank + 1,
-                'name': players[sid]['name'],
-                'round_score': players[sid]['round_score'], # Show number correct
-                'points_awarded': points_awarded.get(sid, 0)
-            })
+    rankings_this_round, rankings_more = round_rankings_view(sorted_pids, points_awarded)
 
     # Get the latest overall scores for the summary display
-    current_overall_scores_list = [{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)}
-                                   for sid, p in players.items()]
-    current_overall_scores_list.sort(key=lambda x: x['game_score'], reverse=True) # Sort for display
+    current_overall_scores_list = overall_scores_view(RESULTS_TOP_N) # Already in rank order
 
     summary_context = {
         'round_type': ROUND_DISPLAY_NAMES.get('who_didnt_do_it', 'Who Didn\'t Do It?'),
         'rankings': rankings_this_round, # WDDI round results (higher score = better)
+        'rankings_more': rankings_more,
         'overall_scores': current_overall_scores_list # Updated overall game scores
     }
     print(f"   Summary Context being sent: {summary_context}")
@@ -1596,24 +2499,13 @@ def end_who_didnt_do_it_round():
     print("   Sent 'round_over_summary' HTML.")
 
     # 5. Pause and move to the next game round
-    round_summary_display_time = 12 # Seconds
-    print(f"   Waiting {round_summary_display_time}s before next game round...")
-    socketio.sleep(get_round_timing('round_summary'))
-
-    # Check state hasn't changed during sleep before proceeding
-    if game_state == "who_didnt_do_it_results":
-        start_next_game_round() # Trigger the overall game flow handler
-    else:
-        print(f"WARN: Game state changed during WDDI summary sleep ({game_state}). Not proceeding automatically.")
+    hold_display('round_summary', start_next_game_round)
 
 # === ORDER UP LOGIC ===
 
 def check_all_submissions_received_ou():
     """Checks if all connected players have submitted their 'Order Up!' list for the current turn."""
-    if not players:
-        return True # No players, so technically all received
-    # Check if the 'ou_current_submission' is not None for all players
-    return all(p.get('ou_current_submission') is not None for p in players.values())
+    return turn_quorum_reached()
 
 def setup_order_up_round():
     """Sets up the state for an 'Order Up!' round."""
@@ -1628,9 +2520,8 @@ def setup_order_up_round():
         return
 
     # Reset round scores and submissions for all players
-    for sid in players:
-        players[sid]['round_score'] = 0 # Reset round score (for 'all or nothing' correct orders)
-        players[sid]['ou_current_submission'] = None # Reset submission for the round start
+    for pid in players:
+        players[pid].round_score = 0 # Reset round score (for 'all or nothing' correct orders)
 
     # Select questions for the round
     ou_actual_turns_this_round = min(ou_target_turns, len(ou_questions))
@@ -1641,19 +2532,18 @@ def setup_order_up_round():
         start_next_game_round()
         return
 
-    ou_shuffled_questions_this_round = random.sample(ou_questions, ou_actual_turns_this_round)
+    ou_shuffled_questions_this_round = take_planned_questions('order_up', ou_questions, ou_actual_turns_this_round)
     ou_current_question_index = -1 # Start before the first turn
 
     print(f"Order Up! Round starting with {ou_actual_turns_this_round} questions.")
     emit_game_state_update()
-    socketio.sleep(0.5) # Short pause before first turn
-    next_order_up_turn()
+    continue_after(0.5, next_order_up_turn) # Short pause before first turn
 
 def next_order_up_turn():
     """Advances to the next turn/question in the 'Order Up!' round."""
     global game_state, ou_current_question_data, ou_current_question_index
     global ou_shuffled_questions_this_round, ou_actual_turns_this_round
-    global ou_current_items_to_order
+    global ou_current_items_to_order, ou_current_item_ids
 
     ou_current_question_index += 1
 
@@ -1667,13 +2557,12 @@ def next_order_up_turn():
     ou_current_question_data = current_question_full_data # Store full data including correct order
 
     # Clear previous submissions for all players for the new turn
-    for sid in players:
-        players[sid]['ou_current_submission'] = None
+    correct_order = ou_current_question_data['items_in_correct_order']
+    reset_turn_answers(answer_key=tuple(range(len(correct_order)))) # IDs are correct positions
 
     # Prepare the list of items to be shuffled and sent to players
-    items_to_order_original = list(ou_current_question_data['items_in_correct_order']) # Make a copy
-    items_shuffled_for_players = list(items_to_order_original) # Another copy for shuffling
-    random.shuffle(items_shuffled_for_players)
+    ou_current_item_ids = turn_option_order(ou_current_question_data, 'planned_order', len(correct_order))
+    items_shuffled_for_players = [correct_order[i] for i in ou_current_item_ids]
     ou_current_items_to_order = list(items_shuffled_for_players)
 
     print(f"\n-- Order Up! Turn {ou_current_question_index + 1}/{ou_actual_turns_this_round} --")
@@ -1688,7 +2577,7 @@ def next_order_up_turn():
         'total_turns': ou_actual_turns_this_round,
         'question_text': ou_current_question_data['question'],
         'items_to_display': items_shuffled_for_players, # Main screen could show the shuffled items too, or just the question
-        'players_status': [{'name': p['name']} for p in players.values()]
+        'players_status': [{'name': p.name} for p in players.values()]
     }
     # NOTE: You will need to create an '_ou_turn_display.html' template
     update_main_screen_html('#round-content-area', '_ou_turn_display.html', main_screen_context)
@@ -1696,53 +2585,52 @@ def next_order_up_turn():
     # --- Send data to Player Controllers ---
     player_payload = {
         'question': ou_current_question_data['question'],
-        'items_to_order': items_shuffled_for_players # Send the shuffled list for players to order
+        'items_to_order': items_shuffled_for_players, # Send the shuffled list for players to order
+        'item_ids': ou_current_item_ids # Players send back these IDs in their chosen order
     }
     print(f"DEBUG SERVER: Emitting 'ou_player_prompt' to PLAYERS_ROOM. Payload: {player_payload}")
-    socketio.emit('ou_player_prompt', player_payload, room=PLAYERS_ROOM)
+    emit_to_players('ou_player_prompt', player_payload)
     print("   Sent 'Order Up!' question and items to players.")
+    start_turn_deadline(process_order_up_turn_results)
 
 
 @socketio.on('submit_ou_list') # Changed event name from 'submit_ou_guess'
+@venue_event
 def handle_submit_ou_list(data):
     """Handles a player submitting their ordered list for the current 'Order Up!' turn."""
-    player_sid = request.sid
-    if player_sid not in players or game_state != "order_up_ongoing":
-        print(f"WARN: Order Up submission rejected from {player_sid[:4]}. State: {game_state}")
+    player_pid = current_player_pid()
+    if player_pid not in players or game_state != "order_up_ongoing":
+        print(f"WARN: Order Up submission rejected from {player_pid[:4]}. State: {game_state}")
         return
+    if not is_current_turn_submission(player_pid, data): return
 
-    submitted_list = data.get('ordered_list')
+    ordered_ids = data.get('ordered_ids')
 
-    # Basic validation: is it a list? Does it have the expected number of items?
-    # For now, we trust the client sends a list. More robust validation could be added.
-    if not isinstance(submitted_list, list):
-        emit('message', {'data': 'Invalid submission format.'}, room=player_sid)
-        print(f"Order Up! Invalid submission (not a list) from {players[player_sid]['name']}: {submitted_list}")
+    # Must be a permutation of this question's item IDs
+    if not valid_option_ids(ordered_ids, len(turn_answer_key), length=len(turn_answer_key)):
+        emit_to_player(player_pid, 'message', {'data': 'Invalid submission format.'})
+        print(f"Order Up! Invalid submission from {players[player_pid].name}: {ordered_ids}")
         return
-    
-    # Optional: Check if number of items matches expected (e.g., 4)
-    # expected_item_count = len(ou_current_question_data['items_in_correct_order'])
-    # if len(submitted_list) != expected_item_count:
-    #     emit('message', {'data': f'Submission must contain {expected_item_count} items.'}, room=player_sid)
-    #     print(f"Order Up! Invalid submission (item count mismatch) from {players[player_sid]['name']}")
-    #     return
-
-    if players[player_sid].get('ou_current_submission') is None:
-        players[player_sid]['ou_current_submission'] = submitted_list
-        player_name = players[player_sid]['name']
-        print(f"Order Up! Submission {submitted_list} received from {player_name}({player_sid[:4]})")
+
+    if turn_answer(player_pid) is None:
+        if not set_turn_answer(player_pid, ordered_ids): tell_turn_closed(player_pid); return
+        player_name = players[player_pid].name
+        in_place = sum(1 for position, item_id in enumerate(ordered_ids) if item_id == turn_answer_key[position])
+        was_correct = in_place == len(turn_answer_key) # All or nothing
+        items = ou_current_question_data['items_in_correct_order']
+        record_turn_result(player_pid, {'name': player_name, 'submission': [items[i] for i in ordered_ids], 'is_correct': was_correct},
+                           points=int(was_correct), correct=was_correct, bucket=in_place)
+        print(f"Order Up! Submission {ordered_ids} received from {player_name}({player_pid[:4]})")
 
         # Update main screen to show player has submitted (optional)
-        safe_name_id = player_name.replace('[^a-zA-Z0-9-_]', '_')
         socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
 
         if check_all_submissions_received_ou():
             print("   All 'Order Up!' submissions received.")
-            socketio.sleep(0.5) # Brief pause before showing results
-            process_order_up_turn_results()
+            close_turn_after(0.5, process_order_up_turn_results) # Brief pause before showing results
     else:
-        emit('message', {'data': 'You already submitted for this question.'}, room=player_sid)
-        print(f"Order Up! Duplicate submission attempt from {players[player_sid]['name']}")
+        emit_to_player(player_pid, 'message', {'data': 'You already submitted for this question.'})
+        print(f"Order Up! Duplicate submission attempt from {players[player_pid].name}")
 
 def process_order_up_turn_results():
     """Processes submissions, calculates scores, and sends results for an 'Order Up!' turn."""
@@ -1752,57 +2640,34 @@ def process_order_up_turn_results():
         print(f"WARN: Skipping OU results. State: {game_state}, QuestionData: {ou_current_question_data is not None}")
         return
 
+    if not close_turn(): return # Already closed by the quorum, the deadline or a queued call
     game_state = "order_up_results_display" # Temp state for showing results
 
     correct_order = ou_current_question_data['items_in_correct_order']
-    turn_results_list = []
-
     print(f"   Correct Order was: {correct_order}")
 
-    active_players_copy = list(players.items())
-    for sid, p_info in active_players_copy:
-        player_submission = p_info.get('ou_current_submission')
-        was_perfectly_correct = False
-        turn_score_for_player = 0
-
-        if player_submission and player_submission == correct_order: # All or nothing
-            was_perfectly_correct = True
-            turn_score_for_player = 1
-        
-        if 'round_score' not in p_info: p_info['round_score'] = 0
-        p_info['round_score'] += turn_score_for_player
-        
-        print(f"   - Player: {p_info['name']}, Submission: {player_submission}, Correct: {was_perfectly_correct}, New Round Score: {p_info['round_score']}")
-
-        turn_results_list.append({
-            'name': p_info['name'],
-            'submission': player_submission if player_submission is not None else ['N', '/', 'A'], # Display something if no submission
-            'is_correct': was_perfectly_correct,
-            'round_score': p_info['round_score']
-        })
+    # Display something if no submission
+    turn_results_list = collect_turn_results(lambda p: {'name': p.name, 'submission': ['N', '/', 'A'], 'is_correct': False})
 
-    turn_results_list.sort(key=lambda x: (-int(x['is_correct']), x['name'])) # Sort by correct, then name
+    # Top rows by correct, then name
+    shown_results, results_more, ranks = results_view(list(zip(players, turn_results_list)), lambda r: -int(r['is_correct']))
+    num_items = len(correct_order)
 
     results_context = {
         'question_text': ou_current_question_data['question'],
         'correct_order': correct_order,
-        'results': turn_results_list,
+        'results': shown_results,
+        'results_more': results_more,
+        'distribution': turn_answer_distribution([(k, f"{k}/{num_items} in place") for k in range(num_items, -1, -1)], len(turn_results_list)),
         'turn': ou_current_question_index + 1,
         'total_turns': ou_actual_turns_this_round
     }
     # NOTE: You will need to create an '_ou_turn_results.html' template
     update_main_screen_html('#results-area', '_ou_turn_results.html', results_context)
     print(f"   Sent 'Order Up!' turn results to main screen.")
-    socketio.emit('results_on_main_screen', room=PLAYERS_ROOM)
-
-    turn_results_display_time = 10 # Seconds to show turn results, can be longer for OU
-    socketio.sleep(turn_results_display_time)
+    emit_player_ranks(ranks)
 
-    if game_state == "order_up_results_display":
-        print(f"   Proceeding to next 'Order Up!' turn or end of round.")
-        next_order_up_turn()
-    else:
-        print(f"WARN: Game state changed during OU results sleep ({game_state}). Not proceeding.")
+    hold_display('turn_results', next_order_up_turn)
 
 def end_order_up_round():
     """Finalizes the 'Order Up!' round, awards game points, and transitions."""
@@ -1810,59 +2675,41 @@ def end_order_up_round():
     game_state = "order_up_results" # Final round results state
     print("\n--- Ending Order Up! Round ---")
 
-    active_players = [(sid, p.get('round_score', 0)) for sid, p in players.items()]
+    active_players = [(pid, p.round_score) for pid, p in players.items()]
     # Sort by round_score (higher is better), then name
-    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], players.get(item[0],{}).get('name','')))
-    sorted_sids = [item[0] for item in sorted_by_round]
-    print(f"   Order Up! Round Ranks (SID, Score): {sorted_by_round}")
+    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], getattr(players.get(item[0]), 'name', '')))
+    sorted_pids = [item[0] for item in sorted_by_round]
+    print(f"   Order Up! Round Ranks (pid, Score): {sorted_by_round}")
 
     print(f"   Overall scores BEFORE award_game_points: {overall_game_scores}")
-    points_awarded = award_game_points(sorted_sids) # Use existing Stableford helper
+    points_awarded = award_game_points(sorted_pids) # Use existing Stableford helper
     print(f"   Overall scores AFTER award_game_points: {overall_game_scores}")
     print(f"   Points awarded this round: {points_awarded}")
 
     emit_game_state_update() # Update status bar with new overall scores
 
-    rankings_this_round = []
-    for rank, sid in enumerate(sorted_sids):
-        if sid in players:
-            rankings_this_round.append({
-                'rank': rank + 1,
-                'name': players[sid]['name'],
-                'round_score': players[sid]['round_score'], # Number of perfect orders
-                'points_awarded': points_awarded.get(sid, 0)
-            })
+    rankings_this_round, rankings_more = round_rankings_view(sorted_pids, points_awarded)
 
-    current_overall_scores_list = [{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)}
-                                   for sid, p in players.items()]
-    current_overall_scores_list.sort(key=lambda x: x['game_score'], reverse=True)
+    current_overall_scores_list = overall_scores_view(RESULTS_TOP_N) # Already in rank order
 
     summary_context = {
         'round_type': ROUND_DISPLAY_NAMES.get('order_up', 'Order Up!'),
         'rankings': rankings_this_round,
+        'rankings_more': rankings_more,
         'overall_scores': current_overall_scores_list
     }
     print(f"   Summary Context for Order Up!: {summary_context}")
     update_main_screen_html('#results-area', '_round_summary.html', summary_context) # Reuse existing summary
     print("   Sent 'round_over_summary' HTML for Order Up!.")
 
-    round_summary_display_time = 12
-    print(f"   Waiting {round_summary_display_time}s before next game round...")
-    socketio.sleep(get_round_timing('round_summary'))
-
-    if game_state == "order_up_results":
-        start_next_game_round()
-    else:
-        print(f"WARN: Game state changed during Order Up! summary sleep ({game_state}). Not proceeding.")
+    hold_display('round_summary', start_next_game_round)
 
 
 # === QUICK PAIRS LOGIC ===
 
 def check_all_submissions_received_qp():
     """Checks if all connected players have submitted their 'Quick Pairs' for the current turn."""
-    if not players:
-        return True
-    return all(p.get('qp_current_submission') is not None for p in players.values())
+    return turn_quorum_reached()
 
 def setup_quick_pairs_round():
     """Sets up the state for a 'Quick Pairs' round."""
@@ -1876,10 +2723,8 @@ def setup_quick_pairs_round():
         start_next_game_round()
         return
 
-    for sid in players:
-        players[sid]['round_score'] = 0 # Points for correct sets of pairs
-        players[sid]['qp_current_submission'] = None
-        players[sid]['qp_submission_time_ms'] = float('inf') # Reset time for each round
+    for pid in players:
+        players[pid].round_score = 0 # Points for correct sets of pairs
 
     qp_actual_turns_this_round = min(qp_target_turns, len(qp_questions))
     if qp_actual_turns_this_round == 0: # Should not happen if qp_questions has items
@@ -1887,19 +2732,18 @@ def setup_quick_pairs_round():
         start_next_game_round()
         return
         
-    qp_shuffled_questions_this_round = random.sample(qp_questions, qp_actual_turns_this_round)
+    qp_shuffled_questions_this_round = take_planned_questions('quick_pairs', qp_questions, qp_actual_turns_this_round)
     qp_current_question_index = -1
 
     print(f"Quick Pairs Round starting with {qp_actual_turns_this_round} questions.")
     emit_game_state_update()
-    socketio.sleep(0.5)
-    next_quick_pairs_turn()
+    continue_after(0.5, next_quick_pairs_turn)
 
 def next_quick_pairs_turn():
     """Advances to the next turn/question in the 'Quick Pairs' round."""
     global game_state, qp_current_question_data, qp_current_question_index
     global qp_shuffled_questions_this_round, qp_actual_turns_this_round, QP_NUM_PAIRS_PER_QUESTION
-    global qp_current_list_a_items, qp_current_list_b_items
+    global qp_current_list_a_items, qp_current_list_b_items, qp_current_list_a_ids, qp_current_list_b_ids
 
     qp_current_question_index += 1
 
@@ -1910,17 +2754,17 @@ def next_quick_pairs_turn():
     game_state = "quick_pairs_ongoing"
     qp_current_question_data = qp_shuffled_questions_this_round[qp_current_question_index]
 
-    for sid in players: # Reset for the new turn
-        players[sid]['qp_current_submission'] = None
-        players[sid]['qp_submission_time_ms'] = float('inf') 
+    # Both halves of pair i have ID i: the answer key maps every list A ID to the same list B ID
+    pairs = qp_current_question_data['pairs']
+    reset_turn_answers(answer_key=tuple(range(len(pairs))))
 
     # Prepare the two lists of items for players
     # qp_current_question_data['pairs'] is like [["A1","B1"], ["A2","B2"], ["A3","B3"]]
-    list_a_items = [pair[0] for pair in qp_current_question_data['pairs']]
-    list_b_items = [pair[1] for pair in qp_current_question_data['pairs']]
-
-    random.shuffle(list_a_items) # Shuffle list A independently
-    random.shuffle(list_b_items) # Shuffle list B independently
+    # Each list is shuffled independently (normally already done by the game plan)
+    qp_current_list_a_ids = turn_option_order(qp_current_question_data, 'planned_order_a', len(pairs))
+    qp_current_list_b_ids = turn_option_order(qp_current_question_data, 'planned_order_b', len(pairs))
+    list_a_items = [pairs[i][0] for i in qp_current_list_a_ids]
+    list_b_items = [pairs[i][1] for i in qp_current_list_b_ids]
     qp_current_list_a_items = list_a_items
     qp_current_list_b_items = list_b_items
 
@@ -1938,7 +2782,7 @@ def next_quick_pairs_turn():
         # Optionally send shuffled lists to main screen if you want audience to see them
         'list_a_items': list_a_items,
         'list_b_items': list_b_items,
-        'players_status': [{'name': p['name']} for p in players.values()]
+        'players_status': [{'name': p.name} for p in players.values()]
     }
     # NOTE: You will need to create '_qp_turn_display.html'
     update_main_screen_html('#round-content-area', '_qp_turn_display.html', main_screen_context)
@@ -1947,47 +2791,56 @@ def next_quick_pairs_turn():
         'category_prompt': qp_current_question_data['category_prompt'],
         'list_a': list_a_items,
         'list_b': list_b_items,
+        'list_a_ids': qp_current_list_a_ids, # Pairs are sent back as [list A ID, list B ID]
+        'list_b_ids': qp_current_list_b_ids,
         'num_pairs_to_make': QP_NUM_PAIRS_PER_QUESTION
     }
-    socketio.emit('qp_player_prompt', player_payload, room=PLAYERS_ROOM)
+    emit_to_players('qp_player_prompt', player_payload)
     print("   Sent 'Quick Pairs' prompt and item lists to players.")
+    start_turn_deadline(process_quick_pairs_turn_results)
 
 @socketio.on('submit_qp_pairs')
+@venue_event
 def handle_submit_qp_pairs(data):
     """Handles a player submitting their formed pairs for 'Quick Pairs'."""
-    player_sid = request.sid
-    if player_sid not in players or game_state != "quick_pairs_ongoing":
-        print(f"WARN: Quick Pairs submission rejected from {player_sid[:4]}. State: {game_state}")
+    player_pid = current_player_pid()
+    if player_pid not in players or game_state != "quick_pairs_ongoing":
+        print(f"WARN: Quick Pairs submission rejected from {player_pid[:4]}. State: {game_state}")
         return
+    if not is_current_turn_submission(player_pid, data): return
 
-    submitted_pairs_list = data.get('player_pairs') # e.g., [["France", "Paris"], ["Japan", "Tokyo"], ...]
+    submitted_pairs_list = data.get('player_pairs') # e.g., [[0, 2], [1, 1], [2, 0]] as [list A ID, list B ID]
     time_taken_ms = data.get('time_ms')
 
-    # Basic validation
+    # Basic validation: every list A ID and every list B ID used exactly once
     if not isinstance(submitted_pairs_list, list) or \
        not all(isinstance(p, list) and len(p) == 2 for p in submitted_pairs_list) or \
-       len(submitted_pairs_list) != QP_NUM_PAIRS_PER_QUESTION or \
+       not valid_option_ids([p[0] for p in submitted_pairs_list], QP_NUM_PAIRS_PER_QUESTION, length=QP_NUM_PAIRS_PER_QUESTION) or \
+       not valid_option_ids([p[1] for p in submitted_pairs_list], QP_NUM_PAIRS_PER_QUESTION) or \
        time_taken_ms is None or not isinstance(time_taken_ms, (int, float)) or time_taken_ms < 0:
-        emit('message', {'data': 'Invalid submission format or data.'}, room=player_sid)
-        print(f"QP Invalid submission from {players[player_sid]['name']}: {data}")
+        emit_to_player(player_pid, 'message', {'data': 'Invalid submission format or data.'})
+        print(f"QP Invalid submission from {players[player_pid].name}: {data}")
         return
 
-    if players[player_sid].get('qp_current_submission') is None: # First submission for this turn
-        players[player_sid]['qp_current_submission'] = submitted_pairs_list
-        players[player_sid]['qp_submission_time_ms'] = time_taken_ms # Store their completion time
-        
-        player_name = players[player_sid]['name']
-        print(f"QP Submission from {player_name}({player_sid[:4]}): {submitted_pairs_list} in {time_taken_ms}ms")
+    if turn_answer(player_pid) is None: # First submission for this turn
+        if not set_turn_answer(player_pid, submitted_pairs_list, time_ms=time_taken_ms): tell_turn_closed(player_pid); return # Store their completion time
+
+        player_name = players[player_pid].name
+        num_correct_pairs = sum(1 for a_id, b_id in submitted_pairs_list if b_id == turn_answer_key[a_id])
+        all_correct = num_correct_pairs == QP_NUM_PAIRS_PER_QUESTION
+        # 1 point for all pairs right; the fastest of those is bumped to 2 when the turn closes
+        record_turn_result(player_pid, {'name': player_name, 'all_correct': all_correct,
+                                        'num_correct_pairs': num_correct_pairs, 'time_ms': time_taken_ms},
+                           points=int(all_correct), correct=all_correct, bucket=num_correct_pairs, time_ms=time_taken_ms)
+        print(f"QP Submission from {player_name}({player_pid[:4]}): {submitted_pairs_list} in {time_taken_ms}ms")
 
-        safe_name_id = player_name.replace('[^a-zA-Z0-9-_]', '_')
         socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
 
         if check_all_submissions_received_qp():
             print("   All 'Quick Pairs' submissions received.")
-            socketio.sleep(0.5)
-            process_quick_pairs_turn_results()
+            close_turn_after(0.5, process_quick_pairs_turn_results)
     else:
-        emit('message', {'data': 'You already submitted for this question.'}, room=player_sid)
+        emit_to_player(player_pid, 'message', {'data': 'You already submitted for this question.'})
 
 def process_quick_pairs_turn_results():
     """Processes submissions, awards points based on correctness and speed."""
@@ -1997,94 +2850,36 @@ def process_quick_pairs_turn_results():
         print(f"WARN: Skipping QP results. State: {game_state}, QData: {qp_current_question_data is not None}")
         return
 
+    if not close_turn(): return # Already closed by the quorum, the deadline or a queued call
     game_state = "quick_pairs_results_display"
 
-    correct_pairs_set = set(tuple(sorted(p)) for p in qp_current_question_data['pairs'])
-    turn_results_list = []
-    correct_submitters_times = [] # List of (time_ms, sid) for those who got all pairs right
-
-    for sid, p_info in players.items():
-        player_submission = p_info.get('qp_current_submission')
-        player_time_ms = p_info.get('qp_submission_time_ms', float('inf'))
-        all_pairs_correct = False
-        num_correct_player_pairs = 0
-
-        if player_submission and len(player_submission) == QP_NUM_PAIRS_PER_QUESTION:
-            player_submission_set = set(tuple(sorted(p)) for p in player_submission)
-            if player_submission_set == correct_pairs_set:
-                all_pairs_correct = True
-                correct_submitters_times.append({'sid': sid, 'time_ms': player_time_ms, 'name': p_info['name']})
-                num_correct_player_pairs = QP_NUM_PAIRS_PER_QUESTION # All correct
-            else: # Check partial (though we only score all-or-nothing for the 1 point)
-                for submitted_pair_tuple in player_submission_set:
-                    if submitted_pair_tuple in correct_pairs_set:
-                        num_correct_player_pairs +=1
-        
-        # Points are awarded based on speed bonus later
-        print(f"   - Player: {p_info['name']}, AllCorrect: {all_pairs_correct}, Pairs: {num_correct_player_pairs}/{QP_NUM_PAIRS_PER_QUESTION}, Time: {player_time_ms}ms")
-        
-        turn_results_list.append({
-            'name': p_info['name'],
-            'all_correct': all_pairs_correct,
-            'num_correct_pairs': num_correct_player_pairs, # For display
-            'time_ms': player_time_ms if player_submission else '-', # For display
-            'points_this_turn': 0 # Will be updated after finding fastest
-        })
-
-    # Determine fastest correct player and award points
-    fastest_correct_player_sid = None
-    if correct_submitters_times:
-        correct_submitters_times.sort(key=lambda x: x['time_ms']) # Sort by time, fastest first
-        fastest_correct_player_sid = correct_submitters_times[0]['sid']
-        print(f"   Fastest correct player: {correct_submitters_times[0]['name']} ({correct_submitters_times[0]['time_ms']}ms)")
-
-        for sid, p_info in players.items():
-            if p_info.get('qp_current_submission') and \
-               set(tuple(sorted(p)) for p in p_info['qp_current_submission']) == correct_pairs_set:
-                turn_score_for_player = 0
-                if sid == fastest_correct_player_sid:
-                    turn_score_for_player = 2 # 2 points for fastest correct
-                    print(f"      awarding 2 pts to {p_info['name']}")
-                else:
-                    turn_score_for_player = 1 # 1 point for other correct
-                    print(f"     awarding 1 pt to {p_info['name']}")
-                
-                players[sid]['round_score'] += turn_score_for_player
-                # Update points_this_turn in turn_results_list for display
-                for res_item in turn_results_list:
-                    if res_item['name'] == p_info['name']:
-                        res_item['points_this_turn'] = turn_score_for_player
-                        break
-    
-    # Update round_score in turn_results_list for final display
-    for res_item in turn_results_list:
-        player_entry = next((p for s, p in players.items() if p['name'] == res_item['name']), None)
-        if player_entry:
-            res_item['round_score'] = player_entry['round_score']
-
+    # Submissions were scored on arrival; only the fastest correct player's bonus is left to apply
+    fastest_correct = turn_tally['fastest_correct']
+    if fastest_correct and fastest_correct[1] in players:
+        turn_result(fastest_correct[1])['points_this_turn'] = 2 # 2 points for fastest correct
+        print(f"   Fastest correct player: {players[fastest_correct[1]].name} ({fastest_correct[0]}ms)")
+    turn_results_list = collect_turn_results(lambda p: {'name': p.name, 'all_correct': False, 'num_correct_pairs': 0, 'time_ms': '-'})
 
-    # Sort for display (e.g., by points this turn, then by correctness, then by name)
-    turn_results_list.sort(key=lambda x: (-x['points_this_turn'], -int(x['all_correct']), x['name']))
+    # Top rows for display (by points this turn, then by correctness, then by name)
+    shown_results, results_more, ranks = results_view(list(zip(players, turn_results_list)),
+                                                      lambda r: (-r['points_this_turn'], -int(r['all_correct'])))
 
     results_context = {
         'category_prompt': qp_current_question_data['category_prompt'],
         'correct_pairs': qp_current_question_data['pairs'], # List of [itemA, itemB]
-        'results': turn_results_list,
+        'results': shown_results,
+        'results_more': results_more,
+        'distribution': turn_answer_distribution(
+            [(k, f"{k}/{QP_NUM_PAIRS_PER_QUESTION} pairs") for k in range(QP_NUM_PAIRS_PER_QUESTION, -1, -1)], len(turn_results_list)),
         'turn': qp_current_question_index + 1,
         'total_turns': qp_actual_turns_this_round,
         'num_pairs_per_question': QP_NUM_PAIRS_PER_QUESTION
     }
     # NOTE: You will need to create '_qp_turn_results.html'
     update_main_screen_html('#results-area', '_qp_turn_results.html', results_context)
-    socketio.emit('results_on_main_screen', room=PLAYERS_ROOM)
-
-    turn_results_display_time = 10
-    socketio.sleep(turn_results_display_time)
+    emit_player_ranks(ranks)
 
-    if game_state == "quick_pairs_results_display":
-        next_quick_pairs_turn()
-    else:
-        print(f"WARN: Game state changed during QP results sleep ({game_state}).")
+    hold_display('turn_results', next_quick_pairs_turn)
 
 
 def end_quick_pairs_round():
@@ -2093,47 +2888,31 @@ def end_quick_pairs_round():
     game_state = "quick_pairs_results" # Final round results state
     print("\n--- Ending Quick Pairs Round ---")
 
-    active_players = [(sid, p.get('round_score', 0)) for sid, p in players.items()]
-    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], players.get(item[0],{}).get('name',''))) # Higher score is better
-    sorted_sids = [item[0] for item in sorted_by_round]
+    active_players = [(pid, p.round_score) for pid, p in players.items()]
+    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], getattr(players.get(item[0]), 'name', ''))) # Higher score is better
+    sorted_pids = [item[0] for item in sorted_by_round]
 
-    points_awarded = award_game_points(sorted_sids) # Use existing Stableford
+    points_awarded = award_game_points(sorted_pids) # Use existing Stableford
     emit_game_state_update()
 
-    rankings_this_round = []
-    for rank, sid in enumerate(sorted_sids):
-        if sid in players:
-            rankings_this_round.append({
-                'rank': rank + 1,
-                'name': players[sid]['name'],
-                'round_score': players[sid]['round_score'], # Total points from correct pairs
-                'points_awarded': points_awarded.get(sid, 0)
-            })
+    rankings_this_round, rankings_more = round_rankings_view(sorted_pids, points_awarded)
 
-    current_overall_scores_list = [{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)}
-                                   for sid, p in players.items()]
-    current_overall_scores_list.sort(key=lambda x: x['game_score'], reverse=True)
+    current_overall_scores_list = overall_scores_view(RESULTS_TOP_N) # Already in rank order
 
     summary_context = {
         'round_type': ROUND_DISPLAY_NAMES.get('quick_pairs', 'Quick Pairs'),
         'rankings': rankings_this_round,
+        'rankings_more': rankings_more,
         'overall_scores': current_overall_scores_list
     }
     update_main_screen_html('#results-area', '_round_summary.html', summary_context)
 
-    round_summary_display_time = 12
-    socketio.sleep(get_round_timing('round_summary'))
-
-    if game_state == "quick_pairs_results":
-        start_next_game_round()
-    else:
-        print(f"WARN: Game state changed during QP summary sleep ({game_state}).")
+    hold_display('round_summary', start_next_game_round)
 
 # === TRUE OR FALSE LOGIC ===
 
 def check_all_guesses_received_tf():
-    if not players: return True
-    return all(p.get('tf_current_guess') is not None for p in players.values())
+    return turn_quorum_reached()
 
 def setup_true_or_false_round():
     global game_state, tf_shuffled_questions_this_round, tf_current_question_index, tf_actual_turns_this_round
@@ -2145,18 +2924,16 @@ def setup_true_or_false_round():
         start_next_game_round()
         return
 
-    for sid in players:
-        players[sid]['round_score'] = 0
-        players[sid]['tf_current_guess'] = None
+    for pid in players:
+        players[pid].round_score = 0
 
     tf_actual_turns_this_round = min(tf_target_turns, len(tf_questions))
-    tf_shuffled_questions_this_round = random.sample(tf_questions, tf_actual_turns_this_round)
+    tf_shuffled_questions_this_round = take_planned_questions('true_or_false', tf_questions, tf_actual_turns_this_round)
     tf_current_question_index = -1
 
     print(f"True or False Round starting with {tf_actual_turns_this_round} questions.")
     emit_game_state_update()
-    socketio.sleep(0.5)
-    next_true_or_false_turn()
+    continue_after(0.5, next_true_or_false_turn)
 
 def next_true_or_false_turn():
     global game_state, tf_current_question, tf_current_question_index
@@ -2170,8 +2947,7 @@ def next_true_or_false_turn():
     game_state = "true_or_false_ongoing"
     tf_current_question = tf_shuffled_questions_this_round[tf_current_question_index]
 
-    for sid in players:
-        players[sid]['tf_current_guess'] = None
+    reset_turn_answers()
 
     print(f"\n-- TF Turn {tf_current_question_index + 1}/{tf_actual_turns_this_round} --")
     print(f"   Statement: {tf_current_question['statement']}")
@@ -2181,111 +2957,105 @@ def next_true_or_false_turn():
         'turn': tf_current_question_index + 1,
         'total_turns': tf_actual_turns_this_round,
         'statement': tf_current_question['statement'],
-        'players_status': [{'name': p['name']} for p in players.values()]
+        'players_status': [{'name': p.name} for p in players.values()]
     }
     update_main_screen_html('#round-content-area', '_true_or_false_turn_display.html', main_screen_context)
 
     player_payload = {'statement': tf_current_question['statement']}
-    socketio.emit('true_or_false_player_prompt', player_payload, room=PLAYERS_ROOM)
+    emit_to_players('true_or_false_player_prompt', player_payload)
+    start_turn_deadline(process_true_or_false_turn_results)
 
 @socketio.on('submit_true_or_false_guess')
+@venue_event
 def handle_submit_tf_guess(data):
-    player_sid = request.sid
-    if player_sid not in players or game_state != "true_or_false_ongoing": return
+    player_pid = current_player_pid()
+    if player_pid not in players or game_state != "true_or_false_ongoing": return
+    if not is_current_turn_submission(player_pid, data): return
 
     guess = data.get('guess')
     if guess is None or not isinstance(guess, bool):
-        print(f"Invalid TF guess from {players[player_sid]['name']}: {guess}")
+        print(f"Invalid TF guess from {players[player_pid].name}: {guess}")
         return
 
-    if players[player_sid].get('tf_current_guess') is None:
-        players[player_sid]['tf_current_guess'] = guess
-        player_name = players[player_sid]['name']
+    if turn_answer(player_pid) is None:
+        if not set_turn_answer(player_pid, guess): tell_turn_closed(player_pid); return
+        player_name = players[player_pid].name
         print(f"TF Guess '{guess}' received from {player_name}")
         socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
 
         if check_all_guesses_received_tf():
             print("   All TF guesses received.")
-            socketio.sleep(0.5)
-            process_true_or_false_turn_results()
+            close_turn_after(0.5, process_true_or_false_turn_results)
 
 def process_true_or_false_turn_results():
     global game_state
     if game_state != "true_or_false_ongoing": return
+    if not close_turn(): return # Already closed by the quorum, the deadline or a queued call
     game_state = "tf_results_display"
     
     correct_answer = tf_current_question['correct_answer']
-    turn_results_list = []
+    turn_results_list = []; guess_counts = Counter()
 
-    for sid, p_info in players.items():
-        guess = p_info.get('tf_current_guess')
+    for pid, p_info in players.items():
+        guess = turn_answer(pid)
         was_correct = (guess == correct_answer)
+        guess_counts[guess] += 1
         
         if was_correct:
-            p_info['round_score'] += 1
+            p_info.round_score += 1
 
         turn_results_list.append({
-            'name': p_info['name'],
+            'name': p_info.name,
             'guess_text': "True" if guess else "False" if guess is not None else "N/A",
             'is_correct': was_correct,
-            'round_score': p_info['round_score']
+            'round_score': p_info.round_score
         })
     
-    turn_results_list.sort(key=lambda x: (-int(x['is_correct']), x['name']))
+    # Top rows (correct first, then by name) for display; everyone else just gets their rank
+    shown_results, results_more, ranks = results_view(list(zip(players, turn_results_list)), lambda r: -int(r['is_correct']))
 
     results_context = {
         'statement': tf_current_question['statement'],
         'correct_answer_text': "TRUE" if correct_answer else "FALSE",
-        'results': turn_results_list,
+        'results': shown_results,
+        'results_more': results_more,
+        'distribution': distribution_view(guess_counts, [(True, 'True'), (False, 'False'), (None, 'No answer')]),
     }
     update_main_screen_html('#results-area', '_true_or_false_turn_results.html', results_context)
-    socketio.emit('results_on_main_screen', room=PLAYERS_ROOM)
+    emit_player_ranks(ranks)
 
-    socketio.sleep(get_round_timing('turn_results')) # Show results for 6 seconds
-    if game_state == "tf_results_display":
-        next_true_or_false_turn()
+    hold_display('turn_results', next_true_or_false_turn)
 
 def end_true_or_false_round():
     global game_state
     game_state = "true_or_false_results"
     print("\n--- Ending True or False Round ---")
 
-    active_players = [(sid, p.get('round_score', 0)) for sid, p in players.items()]
-    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], players.get(item[0], {}).get('name','')))
-    sorted_sids = [item[0] for item in sorted_by_round]
+    active_players = [(pid, p.round_score) for pid, p in players.items()]
+    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], getattr(players.get(item[0]), 'name', '')))
+    sorted_pids = [item[0] for item in sorted_by_round]
     
-    points_awarded = award_game_points(sorted_sids)
+    points_awarded = award_game_points(sorted_pids)
     emit_game_state_update()
 
-    rankings_this_round = []
-    for rank, sid in enumerate(sorted_sids):
-        if sid in players:
-            rankings_this_round.append({
-                'rank': rank + 1,
-                'name': players[sid]['name'],
-                'round_score': players[sid]['round_score'],
-                'points_awarded': points_awarded.get(sid, 0)
-            })
+    rankings_this_round, rankings_more = round_rankings_view(sorted_pids, points_awarded)
 
-    current_overall_scores_list = [{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)} for sid, p in players.items()]
-    current_overall_scores_list.sort(key=lambda x: x['game_score'], reverse=True)
+    current_overall_scores_list = overall_scores_view(RESULTS_TOP_N) # Already in rank order
 
     summary_context = {
         'round_type': ROUND_DISPLAY_NAMES.get('true_or_false', 'True or False'),
         'rankings': rankings_this_round,
+        'rankings_more': rankings_more,
         'overall_scores': current_overall_scores_list
     }
     update_main_screen_html('#results-area', '_round_summary.html', summary_context)
 
-    socketio.sleep(12)
-    if game_state == "true_or_false_results":
-        start_next_game_round()
+    hold_display('round_summary', start_next_game_round)
 
 # === TAP THE PIC LOGIC ===
 
 def check_all_guesses_received_ttp():
-    if not players: return True
-    return all(p.get('ttp_current_guess') is not None for p in players.values())
+    return turn_quorum_reached()
 
 def setup_tap_the_pic_round():
     global game_state, ttp_shuffled_questions_this_round, ttp_current_question_index, ttp_actual_turns_this_round
@@ -2297,18 +3067,16 @@ def setup_tap_the_pic_round():
         start_next_game_round()
         return
 
-    for sid in players:
-        players[sid]['round_score'] = 0
-        players[sid]['ttp_current_guess'] = None
+    for pid in players:
+        players[pid].round_score = 0
 
     ttp_actual_turns_this_round = min(ttp_target_turns, len(ttp_questions))
-    ttp_shuffled_questions_this_round = random.sample(ttp_questions, ttp_actual_turns_this_round)
+    ttp_shuffled_questions_this_round = take_planned_questions('tap_the_pic', ttp_questions, ttp_actual_turns_this_round)
     ttp_current_question_index = -1
 
     print(f"Tap The Pic Round starting with {ttp_actual_turns_this_round} questions.")
     emit_game_state_update()
-    socketio.sleep(0.5)
-    next_tap_the_pic_turn()
+    continue_after(0.5, next_tap_the_pic_turn)
 
 def next_tap_the_pic_turn():
     global game_state, ttp_current_question, ttp_current_question_index
@@ -2321,8 +3089,7 @@ def next_tap_the_pic_turn():
     game_state = "tap_the_pic_ongoing"
     ttp_current_question = ttp_shuffled_questions_this_round[ttp_current_question_index]
 
-    for sid in players:
-        players[sid]['ttp_current_guess'] = None
+    reset_turn_answers()
 
     print(f"\n-- TTP Turn {ttp_current_question_index + 1}/{ttp_actual_turns_this_round} --")
     print(f"   Q: {ttp_current_question['question_text']}")
@@ -2333,7 +3100,7 @@ def next_tap_the_pic_turn():
         'total_turns': ttp_actual_turns_this_round,
         'question_text': ttp_current_question['question_text'],
         'image_url': ttp_current_question['image_url'],
-        'players_status': [{'name': p['name']} for p in players.values()]
+        'players_status': [{'name': p.name} for p in players.values()]
     }
     update_main_screen_html('#round-content-area', '_tap_the_pic_turn_display.html', main_screen_context)
 
@@ -2341,108 +3108,102 @@ def next_tap_the_pic_turn():
         'question': ttp_current_question['question_text'],
         'num_options': ttp_current_question['num_options']
     }
-    socketio.emit('tap_the_pic_player_prompt', player_payload, room=PLAYERS_ROOM)
+    emit_to_players('tap_the_pic_player_prompt', player_payload)
+    start_turn_deadline(process_tap_the_pic_turn_results)
 
 @socketio.on('submit_ttp_guess')
+@venue_event
 def handle_submit_ttp_guess(data):
-    player_sid = request.sid
-    if player_sid not in players or game_state != "tap_the_pic_ongoing": return
+    player_pid = current_player_pid()
+    if player_pid not in players or game_state != "tap_the_pic_ongoing": return
+    if not is_current_turn_submission(player_pid, data): return
 
     try:
         guess = int(data.get('guess'))
     except (ValueError, TypeError):
-        print(f"Invalid TTP guess from {players[player_sid]['name']}: {data.get('guess')}")
+        print(f"Invalid TTP guess from {players[player_pid].name}: {data.get('guess')}")
         return
 
-    if players[player_sid].get('ttp_current_guess') is None:
-        players[player_sid]['ttp_current_guess'] = guess
-        player_name = players[player_sid]['name']
+    if turn_answer(player_pid) is None:
+        if not set_turn_answer(player_pid, guess): tell_turn_closed(player_pid); return
+        player_name = players[player_pid].name
         print(f"TTP Guess '{guess}' received from {player_name}")
         socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
 
         if check_all_guesses_received_ttp():
             print("   All TTP guesses received.")
-            socketio.sleep(0.5)
-            process_tap_the_pic_turn_results()
+            close_turn_after(0.5, process_tap_the_pic_turn_results)
 
 def process_tap_the_pic_turn_results():
     global game_state
     if game_state != "tap_the_pic_ongoing": return
+    if not close_turn(): return # Already closed by the quorum, the deadline or a queued call
     game_state = "ttp_results_display"
     
     correct_answer = ttp_current_question['correct_answer']
-    turn_results_list = []
+    turn_results_list = []; guess_counts = Counter()
 
-    for sid, p_info in players.items():
-        guess = p_info.get('ttp_current_guess')
+    for pid, p_info in players.items():
+        guess = turn_answer(pid)
         was_correct = (guess == correct_answer)
+        guess_counts[guess] += 1
         
         if was_correct:
-            p_info['round_score'] += 1
+            p_info.round_score += 1
 
         turn_results_list.append({
-            'name': p_info['name'],
+            'name': p_info.name,
             'guess': guess if guess is not None else "N/A",
             'is_correct': was_correct,
-            'round_score': p_info['round_score']
+            'round_score': p_info.round_score
         })
     
-    turn_results_list.sort(key=lambda x: (-int(x['is_correct']), x['name']))
+    # Top rows (correct first, then by name) for display; everyone else just gets their rank
+    shown_results, results_more, ranks = results_view(list(zip(players, turn_results_list)), lambda r: -int(r['is_correct']))
 
     results_context = {
         'question_text': ttp_current_question['question_text'],
         'image_url': ttp_current_question['image_url'], # Don't show image on results
         'correct_answer': correct_answer,
-        'results': turn_results_list
+        'results': shown_results,
+        'results_more': results_more,
+        'distribution': distribution_view(guess_counts, [(option, f'Option {option}') for option in range(1, ttp_current_question['num_options'] + 1)] + [(None, 'No answer')])
     }
     update_main_screen_html('#results-area', '_tap_the_pic_turn_results.html', results_context)
-    socketio.emit('results_on_main_screen', room=PLAYERS_ROOM)
+    emit_player_ranks(ranks)
 
-    socketio.sleep(get_round_timing('turn_results')) # Show results longer as they check the image
-    if game_state == "ttp_results_display":
-        next_tap_the_pic_turn()
+    hold_display('turn_results', next_tap_the_pic_turn)
 
 def end_tap_the_pic_round():
     global game_state
     game_state = "tap_the_pic_results"
     print("\n--- Ending Tap The Pic Round ---")
 
-    active_players = [(sid, p.get('round_score', 0)) for sid, p in players.items()]
-    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], players.get(item[0], {}).get('name','')))
-    sorted_sids = [item[0] for item in sorted_by_round]
+    active_players = [(pid, p.round_score) for pid, p in players.items()]
+    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], getattr(players.get(item[0]), 'name', '')))
+    sorted_pids = [item[0] for item in sorted_by_round]
     
-    points_awarded = award_game_points(sorted_sids)
+    points_awarded = award_game_points(sorted_pids)
     emit_game_state_update()
 
-    rankings_this_round = []
-    for rank, sid in enumerate(sorted_sids):
-        if sid in players:
-            rankings_this_round.append({
-                'rank': rank + 1,
-                'name': players[sid]['name'],
-                'round_score': players[sid]['round_score'],
-                'points_awarded': points_awarded.get(sid, 0)
-            })
+    rankings_this_round, rankings_more = round_rankings_view(sorted_pids, points_awarded)
 
-    current_overall_scores_list = [{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)} for sid, p in players.items()]
-    current_overall_scores_list.sort(key=lambda x: x['game_score'], reverse=True)
+    current_overall_scores_list = overall_scores_view(RESULTS_TOP_N) # Already in rank order
 
     summary_context = {
         'round_type': ROUND_DISPLAY_NAMES.get('tap_the_pic', 'Tap The Pic'),
         'rankings': rankings_this_round,
+        'rankings_more': rankings_more,
         'overall_scores': current_overall_scores_list
     }
     update_main_screen_html('#results-area', '_round_summary.html', summary_context)
 
-    socketio.sleep(12)
-    if game_state == "tap_the_pic_results":
-        start_next_game_round()
+    hold_display('round_summary', start_next_game_round)
 
 # === THE TOP THREE LOGIC ===
 
 def check_all_submissions_received_ttt():
-    if not players: return True
-    return all(p.get('ttt_current_submission') is not None for p in players.values())
+    return turn_quorum_reached()
 
 def setup_the_top_three_round():
     global game_state, ttt_shuffled_questions_this_round, ttt_current_question_index, ttt_actual_turns_this_round
@@ -2454,22 +3215,20 @@ def setup_the_top_three_round():
         start_next_game_round()
         return
 
-    for sid in players:
-        players[sid]['round_score'] = 0
-        players[sid]['ttt_current_submission'] = None
+    for pid in players:
+        players[pid].round_score = 0
 
     ttt_actual_turns_this_round = min(ttt_target_turns, len(ttt_questions))
-    ttt_shuffled_questions_this_round = random.sample(ttt_questions, ttt_actual_turns_this_round)
+    ttt_shuffled_questions_this_round = take_planned_questions('the_top_three', ttt_questions, ttt_actual_turns_this_round)
     ttt_current_question_index = -1
 
     print(f"The Top Three Round starting with {ttt_actual_turns_this_round} questions.")
     emit_game_state_update()
-    socketio.sleep(0.5)
-    next_the_top_three_turn()
+    continue_after(0.5, next_the_top_three_turn)
 
 def next_the_top_three_turn():
     global game_state, ttt_current_question, ttt_current_question_index
-    global ttt_current_options_shuffled
+    global ttt_current_options_shuffled, ttt_current_option_ids
 
     ttt_current_question_index += 1
     if ttt_current_question_index >= ttt_actual_turns_this_round:
@@ -2479,17 +3238,15 @@ def next_the_top_three_turn():
     game_state = "the_top_three_ongoing"
     ttt_current_question = ttt_shuffled_questions_this_round[ttt_current_question_index]
 
-    for sid in players:
-        players[sid]['ttt_current_submission'] = None
+    reset_turn_answers(answer_key=ttt_current_question['answer_mask'])
 
     print(f"\n-- TTT Turn {ttt_current_question_index + 1}/{ttt_actual_turns_this_round} --")
     print(f"   Q: {ttt_current_question['question_text']}")
 
     # --- THE FIX IS HERE ---
-    # 1. Create the list of options ONCE.
-    options_for_display_and_play = list(ttt_current_question['options'])
-    # 2. Shuffle it ONCE.
-    random.shuffle(options_for_display_and_play)
+    # 1+2. Create the shuffled list of options ONCE (normally already done by the game plan).
+    ttt_current_option_ids = turn_option_order(ttt_current_question, 'planned_order', len(ttt_current_question['options']))
+    options_for_display_and_play = [ttt_current_question['options'][i] for i in ttt_current_option_ids]
     ttt_current_options_shuffled = list(options_for_display_and_play)
 
     # 3. Use this SAME shuffled list for the main screen.
@@ -2498,83 +3255,64 @@ def next_the_top_three_turn():
         'total_turns': ttt_actual_turns_this_round,
         'question_text': ttt_current_question['question_text'],
         'options': options_for_display_and_play, # Use the single shuffled list
-        'players_status': [{'name': p['name']} for p in players.values()]
+        'players_status': [{'name': p.name} for p in players.values()]
     }
     update_main_screen_html('#round-content-area', '_top_three_turn_display.html', main_screen_context)
 
     # 4. And use the SAME shuffled list for the player controllers.
     player_payload = {
         'question': ttt_current_question['question_text'],
-        'options': options_for_display_and_play # Use the single shuffled list
+        'options': options_for_display_and_play, # Use the single shuffled list
+        'option_ids': ttt_current_option_ids # Players answer with these IDs
     }
-    socketio.emit('top_three_player_prompt', player_payload, room=PLAYERS_ROOM)
+    emit_to_players('top_three_player_prompt', player_payload)
+    start_turn_deadline(process_the_top_three_turn_results)
 
 @socketio.on('submit_top_three_guess')
+@venue_event
 def handle_submit_ttt_guess(data):
-    player_sid = request.sid
-    if player_sid not in players or game_state != "the_top_three_ongoing": return
+    player_pid = current_player_pid()
+    if player_pid not in players or game_state != "the_top_three_ongoing": return
+    if not is_current_turn_submission(player_pid, data): return
 
-    guess = data.get('guess')
-    if not isinstance(guess, list) or len(guess) != 3:
-        print(f"Invalid TTT guess from {players[player_sid]['name']}: {guess}")
+    guess = data.get('option_ids')
+    if not valid_option_ids(guess, len(ttt_current_question['options']), length=3):
+        print(f"Invalid TTT guess from {players[player_pid].name}: {guess}")
         return
 
-    if players[player_sid].get('ttt_current_submission') is None:
-        players[player_sid]['ttt_current_submission'] = guess
-        player_name = players[player_sid]['name']
+    if turn_answer(player_pid) is None:
+        if not set_turn_answer(player_pid, guess): tell_turn_closed(player_pid); return
+        player_name = players[player_pid].name
+        num_correct = bin(sum(1 << i for i in guess) & turn_answer_key).count('1')
+        record_turn_result(player_pid, {'name': player_name, 'num_correct': num_correct},
+                           points=TTT_POINTS_BY_NUM_CORRECT.get(num_correct, 0), correct=num_correct == 3, bucket=num_correct)
         print(f"TTT Guess '{guess}' received from {player_name}")
         socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
 
         if check_all_submissions_received_ttt():
             print("   All TTT guesses received.")
-            socketio.sleep(0.5)
-            process_the_top_three_turn_results()
+            close_turn_after(0.5, process_the_top_three_turn_results)
 
 def process_the_top_three_turn_results():
     global game_state
     if game_state != "the_top_three_ongoing": return
+    if not close_turn(): return # Already closed by the quorum, the deadline or a queued call
     game_state = "ttt_results_display"
     
-    correct_answers = set(ttt_current_question['correct_answers'])
-    turn_results_list = []
-
-    for sid, p_info in players.items():
-        submission = p_info.get('ttt_current_submission')
-        num_correct = 0
-        points_for_turn = 0
-        if submission:
-            # Compare the sets to find the number of correct items
-            num_correct = len(set(submission) & correct_answers)
-
-        if num_correct == 3:
-            points_for_turn = 3
-        elif num_correct == 2:
-            points_for_turn = 1
-        else: # This covers the case for 1 or 0 correct
-            points_for_turn = 0
-        
-        p_info['round_score'] += points_for_turn
-
-        turn_results_list.append({
-            'name': p_info['name'],
-            'num_correct': num_correct,
-            'round_score': p_info['round_score'],
-            'points_this_turn': points_for_turn 
-        })
-    
-    turn_results_list.sort(key=lambda x: (-x['num_correct'], x['name']))
+    turn_results_list = collect_turn_results(lambda p: {'name': p.name, 'num_correct': 0})
+    shown_results, results_more, ranks = results_view(list(zip(players, turn_results_list)), lambda r: -r['num_correct'])
 
     results_context = {
         'question_text': ttt_current_question['question_text'],
         'correct_answers': ttt_current_question['correct_answers'],
-        'results': turn_results_list
+        'results': shown_results,
+        'results_more': results_more,
+        'distribution': turn_answer_distribution([(k, f"{k}/3 correct") for k in range(3, -1, -1)], len(turn_results_list))
     }
     update_main_screen_html('#results-area', '_top_three_turn_results.html', results_context)
-    socketio.emit('results_on_main_screen', room=PLAYERS_ROOM)
+    emit_player_ranks(ranks)
 
-    socketio.sleep(get_round_timing('turn_results'))
-    if game_state == "ttt_results_display":
-        next_the_top_three_turn()
+    hold_display('turn_results', next_the_top_three_turn)
 
 def end_the_top_three_round():
     global game_state
@@ -2582,51 +3320,49 @@ def end_the_top_three_round():
     game_state = "the_top_three_results"
     print("\n--- Ending The Top Three Round ---")
 
-    active_players = [(sid, p.get('round_score', 0)) for sid, p in players.items()]
-    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], players.get(item[0], {}).get('name','')))
-    sorted_sids = [item[0] for item in sorted_by_round]
+    active_players = [(pid, p.round_score) for pid, p in players.items()]
+    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], getattr(players.get(item[0]), 'name', '')))
+    sorted_pids = [item[0] for item in sorted_by_round]
     
-    points_awarded = award_game_points(sorted_sids)
+    points_awarded = award_game_points(sorted_pids)
     emit_game_state_update()
 
-    rankings_this_round = []
-    for rank, sid in enumerate(sorted_sids):
-        if sid in players:
-            rankings_this_round.append({
-                'rank': rank + 1,
-                'name': players[sid]['name'],
-                'round_score': players[sid]['round_score'],
-                'points_awarded': points_awarded.get(sid, 0)
-            })
+    rankings_this_round, rankings_more = round_rankings_view(sorted_pids, points_awarded)
 
-    current_overall_scores_list = [{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)} for sid, p in players.items()]
-    current_overall_scores_list.sort(key=lambda x: x['game_score'], reverse=True)
+    current_overall_scores_list = overall_scores_view(RESULTS_TOP_N) # Already in rank order
 
     summary_context = {
         'round_type': ROUND_DISPLAY_NAMES.get('the_top_three', 'The Top Three'),
         'rankings': rankings_this_round,
+        'rankings_more': rankings_more,
         'overall_scores': current_overall_scores_list
     }
     update_main_screen_html('#results-area', '_round_summary.html', summary_context)
 
-    socketio.sleep(12)
-    if game_state == "the_top_three_results":
-        start_next_game_round()
-
     ttt_current_options_shuffled = None
+    hold_display('round_summary', start_next_game_round)
 
 # === HIGHER OR LOWER LOGIC ===
+# Turn calculation logic based on your rules
+HOL_TURN_CONFIGS = {
+    2: {'turns': 10, 'submits_per_player': 5}, 3: {'turns': 9, 'submits_per_player': 3},
+    4: {'turns': 12, 'submits_per_player': 3}, 5: {'turns': 10, 'submits_per_player': 2},
+    6: {'turns': 12, 'submits_per_player': 2}, 7: {'turns': 7, 'submits_per_player': 1},
+    8: {'turns': 8, 'submits_per_player': 1}
+}
+
+def get_hol_turn_config(num_players):
+    return HOL_TURN_CONFIGS.get(num_players, {'turns': num_players, 'submits_per_player': 1})
+
 
 def check_all_guesses_received_hol():
     """Checks if all GUESSERS (not submitter) have submitted their H/L guess."""
-    if not players: return True
-    # We only check players who are NOT the current submitter
-    return all(p.get('hol_current_guess') is not None for sid, p in players.items() if sid != hol_current_submitter_sid)
+    return turn_quorum_reached() # The quorum already leaves out the submitter
 
 def setup_higher_or_lower_round():
     """Sets up the state for a 'Higher or Lower' round based on player count."""
     global game_state, hol_shuffled_questions_this_round, hol_current_turn_index
-    global hol_actual_turns_this_round, hol_player_submitter_queue
+    global hol_actual_turns_this_round, hol_player_submitter_queue, hol_ahead_prompted_turn
 
     print("--- Setup Higher or Lower Round ---")
     game_state = "higher_or_lower_ongoing"
@@ -2642,14 +3378,7 @@ def setup_higher_or_lower_round():
         start_next_game_round()
         return
 
-    # Turn calculation logic based on your rules
-    turn_configs = {
-        2: {'turns': 10, 'submits_per_player': 5}, 3: {'turns': 9, 'submits_per_player': 3},
-        4: {'turns': 12, 'submits_per_player': 3}, 5: {'turns': 10, 'submits_per_player': 2},
-        6: {'turns': 12, 'submits_per_player': 2}, 7: {'turns': 7, 'submits_per_player': 1},
-        8: {'turns': 8, 'submits_per_player': 1}
-    }
-    config = turn_configs.get(num_players, {'turns': num_players, 'submits_per_player': 1})
+    config = get_hol_turn_config(num_players)
     hol_actual_turns_this_round = config['turns']
     submits_per_player = config['submits_per_player']
 
@@ -2658,28 +3387,27 @@ def setup_higher_or_lower_round():
         print(f"WARN: Not enough questions for HOL ({len(hol_questions)} < {hol_actual_turns_this_round}). Using all available.")
         hol_actual_turns_this_round = len(hol_questions)
 
-    hol_shuffled_questions_this_round = random.sample(hol_questions, hol_actual_turns_this_round)
+    hol_shuffled_questions_this_round = take_planned_questions('higher_or_lower', hol_questions, hol_actual_turns_this_round)
     
     # Create the randomized, repeating submitter queue
-    player_sids = list(players.keys())
-    random.shuffle(player_sids)
-    hol_player_submitter_queue = (player_sids * submits_per_player)
+    player_pids = list(players.keys())
+    random.shuffle(player_pids)
+    hol_player_submitter_queue = (player_pids * submits_per_player)
     
     # Reset round scores and guesses
-    for sid in players:
-        players[sid]['round_score'] = 0
-        players[sid]['hol_current_guess'] = None
+    for pid in players:
+        players[pid].round_score = 0
     
     hol_current_turn_index = -1
+    hol_presubmitted_guesses.clear(); hol_ahead_prompted_turn = -1
     print(f"HOL Round starting: {num_players} players, {hol_actual_turns_this_round} turns, {submits_per_player} submits each.")
     emit_game_state_update()
-    socketio.sleep(0.5)
-    next_turn_higher_or_lower()
+    continue_after(0.5, next_turn_higher_or_lower)
 
 def next_turn_higher_or_lower():
     """Starts the next turn, designating a submitter (Stage 1)."""
     global game_state, hol_current_question, hol_current_turn_index, hol_current_turn_stage
-    global hol_current_submitter_sid, hol_submitter_guess
+    global hol_current_submitter_pid, hol_submitter_guess
 
     hol_current_turn_index += 1
     if hol_current_turn_index >= hol_actual_turns_this_round:
@@ -2689,17 +3417,19 @@ def next_turn_higher_or_lower():
     game_state = "higher_or_lower_ongoing"
     hol_current_turn_stage = 'AWAITING_SUBMISSION'
     hol_current_question = hol_shuffled_questions_this_round[hol_current_turn_index]
-    hol_current_submitter_sid = hol_player_submitter_queue[hol_current_turn_index]
+    hol_current_submitter_pid = hol_player_submitter_queue[hol_current_turn_index]
     hol_submitter_guess = None
     
     # Reset all player guesses for the new turn
-    for sid in players:
-        players[sid]['hol_current_guess'] = None
+    reset_turn_answers()
 
-    submitter_name = players[hol_current_submitter_sid]['name']
+    submitter_name = players[hol_current_submitter_pid].name
     print(f"\n-- HOL Turn {hol_current_turn_index + 1}/{hol_actual_turns_this_round} --")
-    print(f"   Stage 1: Awaiting submission from {submitter_name}")
     print(f"   Q: {hol_current_question['question']} (Ans: {hol_current_question['answer']})")
+    if hol_current_turn_index in hol_presubmitted_guesses: # Number already sent ahead: straight to stage 2
+        begin_hol_guessing_stage(hol_presubmitted_guesses.pop(hol_current_turn_index))
+        return
+    print(f"   Stage 1: Awaiting submission from {submitter_name}")
 
     # Update Main Screen for Stage 1
     main_screen_context = {
@@ -2708,69 +3438,122 @@ def next_turn_higher_or_lower():
     }
     update_main_screen_html('#round-content-area', '_hol_submitter_turn_display.html', main_screen_context)
 
-    # Prompt only the Submitter
-    socketio.emit('hol_submitter_prompt', {'question': hol_current_question['question']}, room=hol_current_submitter_sid)
+    # Prompt only the Submitter (a controller already showing this turn's pipelined prompt keeps it)
+    emit_to_player(hol_current_submitter_pid, 'hol_submitter_prompt', hol_submitter_payload(hol_current_turn_index))
     # Tell everyone else to wait
-    for sid, p_info in players.items():
-        if sid != hol_current_submitter_sid:
-            socketio.emit('hol_wait_prompt', {'wait_message': f"Waiting for {submitter_name} to guess..."}, room=sid)
+    for pid, p_info in players.items():
+        if pid != hol_current_submitter_pid:
+            emit_to_player(pid, 'hol_wait_prompt', {'wait_message': f"Waiting for {submitter_name} to guess..."})
+    start_turn_deadline(skip_hol_submission, 'submission_deadline')
+    reevaluate_turn_quorum() # The submitter may have dropped out before their turn came up
+
+def hol_submitter_payload(turn_index):
+    return {'question': hol_shuffled_questions_this_round[turn_index]['question'], 'turn': turn_index}
+
+def prompt_next_hol_submitter_ahead(free_pid):
+    """Pipelined mode: if free_pid submits next turn, send them that question now instead of a wait screen."""
+    global hol_ahead_prompted_turn
+    next_turn = hol_current_turn_index + 1
+    if not HOL_PIPELINE or next_turn >= hol_actual_turns_this_round or hol_ahead_prompted_turn >= next_turn: return False
+    if hol_player_submitter_queue[next_turn] != free_pid: return False
+    hol_ahead_prompted_turn = next_turn
+    print(f"   [HOL_PIPELINE] {players[free_pid].name} gets turn {next_turn + 1}'s question ahead of time.")
+    emit_to_player(free_pid, 'hol_submitter_prompt', hol_submitter_payload(next_turn))
+    return True
+
+def hol_ahead_prompt_pending():
+    """pid of the next submitter if they have the pipelined prompt up but haven't answered it, else None."""
+    next_turn = hol_current_turn_index + 1
+    if hol_ahead_prompted_turn == next_turn and next_turn not in hol_presubmitted_guesses:
+        return hol_player_submitter_queue[next_turn]
+    return None
+
+def begin_hol_guessing_stage(guess):
+    """Stage 2: the submitter's number is in, everyone else guesses Higher or Lower."""
+    global hol_submitter_guess, hol_current_turn_stage
+    hol_submitter_guess = guess
+    hol_current_turn_stage = 'AWAITING_GUESSES'
+    submitter_name = players[hol_current_submitter_pid].name
+    print(f"   Stage 2: {submitter_name}'s guess is {guess}. Awaiting H/L from others.")
+
+    # Update Main Screen for Stage 2
+    main_screen_context = {
+        'turn': hol_current_turn_index + 1, 'total_turns': hol_actual_turns_this_round,
+        'question_text': hol_current_question['question'], 'submitter_name': submitter_name,
+        'submitter_guess': hol_submitter_guess,
+        'players_status': [{'name': p.name} for pid, p in players.items() if pid != hol_current_submitter_pid]
+    }
+    update_main_screen_html('#round-content-area', '_hol_guesser_turn_display.html', main_screen_context)
+
+    # Prompt all OTHER players to guess Higher or Lower
+    for pid in players:
+        if pid != hol_current_submitter_pid:
+            emit_to_player(pid, 'hol_guesser_prompt', {})
+    # Tell the submitter to wait now (or hand them next turn's question straight away)
+    if not prompt_next_hol_submitter_ahead(hol_current_submitter_pid):
+        emit_to_player(hol_current_submitter_pid, 'hol_wait_prompt', {'wait_message': "Waiting for others to guess Higher or Lower..."})
+    start_turn_deadline(process_results_higher_or_lower)
+
+def skip_hol_submission():
+    """The submitter ran out of time or dropped out: nobody can guess Higher or Lower, so move to the next turn."""
+    if game_state != "higher_or_lower_ongoing" or hol_current_turn_stage != 'AWAITING_SUBMISSION': return
+    if not close_turn(): return
+    print(f"   {getattr(players.get(hol_current_submitter_pid), 'name', '?')} didn't submit a number, skipping the turn.")
+    emit_to_player(hol_current_submitter_pid, 'message', {'data': "Your turn was skipped."})
+    next_turn_higher_or_lower()
 
 @socketio.on('submit_hol_guess')
+@venue_event
 def handle_submit_hol_guess(data):
     """Handles both guess types: number from submitter, and H/L from guessers."""
-    # Move the global declaration to the top of the function
-    global hol_submitter_guess, hol_current_turn_stage
+    player_pid = current_player_pid()
+    if player_pid not in players or game_state not in ("higher_or_lower_ongoing", "hol_results_display"): return
 
-    player_sid = request.sid
-    if player_sid not in players or game_state != "higher_or_lower_ongoing": return
+    player_name = players[player_pid].name
+    turn = data.get('turn')
+    if turn is None: turn = hol_current_turn_index # Guessers (and older controllers) don't send a turn
 
-    player_name = players[player_sid]['name']
+    # --- Case 0 (pipelined): next turn's submitter sends their number early ---
+    if turn == hol_current_turn_index + 1:
+        if player_pid == hol_ahead_prompt_pending():
+            try:
+                hol_presubmitted_guesses[turn] = int(data.get('guess'))
+            except (ValueError, TypeError):
+                print(f"Invalid number submission from submitter {player_name}: {data}")
+                emit_to_player(player_pid, 'message', {'data': 'Invalid guess. Please enter a number.'})
+                return
+            print(f"   [HOL_PIPELINE] {player_name} locked in {hol_presubmitted_guesses[turn]} for turn {turn + 1}.")
+            emit_to_player(player_pid, 'hol_wait_prompt', {'wait_message': "Number locked in for your turn! Waiting..."})
+        return
+    if game_state != "higher_or_lower_ongoing" or turn != hol_current_turn_index: return # Stale prompt
 
     # --- Case 1: The Submitter sends their number guess ---
-    if player_sid == hol_current_submitter_sid and hol_current_turn_stage == 'AWAITING_SUBMISSION':
+    if player_pid == hol_current_submitter_pid and hol_current_turn_stage == 'AWAITING_SUBMISSION':
         try:
             guess = int(data.get('guess'))
-            # Store the guess and advance the turn stage
-            hol_submitter_guess = guess
-            hol_current_turn_stage = 'AWAITING_GUESSES'
-            print(f"   Stage 2: {player_name}'s guess is {guess}. Awaiting H/L from others.")
-
-            # Update Main Screen for Stage 2
-            main_screen_context = {
-                'turn': hol_current_turn_index + 1, 'total_turns': hol_actual_turns_this_round,
-                'question_text': hol_current_question['question'], 'submitter_name': player_name,
-                'submitter_guess': hol_submitter_guess,
-                'players_status': [{'name': p['name']} for sid, p in players.items() if sid != hol_current_submitter_sid]
-            }
-            update_main_screen_html('#round-content-area', '_hol_guesser_turn_display.html', main_screen_context)
-
-            # Prompt all OTHER players to guess Higher or Lower
-            for sid in players:
-                if sid != hol_current_submitter_sid:
-                    socketio.emit('hol_guesser_prompt', {}, room=sid)
-            # Tell the submitter to wait now
-            socketio.emit('hol_wait_prompt', {'wait_message': "Waiting for others to guess Higher or Lower..."}, room=player_sid)
-
         except (ValueError, TypeError):
             print(f"Invalid number submission from submitter {player_name}: {data}")
-            emit('message', {'data': 'Invalid guess. Please enter a number.'}, room=player_sid)
+            emit_to_player(player_pid, 'message', {'data': 'Invalid guess. Please enter a number.'})
+            return
+        begin_hol_guessing_stage(guess)
 
     # --- Case 2: A Guesser sends their "Higher" or "Lower" choice ---
-    elif player_sid != hol_current_submitter_sid and hol_current_turn_stage == 'AWAITING_GUESSES':
+    elif player_pid != hol_current_submitter_pid and hol_current_turn_stage == 'AWAITING_GUESSES':
+        if not is_current_turn_submission(player_pid, data): return
         guess = data.get('guess') # Expecting 'Higher' or 'Lower'
-        if guess in ['Higher', 'Lower'] and players[player_sid].get('hol_current_guess') is None:
-            players[player_sid]['hol_current_guess'] = guess
+        if guess in ['Higher', 'Lower'] and turn_answer(player_pid) is None:
+            if not set_turn_answer(player_pid, guess): tell_turn_closed(player_pid); return
             print(f"   H/L Guess '{guess}' from {player_name}")
             
             # Update main screen to show this player has guessed
             socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
-            # Tell player to wait
-            emit('hol_wait_prompt', {'wait_message': 'Guess locked in! Waiting for others...'}, room=player_sid)
+            # Tell player to wait (or, pipelined, hand them next turn's question if they submit next)
+            if not prompt_next_hol_submitter_ahead(player_pid):
+                emit_to_player(player_pid, 'hol_wait_prompt', {'wait_message': 'Guess locked in! Waiting for others...'})
 
             if check_all_guesses_received_hol():
                 print("   All H/L guesses received.")
-                socketio.sleep(0.5)
-                process_results_higher_or_lower()
+                close_turn_after(0.5, process_results_higher_or_lower)
         else:
             print(f"Invalid H/L guess or duplicate from {player_name}: {guess}")
 
@@ -2778,6 +3561,7 @@ def process_results_higher_or_lower():
     """Calculates scores for the turn and displays results."""
     global game_state
     if game_state != "higher_or_lower_ongoing": return
+    if not close_turn(): return # Already closed by the quorum, the deadline or a queued call
     game_state = "hol_results_display"
 
     print("--- Processing HOL Turn Results ---")
@@ -2793,18 +3577,18 @@ def process_results_higher_or_lower():
         print("   Submitter guessed EXACTLY! Submitter sweep.")
         submitter_points_this_turn = len(players) - 1
         # We still need to build the results list to show what people guessed.
-        for sid, p_info in players.items():
-            if sid == hol_current_submitter_sid: continue
-            player_guess = p_info.get('hol_current_guess')
+        for pid, p_info in players.items():
+            if pid == hol_current_submitter_pid: continue
+            player_guess = turn_answer(pid)
             # In an exact guess scenario, guessers are always "incorrect".
-            results_list.append({'name': p_info['name'], 'guess': player_guess, 'is_correct': False})
+            results_list.append({'name': p_info.name, 'guess': player_guess, 'is_correct': False})
 
     # Case 2: Standard Higher/Lower logic
     else:
-        for sid, p_info in players.items():
-            if sid == hol_current_submitter_sid: continue
+        for pid, p_info in players.items():
+            if pid == hol_current_submitter_pid: continue
 
-            player_guess = p_info.get('hol_current_guess') # 'Higher' or 'Lower'
+            player_guess = turn_answer(pid) # 'Higher' or 'Lower'
             was_correct = False
             if player_guess == 'Higher' and correct_answer > submitter_guess:
                 was_correct = True
@@ -2812,36 +3596,36 @@ def process_results_higher_or_lower():
                 was_correct = True
 
             if was_correct:
-                p_info['round_score'] += 1
-                print(f"   - {p_info['name']} guessed '{player_guess}' CORRECTLY. +1pt.")
+                p_info.round_score += 1
+                print(f"   - {p_info.name} guessed '{player_guess}' CORRECTLY. +1pt.")
             else:
                 submitter_points_this_turn += 1
-                print(f"   - {p_info['name']} guessed '{player_guess}' INCORRECTLY. Submitter +1pt.")
+                print(f"   - {p_info.name} guessed '{player_guess}' INCORRECTLY. Submitter +1pt.")
             
-            results_list.append({'name': p_info['name'], 'guess': player_guess, 'is_correct': was_correct})
+            results_list.append({'name': p_info.name, 'guess': player_guess, 'is_correct': was_correct})
     
     # Award points to the submitter
-    players[hol_current_submitter_sid]['round_score'] += submitter_points_this_turn
-    print(f"   Submitter {players[hol_current_submitter_sid]['name']} awarded {submitter_points_this_turn} points.")
+    players[hol_current_submitter_pid].round_score += submitter_points_this_turn
+    print(f"   Submitter {players[hol_current_submitter_pid].name} awarded {submitter_points_this_turn} points.")
 
     # Prepare context for the template (this part remains the same)
     results_context = {
         'question_text': hol_current_question['question'],
-        'submitter_name': players[hol_current_submitter_sid]['name'],
+        'submitter_name': players[hol_current_submitter_pid].name,
         'submitter_guess': submitter_guess,
         'correct_answer': correct_answer,
         'guesser_results': sorted(results_list, key=lambda x: x['name']),
         'submitter_points_awarded': submitter_points_this_turn,
-        'final_round_scores': sorted([{'name': p['name'], 'score': p['round_score']} for p in players.values()], key=lambda x: -x['score'])
+        'final_round_scores': sorted([{'name': p.name, 'score': p.round_score} for p in players.values()], key=lambda x: -x['score'])
     }
     update_main_screen_html('#results-area', '_hol_turn_results.html', results_context)
-    socketio.emit('results_on_main_screen', room=PLAYERS_ROOM)
+    ahead_pid = hol_ahead_prompt_pending()
+    if ahead_pid is None: emit_to_players('results_on_main_screen')
+    else: # Don't wipe the next submitter's pipelined prompt
+        for pid in players:
+            if pid != ahead_pid: emit_to_player(pid, 'results_on_main_screen')
 
-    turn_results_display_time = 10
-    socketio.sleep(turn_results_display_time)
-
-    if game_state == "hol_results_display":
-        next_turn_higher_or_lower()
+    hold_display('turn_results', next_turn_higher_or_lower)
 
 def end_round_higher_or_lower():
     """Finalizes the HOL round, awards game points, and transitions."""
@@ -2850,47 +3634,79 @@ def end_round_higher_or_lower():
     print("\n--- Ending Higher or Lower Round ---")
 
     # Higher score is better
-    active_players = [(sid, p.get('round_score', 0)) for sid, p in players.items()]
-    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], players.get(item[0],{}).get('name','')))
-    sorted_sids = [item[0] for item in sorted_by_round]
+    active_players = [(pid, p.round_score) for pid, p in players.items()]
+    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], getattr(players.get(item[0]), 'name', '')))
+    sorted_pids = [item[0] for item in sorted_by_round]
 
-    points_awarded = award_game_points(sorted_sids)
+    points_awarded = award_game_points(sorted_pids)
     emit_game_state_update()
 
-    rankings_this_round = []
-    for rank, sid in enumerate(sorted_sids):
-        if sid in players:
-            rankings_this_round.append({
-                'rank': rank + 1,
-                'name': players[sid]['name'],
-                'round_score': players[sid]['round_score'],
-                'points_awarded': points_awarded.get(sid, 0)
-            })
+    rankings_this_round, rankings_more = round_rankings_view(sorted_pids, points_awarded)
 
-    current_overall_scores_list = [{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)} for sid, p in players.items()]
-    current_overall_scores_list.sort(key=lambda x: x['game_score'], reverse=True)
+    current_overall_scores_list = overall_scores_view(RESULTS_TOP_N) # Already in rank order
 
     summary_context = {
         'round_type': ROUND_DISPLAY_NAMES.get('higher_or_lower', 'Higher or Lower'),
         'rankings': rankings_this_round,
+        'rankings_more': rankings_more,
         'overall_scores': current_overall_scores_list
     }
     update_main_screen_html('#results-area', '_round_summary.html', summary_context)
 
-    socketio.sleep(12)
-    if game_state == "higher_or_lower_results":
-        start_next_game_round()
+    hold_display('round_summary', start_next_game_round)
 
 # === AVERAGERS, ASSEMBLE LOGIC ===
 
 def check_all_guesses_received_aa():
     """Checks if all connected players have submitted a guess for the current AA turn."""
-    if not players: return True
-    return all(p.get('aa_current_guess') is not None for p in players.values())
+    return turn_quorum_reached()
+
+def aa_team_name(team_index):
+    """Themed name for the first teams, generated ones after that."""
+    if team_index < len(AA_TEAM_NAMES): return AA_TEAM_NAMES[team_index]
+    extra_index = team_index - len(AA_TEAM_NAMES)
+    if extra_index < len(AA_EXTRA_TEAM_HEROES): return f"Team {AA_EXTRA_TEAM_HEROES[extra_index]}"
+    return f"Team {team_index + 1}"
+
+def balanced_aa_teams(player_pids, num_teams):
+    """
+    Snake-deals players, best game score first, into num_teams teams (1, 2, ..., n, n, ..., 2, 1, ...),
+    so the strongest players end up with the weakest. O(n log n) for the sort; leftover
+    players are the lowest scorers and join the first teams.
+    """
+    ranked = sorted(player_pids, key=lambda pid: (-overall_game_scores.get(pid, 0), random.random()))
+    teams = [[] for _ in range(num_teams)]
+    for i, pid in enumerate(ranked):
+        lap, pos = divmod(i, num_teams)
+        teams[pos if lap % 2 == 0 else num_teams - 1 - pos].append(pid)
+    return teams
+
+def run_aa_auto_draft():
+    """Forms every team at once from the game scores and goes straight to the reveal."""
+    num_teams = max(1, len(players) // AA_TEAM_SIZE)
+    for members in balanced_aa_teams(list(players), num_teams):
+        aa_teams.append({'name': aa_team_name(len(aa_teams)), 'members': members})
+    print(f"   Auto-draft: {len(players)} players dealt into {num_teams} balanced teams.")
+    reveal_aa_teams()
+
+def reveal_aa_teams():
+    """Shows the finished teams, then starts the gameplay turns."""
+    global aa_round_phase
+    print("--- All teams formed! ---")
+    aa_round_phase = 'gameplay'
+
+    teams_for_display = []
+    for team in aa_teams:
+        member_names = [players[pid].name for pid in team['members'] if pid in players]
+        teams_for_display.append({'name': team['name'], 'members': member_names})
+
+    update_main_screen_html('#round-content-area', '_aa_team_reveal.html', {'teams': teams_for_display})
+
+    hold_display('team_reveal', next_turn_averagers_assemble)
 
 def start_next_team_pick():
     """Manages the team selection draft loop. This is the heart of the selection phase."""
-    global aa_current_picker_sid, aa_round_phase
+    global aa_current_picker_pid
 
     # --- THIS IS THE MODIFIED LOGIC ---
     # The draft is now considered "over" if 2 or fewer players remain.
@@ -2898,13 +3714,13 @@ def start_next_team_pick():
         
         # Case 1: Exactly 2 players left. Form the final team automatically.
         if len(aa_unpicked_players) == 2:
-            player1_sid = aa_unpicked_players[0]
-            player2_sid = aa_unpicked_players[1]
-            player1_name = players[player1_sid]['name']
-            player2_name = players[player2_sid]['name']
+            player1_pid = aa_unpicked_players[0]
+            player2_pid = aa_unpicked_players[1]
+            player1_name = players[player1_pid].name
+            player2_name = players[player2_pid].name
             
-            team_name = AA_TEAM_NAMES[len(aa_teams)] if len(aa_teams) < len(AA_TEAM_NAMES) else f"Team {len(aa_teams) + 1}"
-            new_team = {'name': team_name, 'members': [player1_sid, player2_sid]}
+            team_name = aa_team_name(len(aa_teams))
+            new_team = {'name': team_name, 'members': [player1_pid, player2_pid]}
             aa_teams.append(new_team)
             aa_unpicked_players.clear() # Both players are now picked
             
@@ -2912,51 +3728,38 @@ def start_next_team_pick():
 
         # Case 2: Exactly 1 player left (odd number of total players).
         elif len(aa_unpicked_players) == 1 and aa_teams:
-            odd_player_out_sid = aa_unpicked_players.pop(0)
-            aa_teams[0]['members'].append(odd_player_out_sid)
-            print(f"   Draft complete. {players[odd_player_out_sid]['name']} added to {aa_teams[0]['name']}.")
-        
-        # Now, proceed to the team reveal and gameplay phase.
-        print("--- All teams formed! ---")
-        aa_round_phase = 'gameplay'
-        
-        teams_for_display = []
-        for team in aa_teams:
-            member_names = [players[sid]['name'] for sid in team['members'] if sid in players]
-            teams_for_display.append({'name': team['name'], 'members': member_names})
-
-        update_main_screen_html('#round-content-area', '_aa_team_reveal.html', {'teams': teams_for_display})
+            odd_player_out_pid = aa_unpicked_players.pop(0)
+            aa_teams[0]['members'].append(odd_player_out_pid)
+            print(f"   Draft complete. {players[odd_player_out_pid].name} added to {aa_teams[0]['name']}.")
         
-        socketio.sleep(get_round_timing('team_reveal'))
-        if game_state == "averagers_assemble_ongoing":
-             next_turn_averagers_assemble()
+        reveal_aa_teams()
         return
 
-    # --- THIS PART REMAINS THE SAME ---
     # Draft continues: Identify the next picker if more than 2 players are left.
-    aa_current_picker_sid = aa_unpicked_players[0]
-    picker_name = players[aa_current_picker_sid]['name']
+    aa_current_picker_pid = aa_unpicked_players[0]
+    picker_name = players[aa_current_picker_pid].name
     
     choosable_players = []
-    for sid in aa_unpicked_players[1:]:
-        if sid in players:
-            choosable_players.append({'sid': sid, 'name': players[sid]['name']})
+    for pid in aa_unpicked_players[1:]:
+        if pid in players:
+            choosable_players.append({'pid': pid, 'name': players[pid].name})
 
     print(f"   Next picker is {picker_name}. They can choose from {len(choosable_players)} players.")
     
     # Prepare a display-friendly version of the teams so far
     teams_so_far_display = []
     for team in aa_teams:
-        member_names = [players[sid]['name'] for sid in team['members'] if sid in players]
+        member_names = [players[pid].name for pid in team['members'] if pid in players]
         teams_so_far_display.append({'name': team['name'], 'members': member_names})
     main_screen_context = {'picker_name': picker_name, 'teams_so_far': teams_so_far_display}
     update_main_screen_html('#round-content-area', '_aa_picking_turn.html', main_screen_context)
 
-    socketio.emit('aa_pick_teammate_prompt', {'players_to_choose_from': choosable_players}, room=aa_current_picker_sid)
+    emit_to_player(aa_current_picker_pid, 'aa_pick_teammate_prompt', {'players_to_choose_from': choosable_players})
     
-    for sid in players:
-        if sid != aa_current_picker_sid:
-            socketio.emit('aa_wait_prompt', {'wait_message': f"Waiting for {picker_name} to pick a teammate..."}, room=sid)
+    for pid in players:
+        if pid != aa_current_picker_pid:
+            emit_to_player(pid, 'aa_wait_prompt', {'wait_message': f"Waiting for {picker_name} to pick a teammate..."})
+    reevaluate_turn_quorum() # The picker may have dropped out already
 
 def setup_averagers_assemble_round():
     """Sets up the entire 'Averagers, Assemble' round."""
@@ -2981,12 +3784,11 @@ def setup_averagers_assemble_round():
     aa_teams = []
     aa_unpicked_players = []
     aa_current_turn_index = -1
-    for sid in players:
-        players[sid]['round_score'] = 0
-        players[sid]['aa_current_guess'] = None
+    for pid in players:
+        players[pid].round_score = 0
     
     aa_actual_turns_this_round = min(aa_target_turns, len(aa_questions))
-    aa_shuffled_questions_this_round = random.sample(aa_questions, aa_actual_turns_this_round)
+    aa_shuffled_questions_this_round = take_planned_questions('averagers_assemble', aa_questions, aa_actual_turns_this_round)
 
     # --- Handle Team Selection vs. Individual Play ---
     if num_players <= 3:
@@ -2994,12 +3796,16 @@ def setup_averagers_assemble_round():
         print("   2-3 players detected. Playing as individuals.")
         aa_round_phase = 'gameplay'
         # Create a "team" for each player
-        for i, sid in enumerate(players):
-            team_name = players[sid]['name'] # Team name is just the player's name
-            aa_teams.append({'name': team_name, 'members': [sid]})
+        for i, pid in enumerate(players):
+            team_name = players[pid].name # Team name is just the player's name
+            aa_teams.append({'name': team_name, 'members': [pid]})
+        emit_game_state_update()
+        continue_after(0.5, next_turn_averagers_assemble) # Go straight to gameplay
+    elif AA_AUTO_DRAFT:
+        print(f"   {num_players} players detected. Auto-drafting teams.")
+        aa_round_phase = 'selection'
         emit_game_state_update()
-        socketio.sleep(0.5)
-        next_turn_averagers_assemble() # Go straight to gameplay
+        continue_after(0.5, run_aa_auto_draft)
     else:
         # Team play selection phase
         print(f"   {num_players} players detected. Starting team selection draft.")
@@ -3007,43 +3813,47 @@ def setup_averagers_assemble_round():
         
         # Sort players by score, lowest first. random() breaks ties.
         sorted_players = sorted(players.items(), key=lambda item: (overall_game_scores.get(item[0], 0), random.random()))
-        aa_unpicked_players = [sid for sid, data in sorted_players]
+        aa_unpicked_players = [pid for pid, data in sorted_players]
 
         emit_game_state_update()
-        socketio.sleep(0.5)
-        start_next_team_pick() # Start the draft
+        continue_after(0.5, start_next_team_pick) # Start the draft
 
 @socketio.on('submit_team_pick')
+@venue_event
 def handle_submit_team_pick(data):
     """Handles a picker choosing their teammate."""
-    picker_sid = request.sid
-    if aa_round_phase != 'selection' or picker_sid != aa_current_picker_sid:
+    picker_pid = current_player_pid()
+    if aa_round_phase != 'selection' or picker_pid != aa_current_picker_pid:
         return # Ignore if not in selection phase or not the current picker
 
-    picked_sid = data.get('picked_sid')
+    picked_pid = data.get('picked_pid')
     
     # --- THIS IS THE CORRECTED VALIDATION ---
-    # It simply checks if the picked SID is valid and currently in the unpicked list.
-    if not picked_sid or picked_sid not in aa_unpicked_players:
-        print(f"WARN: Invalid team pick '{picked_sid}' from {players[picker_sid]['name']}. Not in unpicked list.")
+    # It simply checks if the picked pid is valid and currently in the unpicked list.
+    if not picked_pid or picked_pid not in aa_unpicked_players:
+        print(f"WARN: Invalid team pick '{picked_pid}' from {players[picker_pid].name}. Not in unpicked list.")
         return
 
     # Also, a player cannot pick themselves.
-    if picked_sid == picker_sid:
-        print(f"WARN: Player {players[picker_sid]['name']} tried to pick themselves.")
+    if picked_pid == picker_pid:
+        print(f"WARN: Player {players[picker_pid].name} tried to pick themselves.")
         return
 
+    form_aa_team(picker_pid, picked_pid)
+
+def form_aa_team(picker_pid, picked_pid):
+    """Pairs the picker with their pick and moves the draft on."""
     # Form the new team
     # Use a default name if we run out of themed names
-    team_name = AA_TEAM_NAMES[len(aa_teams)] if len(aa_teams) < len(AA_TEAM_NAMES) else f"Team {len(aa_teams) + 1}"
-    new_team = {'name': team_name, 'members': [picker_sid, picked_sid]}
+    team_name = aa_team_name(len(aa_teams))
+    new_team = {'name': team_name, 'members': [picker_pid, picked_pid]}
     aa_teams.append(new_team)
     
-    print(f"   Team formed: {team_name} is {players[picker_sid]['name']} and {players[picked_sid]['name']}.")
+    print(f"   Team formed: {team_name} is {players[picker_pid].name} and {players[picked_pid].name}.")
 
     # Remove both players from the unpicked list
-    aa_unpicked_players.remove(picker_sid)
-    aa_unpicked_players.remove(picked_sid)
+    aa_unpicked_players.remove(picker_pid)
+    aa_unpicked_players.remove(picked_pid)
     
     # Continue the draft
     start_next_team_pick()
@@ -3060,8 +3870,7 @@ def next_turn_averagers_assemble():
     game_state = "averagers_assemble_ongoing"
     aa_current_question = aa_shuffled_questions_this_round[aa_current_turn_index]
     
-    for sid in players:
-        players[sid]['aa_current_guess'] = None
+    reset_turn_answers()
     
     print(f"\n-- AA Turn {aa_current_turn_index + 1}/{aa_actual_turns_this_round} --")
     print(f"   Q: {aa_current_question['question']} (Ans: {aa_current_question['answer']})")
@@ -3070,25 +3879,28 @@ def next_turn_averagers_assemble():
     main_screen_context = {
         'turn': aa_current_turn_index + 1, 'total_turns': aa_actual_turns_this_round,
         'question_text': aa_current_question['question'],
-        'players_status': [{'name': p['name']} for p in players.values()]
+        'players_status': [{'name': p.name} for p in players.values()]
     }
     update_main_screen_html('#round-content-area', '_aa_turn_display.html', main_screen_context)
     
     # Prompt ALL players for a number guess
-    socketio.emit('aa_player_prompt', {'question': aa_current_question['question']}, room=PLAYERS_ROOM)
+    emit_to_players('aa_player_prompt', {'question': aa_current_question['question']})
+    start_turn_deadline(process_results_aa)
 
 @socketio.on('submit_aa_guess')
+@venue_event
 def handle_submit_aa_guess(data):
     """Handles a player submitting their individual number guess."""
-    player_sid = request.sid
-    if player_sid not in players or game_state != "averagers_assemble_ongoing" or aa_round_phase != 'gameplay':
+    player_pid = current_player_pid()
+    if player_pid not in players or game_state != "averagers_assemble_ongoing" or aa_round_phase != 'gameplay':
         return
+    if not is_current_turn_submission(player_pid, data): return
         
     try:
         guess = int(data.get('guess'))
-        if players[player_sid].get('aa_current_guess') is None:
-            players[player_sid]['aa_current_guess'] = guess
-            player_name = players[player_sid]['name']
+        if turn_answer(player_pid) is None:
+            if not set_turn_answer(player_pid, guess): tell_turn_closed(player_pid); return
+            player_name = players[player_pid].name
             print(f"AA Guess {guess} from {player_name}")
             
             socketio.emit('player_submitted_update', {'name': player_name}, room=main_screen_sid)
@@ -3096,15 +3908,15 @@ def handle_submit_aa_guess(data):
             
             if check_all_guesses_received_aa():
                 print("   All AA guesses received.")
-                socketio.sleep(0.5)
-                process_results_aa()
+                close_turn_after(0.5, process_results_aa)
     except (ValueError, TypeError):
-        print(f"Invalid AA guess from {players[player_sid]['name']}: {data}")
+        print(f"Invalid AA guess from {players[player_pid].name}: {data}")
 
 def process_results_aa():
     """Calculates team averages and awards points for the turn."""
     global game_state
     if game_state != "averagers_assemble_ongoing" or aa_round_phase != 'gameplay': return
+    if not close_turn(): return # Already closed by the quorum, the deadline or a queued call
     game_state = "aa_results_display"
     
     print("--- Processing AA Turn Results ---")
@@ -3116,9 +3928,9 @@ def process_results_aa():
         total_guess = 0
         num_guesses = 0
         member_guesses = {}
-        for member_sid in team['members']:
-            guess = players[member_sid].get('aa_current_guess')
-            member_guesses[players[member_sid]['name']] = guess if guess is not None else "N/A"
+        for member_pid in team['members']:
+            guess = turn_answer(member_pid)
+            member_guesses[players[member_pid].name] = guess if guess is not None else "N/A"
             if guess is not None:
                 total_guess += guess
                 num_guesses += 1
@@ -3139,15 +3951,15 @@ def process_results_aa():
         if team_result['diff'] == min_diff:
             print(f"   Winning Team: {team_result['name']} (Diff: {min_diff})")
             team_result['points_this_turn'] = 1 # Mark points for this turn
-            for member_sid in team_result['members']:
-                players[member_sid]['round_score'] += 1
+            for member_pid in team_result['members']:
+                players[member_pid].round_score += 1
     
     # --- Step 3: Calculate final round scores for each team ---
     # This loop runs AFTER points are awarded to get the new total.
     for team_result in team_averages:
         # The score for a team is the score of its first member (since they're all the same).
-        first_member_sid = team_result['members'][0]
-        team_result['total_round_score'] = players[first_member_sid]['round_score']
+        first_member_pid = team_result['members'][0]
+        team_result['total_round_score'] = players[first_member_pid].round_score
 
     # --- Step 4: Prepare context for template ---
     results_context = {
@@ -3158,9 +3970,7 @@ def process_results_aa():
     }
     update_main_screen_html('#results-area', '_aa_turn_results.html', results_context)
     
-    socketio.sleep(get_round_timing('turn_results'))
-    if game_state == "aa_results_display":
-        next_turn_averagers_assemble()
+    hold_display('turn_results', next_turn_averagers_assemble)
 
 def end_round_averagers_assemble():
     """Finalizes the AA round, awards game points, and transitions."""
@@ -3168,72 +3978,67 @@ def end_round_averagers_assemble():
     game_state = "averagers_assemble_results"
     print("\n--- Ending Averagers, Assemble Round ---")
 
-    active_players = [(sid, p.get('round_score', 0)) for sid, p in players.items()]
-    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], players.get(item[0],{}).get('name','')))
-    sorted_sids = [item[0] for item in sorted_by_round]
+    active_players = [(pid, p.round_score) for pid, p in players.items()]
+    sorted_by_round = sorted(active_players, key=lambda item: (-item[1], getattr(players.get(item[0]), 'name', '')))
+    sorted_pids = [item[0] for item in sorted_by_round]
     
-    points_awarded = award_game_points(sorted_sids)
+    points_awarded = award_game_points(sorted_pids)
     emit_game_state_update()
 
-    rankings_this_round = []
-    for rank, sid in enumerate(sorted_sids):
-        if sid in players:
-            rankings_this_round.append({
-                'rank': rank + 1,
-                'name': players[sid]['name'],
-                'round_score': players[sid]['round_score'],
-                'points_awarded': points_awarded.get(sid, 0)
-            })
+    rankings_this_round, rankings_more = round_rankings_view(sorted_pids, points_awarded)
             
-    current_overall_scores_list = [{'name': p['name'], 'game_score': overall_game_scores.get(sid, 0)} for sid, p in players.items()]
-    current_overall_scores_list.sort(key=lambda x: x['game_score'], reverse=True)
+    current_overall_scores_list = overall_scores_view(RESULTS_TOP_N) # Already in rank order
 
     summary_context = {
         'round_type': ROUND_DISPLAY_NAMES.get('averagers_assemble', 'Averagers, Assemble!'),
         'rankings': rankings_this_round,
+        'rankings_more': rankings_more,
         'overall_scores': current_overall_scores_list
     }
     update_main_screen_html('#results-area', '_round_summary.html', summary_context)
 
-    socketio.sleep(12)
-    if game_state == "averagers_assemble_results":
-        start_next_game_round()
+    hold_display('round_summary', start_next_game_round)
+
+
+# === PRESENCE QUORUM RE-EVALUATION ===
+# Presence changes (a disconnect, a grace window running out) all come through here, so every
+# round type closes its turn the same way once the remaining players have answered.
+TURN_QUORUM_CLOSERS = { # game_state -> (quorum check, results function)
+    'guess_age_ongoing': (check_all_guesses_received_gta, process_guess_age_turn_results),
+    'guess_the_year_ongoing': (check_all_guesses_received_gty, process_guess_the_year_turn_results),
+    'who_didnt_do_it_ongoing': (check_all_guesses_received_wddi, process_who_didnt_do_it_turn_results),
+    'order_up_ongoing': (check_all_submissions_received_ou, process_order_up_turn_results),
+    'quick_pairs_ongoing': (check_all_submissions_received_qp, process_quick_pairs_turn_results),
+    'true_or_false_ongoing': (check_all_guesses_received_tf, process_true_or_false_turn_results),
+    'tap_the_pic_ongoing': (check_all_guesses_received_ttp, process_tap_the_pic_turn_results),
+    'the_top_three_ongoing': (check_all_submissions_received_ttt, process_the_top_three_turn_results),
+    'higher_or_lower_ongoing': (lambda: hol_current_turn_stage == 'AWAITING_GUESSES' and check_all_guesses_received_hol(), process_results_higher_or_lower),
+    'averagers_assemble_ongoing': (lambda: aa_round_phase == 'gameplay' and check_all_guesses_received_aa(), process_results_aa),
+}
+
+def reevaluate_turn_quorum():
+    """Closes the current turn if everyone still present has answered."""
+    if (game_state == 'averagers_assemble_ongoing' and aa_round_phase == 'selection'
+            and aa_current_picker_pid in aa_unpicked_players and not is_present(players[aa_current_picker_pid])):
+        print(f"   {players[aa_current_picker_pid].name} is away, pairing them with the next player in the draft.")
+        form_aa_team(aa_current_picker_pid, aa_unpicked_players[1]); return
+    if not turn_open: return
+    if (game_state == 'higher_or_lower_ongoing' and hol_current_turn_stage == 'AWAITING_SUBMISSION'
+            and hol_current_submitter_pid in players and not is_present(players[hol_current_submitter_pid])):
+        skip_hol_submission(); return # Nobody can guess without the submitter's number
+    closer = TURN_QUORUM_CLOSERS.get(game_state)
+    if closer and closer[0]():
+        print(f"[QUORUM] All {len(quorum_pids())} present players answered in {game_state}, closing the turn")
+        closer[1]()
+
+def reevaluate_quorum_after_grace():
+    """Runs once the grace window of a disconnect is over (harmless if they came back)."""
+    socketio.sleep(PRESENCE_GRACE_SECONDS + 0.1)
+    venue_call(reevaluate_turn_quorum)
 
 
 # === MAIN EXECUTION ===
 if __name__ == '__main__':
     print("Loading round data...");
-    load_guess_the_age_data()
-    load_guess_the_year_data()
-    load_who_didnt_do_it_data()
-    load_order_up_data()
-    load_quick_pairs_data()
-    load_true_or_false_data()
-    load_tap_the_pic_data()
-    load_top_three_data()
-    load_higher_or_lower_data()
-    load_averagers_assemble_data()
-
-    hostname = socket.gethostname()
-    try:
-        # This is a reliable way to get the local IP on a network
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        local_ip = s.getsockname()[0]
-        s.close()
-    except Exception:
-        local_ip = '127.0.0.1' # Fallback if unable to connect
-    
-    port = 5000
-    print("\n" + "*"*50)
-    print("*" + " "*48 + "*")
-    print(f"*  Handley's Fun Factory is running! {' '*10}*")
-    print("*" + " "*48 + "*")
-    print(f"*  Connect player devices to: {' '*14}*")
-    print(f"*  http://{local_ip}:{port} {' '*(27-len(local_ip)-len(str(port)))}*")
-    print("*" + " "*48 + "*")
-    print("*"*50 + "\n")
-
-    print("Starting Flask-SocketIO server..."); use_debug = False
-    socketio.run(app, host='0.0.0.0', port=5000, debug=use_debug)
-    print("Server stopped.")
\ No newline at end of file
+    local_ip = run_startup()
+    serve(local_ip)
\ No newline at end of file
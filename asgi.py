@@ -0,0 +1,98 @@
+import os
+import sys
+import asyncio
+import threading
+import time
+import traceback
+
+# The game engine stays as it is (blocking flows on OS threads, in app.py's threading mode) and
+# only the transport moves to asyncio: python-socketio's AsyncServer under an ASGI server.
+# Same event names and payloads, so index.html and main_screen.html don't change.
+# Run with:  python asgi.py   (or: uvicorn asgi:asgi_app --ws wsproto --port 5000)
+os.environ['HFF_ASYNC_MODE'] = 'threading'
+MESSAGE_QUEUE = os.environ.pop('HFF_MESSAGE_QUEUE', None) # app.py must not build its own (threading) manager for it
+
+import socketio as python_socketio
+import app as game_server
+
+try:
+    from uvicorn.middleware.wsgi import WSGIMiddleware
+except ImportError:
+    WSGIMiddleware = None # Only needed to serve; reported in __main__
+
+class EngineBridge:
+    """
+    Takes the place of the engine's python-socketio Server (game_server.socketio.server).
+    Inbound events run the engine's existing handlers on the event loop; they only queue work for
+    the venue actor, or bump a counter, so they never block it. Outbound calls from engine threads
+    (emit, enter_room, leave_room) go through one pump task, so they reach clients in the order made.
+    """
+
+    def __init__(self, async_server, engine_server):
+        self.async_server = async_server
+        self.manager = async_server.manager # is_connected() is a plain dict lookup, safe from any thread
+        self.loop = None; self.pump = None; self.loop_thread_id = None
+        for namespace, handlers in engine_server.handlers.items():
+            for event, handler in handlers.items(): self.register(event, handler, namespace)
+
+    def register(self, event, handler, namespace):
+        if event == 'connect':
+            async def on_connect(sid, environ, auth=None):
+                environ['flask.app'] = game_server.app # Flask-SocketIO's middleware normally adds this
+                return handler(sid, environ, auth)
+            self.async_server.on('connect', on_connect, namespace=namespace)
+        else:
+            async def on_event(sid, *args): return handler(sid, *args)
+            self.async_server.on(event, on_event, namespace=namespace)
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop(); self.loop_thread_id = threading.get_ident()
+        self.pump = asyncio.Queue()
+        self.loop.create_task(self.run_pump())
+
+    async def run_pump(self):
+        while True:
+            method, args, kwargs = await self.pump.get()
+            try: await method(*args, **kwargs)
+            except Exception:
+                print(f"ERROR in {method.__name__} from the engine:"); traceback.print_exc()
+
+    def call_on_loop(self, method, *args, **kwargs):
+        if threading.get_ident() == self.loop_thread_id: self.pump.put_nowait((method, args, kwargs))
+        else: self.loop.call_soon_threadsafe(self.pump.put_nowait, (method, args, kwargs))
+
+    # --- The part of python-socketio's Server API the engine (and Flask-SocketIO) uses ---
+    def emit(self, *args, **kwargs): self.call_on_loop(self.async_server.emit, *args, **kwargs)
+    def enter_room(self, *args, **kwargs): self.call_on_loop(self.async_server.enter_room, *args, **kwargs)
+    def leave_room(self, *args, **kwargs): self.call_on_loop(self.async_server.leave_room, *args, **kwargs)
+    def get_environ(self, sid, namespace=None): return self.async_server.get_environ(sid, namespace=namespace)
+    def sleep(self, seconds=0): time.sleep(seconds)
+
+    def start_background_task(self, target, *args, **kwargs):
+        thread = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True)
+        thread.start()
+        return thread
+
+client_manager = python_socketio.AsyncRedisManager(MESSAGE_QUEUE) if MESSAGE_QUEUE and MESSAGE_QUEUE.startswith('redis') else None
+if MESSAGE_QUEUE and not client_manager: print(f"WARN: asgi mode only supports redis:// queues, ignoring {MESSAGE_QUEUE}")
+async_server = python_socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*', client_manager=client_manager)
+bridge = EngineBridge(async_server, game_server.socketio.server)
+game_server.socketio.server = bridge
+
+async def on_startup():
+    if not game_server.VENUE_ACTOR:
+        raise RuntimeError("asgi mode needs the venue actor (HFF_VENUE_ACTOR) so handlers never block the event loop")
+    await bridge.start()
+    local_ip = game_server.run_startup()
+    game_server.socketio.start_background_task(game_server.session_sweeper)
+    print(f"[ASGI] Engine ready on threads; room code {game_server.ROOM_CODE}, connect to http://{local_ip}:{game_server.SERVER_PORT}")
+
+asgi_app = python_socketio.ASGIApp(async_server, other_asgi_app=WSGIMiddleware(game_server.app) if WSGIMiddleware else None,
+                                   on_startup=on_startup)
+
+if __name__ == '__main__':
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit("asgi mode needs an ASGI server: pip install uvicorn")
+    uvicorn.run(asgi_app, host='0.0.0.0', port=game_server.SERVER_PORT, ws='wsproto', log_level='warning')
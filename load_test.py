@@ -0,0 +1,361 @@
+import eventlet
+eventlet.monkey_patch()
+import os
+import sys
+import json
+import random
+import argparse
+import subprocess
+import time
+import urllib.request
+from datetime import datetime
+from urllib.parse import urlparse, parse_qs
+import simple_websocket
+
+# --- Configuration ---
+# Drives whole games against a running server (or router.py) with bot main screens and bot phones,
+# speaking raw Engine.IO 4 / Socket.IO 5 over simple-websocket so no extra client package is needed.
+script_dir = os.path.dirname(os.path.abspath(__file__))
+PROBE_INTERVAL = 0.25 # Seconds between clock_sync round trips per venue (the latency sample)
+
+class BotSocket:
+    """Minimal Socket.IO client: emit, emit-with-ack and an event callback. Pings are answered inline."""
+
+    def __init__(self, base_url, on_event):
+        url = base_url.replace('http://', 'ws://').rstrip('/') + '/socket.io/?EIO=4&transport=websocket'
+        self.ws = simple_websocket.Client.connect(url)
+        # Don't wait for the Engine.IO open packet first: it can arrive in the same read as the
+        # handshake and sit unparsed until the next frame, which is the server's answer to this
+        self.ws.send('40')
+        self.on_event = on_event; self.acks = {}; self.next_ack_id = 0; self.closed = False
+        while not self.ws.receive().startswith('40'): pass
+        self.reader = eventlet.spawn(self._read_loop)
+
+    def emit(self, event, data=None, callback=None):
+        if self.closed: return
+        packet = json.dumps([event] if data is None else [event, data])
+        if callback:
+            self.next_ack_id += 1; self.acks[self.next_ack_id] = callback
+            self._send(f'42{self.next_ack_id}{packet}')
+        else:
+            self._send(f'42{packet}')
+
+    def _send(self, message):
+        try: self.ws.send(message)
+        except simple_websocket.ConnectionClosed: self.closed = True
+
+    def _read_loop(self):
+        try:
+            while not self.closed:
+                message = self.ws.receive()
+                if message is None: break
+                if message == '2': self._send('3')
+                elif message.startswith('42'):
+                    body = message[2:]; event = json.loads(body[body.index('['):])
+                    self.on_event(event[0], event[1] if len(event) > 1 else None)
+                elif message.startswith('43'):
+                    body = message[2:]; split = body.index('[')
+                    callback = self.acks.pop(int(body[:split]), None)
+                    if callback: callback(*json.loads(body[split:]))
+        except Exception:
+            pass
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+        self.reader.kill() # Before the socket goes, so its fd is no longer watched
+        try: self.ws.close()
+        except Exception: pass
+
+def player_answer(event, data):
+    """The (event, payload) a player bot sends back for a prompt, or None if the event needs no answer."""
+    answer = prompt_answer(event, data)
+    if answer and 'turn_id' in data: answer[1]['turn_id'] = data['turn_id'] # Echoed back, as index.html does
+    return answer
+
+def prompt_answer(event, data):
+    if event == 'gta_player_prompt': return 'submit_gta_guess', {'guess': random.randint(20, 80)}
+    if event == 'gty_player_prompt': return 'submit_gty_guess', {'guess': random.randint(1960, 2020)}
+    if event == 'wddi_player_prompt': return 'submit_wddi_guess', {'option_id': random.choice(data['option_ids'])}
+    if event == 'ou_player_prompt': return 'submit_ou_list', {'ordered_ids': random.sample(data['item_ids'], len(data['item_ids']))}
+    if event == 'qp_player_prompt':
+        return 'submit_qp_pairs', {'player_pairs': [list(pair) for pair in zip(data['list_a_ids'], random.sample(data['list_b_ids'], len(data['list_b_ids'])))],
+                                   'time_ms': random.randint(2000, 30000)}
+    if event == 'true_or_false_player_prompt': return 'submit_true_or_false_guess', {'guess': random.choice([True, False])}
+    if event == 'tap_the_pic_player_prompt': return 'submit_ttp_guess', {'guess': random.randint(1, 4)}
+    if event == 'top_three_player_prompt': return 'submit_top_three_guess', {'option_ids': random.sample(data['option_ids'], 3)}
+    if event == 'hol_submitter_prompt': return 'submit_hol_guess', {'guess': random.randint(1, 100), 'turn': data.get('turn')}
+    if event == 'hol_guesser_prompt': return 'submit_hol_guess', {'guess': random.choice(['Higher', 'Lower'])}
+    if event == 'aa_pick_teammate_prompt': return 'submit_team_pick', {'picked_pid': random.choice(data['players_to_choose_from'])['pid']}
+    if event == 'aa_player_prompt': return 'submit_aa_guess', {'guess': random.randint(1, 50)}
+    return None
+
+class Venue:
+    """One main screen plus its phones, playing games back to back until stop()."""
+
+    def __init__(self, server_url, num_players, label):
+        self.server_url = server_url; self.num_players = num_players; self.label = label
+        self.games_done = 0; self.latencies_ms = []; self.running = True; self.sockets = []
+        self.submitted_at = {} # {player name: perf_counter of their latest submission}
+        self.ack_ms = [] # Submission -> the main screen's player_submitted_update for that player
+        self.results_ms = [] # Last acknowledged submission -> the next fragment (the turn's results)
+        self.last_ack_at = None
+
+    def resolve(self, path):
+        """Follows the router's redirect and returns the final URL (or the server URL itself without a router)."""
+        with urllib.request.urlopen(self.server_url.rstrip('/') + path, timeout=10) as response: return response.geturl()
+
+    def run(self):
+        main_url = self.resolve('/main')
+        worker_url = f"{urlparse(main_url).scheme}://{urlparse(main_url).netloc}"
+        join_url = parse_qs(urlparse(main_url).query).get('join', [worker_url])[0]
+        player_url = self.resolve(urlparse(join_url).path) if urlparse(join_url).path not in ('', '/') else worker_url
+        player_url = f"{urlparse(player_url).scheme}://{urlparse(player_url).netloc}"
+
+        main = BotSocket(worker_url, self.on_main_event); self.main = main; self.sockets.append(main)
+        main.emit('register_main_screen')
+        for index in range(self.num_players):
+            holder = {}
+            name = f'{self.label}-{index}'
+            player = BotSocket(player_url, lambda event, data, holder=holder, name=name: self.on_player_event(holder['socket'], name, event, data))
+            holder['socket'] = player; self.sockets.append(player)
+            player.emit('register_player', {'name': name, 'pid': f'{self.label}-pid-{index}'})
+        eventlet.spawn(self.probe_loop)
+        eventlet.sleep(0.5)
+        main.emit('start_game_request')
+
+    def probe_loop(self):
+        while self.running and not self.main.closed:
+            sent = time.perf_counter()
+            self.main.emit('clock_sync', {'client_ts': time.time() * 1000},
+                           callback=lambda _reply, sent=sent: self.latencies_ms.append((time.perf_counter() - sent) * 1000))
+            eventlet.sleep(PROBE_INTERVAL)
+
+    def on_main_event(self, event, data):
+        if event == 'game_state_update': self.main.emit('game_state_ack', {'version': data['version']})
+        elif event == 'player_submitted_update':
+            submitted_at = self.submitted_at.pop(data['name'], None)
+            if submitted_at: self.last_ack_at = time.perf_counter(); self.ack_ms.append((self.last_ack_at - submitted_at) * 1000)
+        elif event == 'update_html':
+            if self.last_ack_at: self.results_ms.append((time.perf_counter() - self.last_ack_at) * 1000); self.last_ack_at = None
+            self.main.emit('display_ready', {'display_id': data['display_id']})
+            self.main.emit('display_done', {'display_id': data['display_id']})
+        elif event == 'cue_timeline':
+            if data['name'] == 'game_over':
+                self.games_done += 1
+                if self.running: eventlet.spawn_after(0.5, self.restart)
+            else:
+                self.main.emit('cue_timeline_skip', {'timeline_id': data['timeline_id']})
+
+    def restart(self):
+        self.main.emit('request_reset_game')
+        eventlet.sleep(0.5)
+        self.main.emit('start_game_request')
+
+    def on_player_event(self, player, name, event, data):
+        answer = player_answer(event, data or {})
+        if answer: eventlet.spawn_after(random.uniform(0.05, 0.3), self.submit, player, name, *answer)
+
+    def submit(self, player, name, event, payload):
+        self.submitted_at[name] = time.perf_counter()
+        player.emit(event, payload)
+
+    def stop(self):
+        self.running = False
+        for bot_socket in self.sockets: bot_socket.close()
+
+def percentile(samples, fraction):
+    if not samples: return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def run_venues(server_url, venues, num_players, seconds):
+    """Plays `venues` concurrent venues for `seconds` and returns their games and latency percentiles (ms)."""
+    running = [Venue(server_url, num_players, f'V{index}') for index in range(venues)]
+    for venue in running: eventlet.spawn(venue.run); eventlet.sleep(0.2)
+    eventlet.sleep(seconds)
+    for venue in running: venue.stop()
+    stats = {'games': sum(venue.games_done for venue in running)}
+    for key, attribute in (('clock_sync', 'latencies_ms'), ('submit_ack', 'ack_ms'), ('results', 'results_ms')):
+        samples = [ms for venue in running for ms in getattr(venue, attribute)]
+        stats[f'{key}_p50_ms'] = round(percentile(samples, 0.5), 2); stats[f'{key}_p99_ms'] = round(percentile(samples, 0.99), 2)
+        stats[f'{key}_samples'] = len(samples)
+    return stats
+
+def probe_latency(bot_socket, samples=40):
+    """clock_sync round trips on one socket, back to back. Returns (p50_ms, p99_ms, lost)."""
+    latencies = []
+    for _ in range(samples):
+        done = eventlet.Event(); sent = time.perf_counter()
+        bot_socket.emit('clock_sync', {'client_ts': time.time() * 1000}, callback=lambda _reply: done.send(time.perf_counter()))
+        done.wait(timeout=2)
+        if done.ready(): latencies.append((done.wait() - sent) * 1000)
+    return percentile(latencies, 0.5), percentile(latencies, 0.99), samples - len(latencies)
+
+def capacity(server_url, max_connections, step, quiet=False):
+    """
+    Opens idle Socket.IO connections in steps of `step` (as phones sitting in a lobby would) and
+    measures connect time and clock_sync latency at each level, until max_connections or failure.
+    Returns the last level where every connection opened and no probe was lost.
+    """
+    if not quiet: print(f"{'connections':>12} {'connect ms':>11} {'p50 ms':>8} {'p99 ms':>8} {'lost':>5}")
+    probe = BotSocket(server_url, lambda event, data: None); idle = []
+    held = {'connections': 1, 'p50_ms': None, 'p99_ms': None}
+    try:
+        while len(idle) < max_connections:
+            started = time.perf_counter()
+            pool = eventlet.GreenPool(50)
+            opened = [bot for bot in pool.imap(lambda _: open_idle(server_url), range(step)) if bot]
+            idle.extend(opened); connect_ms = (time.perf_counter() - started) * 1000 / max(1, len(opened))
+            p50, p99, lost = probe_latency(probe)
+            if not quiet: print(f"{len(idle):>12} {connect_ms:>11.1f} {p50:>8.1f} {p99:>8.1f} {lost:>5}")
+            if len(opened) < step or lost:
+                if not quiet: print(f"Stopped: {step - len(opened)} connections failed, {lost} probes lost")
+                break
+            held = {'connections': len(idle) + 1, 'p50_ms': round(p50, 2), 'p99_ms': round(p99, 2)} # + the probe
+    finally:
+        for bot in idle + [probe]: bot.close()
+    return held
+
+def open_idle(server_url, timeout=10):
+    """One idle connection, or None if the server refused it or didn't answer in time (e.g. at eventlet.wsgi's max_size)."""
+    with eventlet.Timeout(timeout, False):
+        try: return BotSocket(server_url, lambda event, data: None)
+        except Exception: return None
+    return None
+
+def wait_for_router(url, timeout=180):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url + '/rooms', timeout=2) as response:
+                rooms = json.loads(response.read())
+                if rooms and all(room.get('ready') for room in rooms.values()): return True
+        except Exception: pass
+        eventlet.sleep(0.5)
+    return False
+
+def bench(max_workers, num_players, seconds, timing_scale, message_queue):
+    """
+    Runs router.py with 1..max_workers workers, one venue per worker, and prints games/min per step.
+    Each step's bots run in a fresh child process (--json), so this one only ever manages subprocesses.
+    """
+    print(f"{'workers':>8} {'venues':>7} {'games':>6} {'games/min':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for workers in range(1, max_workers + 1):
+        env = dict(os.environ, HFF_WORKERS=str(workers), HFF_TIMING_SCALE=str(timing_scale), HFF_ROUTER_QUIET='1')
+        if message_queue: env['HFF_MESSAGE_QUEUE'] = message_queue
+        router = subprocess.Popen([sys.executable, os.path.join(script_dir, 'router.py')], cwd=script_dir, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            url = f"http://127.0.0.1:{env.get('HFF_ROUTER_PORT', '8000')}"
+            if not wait_for_router(url): print(f"{workers:>8} router did not come up"); continue
+            load = subprocess.run([sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--url', url, '--venues', str(workers),
+                                   '--players', str(num_players), '--seconds', str(seconds), '--json'], capture_output=True, text=True)
+            stats = json.loads(load.stdout.strip().splitlines()[-1])
+            print(f"{workers:>8} {workers:>7} {stats['games']:>6} {stats['games'] * 60 / seconds:>10.1f} "
+                  f"{stats['clock_sync_p50_ms']:>8.1f} {stats['clock_sync_p99_ms']:>8.1f}")
+        finally:
+            router.terminate(); router.wait(timeout=20)
+
+# --- Backend comparison ---
+# The same scripted games (seeded bots, seeded server) through each concurrency mode, one server
+# process at a time. CPU and RSS are read from /proc, so those columns need Linux.
+BACKEND_COMMANDS = {
+    'eventlet': (['app.py'], {'HFF_ASYNC_MODE': 'eventlet'}),
+    'threading': (['app.py'], {'HFF_ASYNC_MODE': 'threading'}),
+    'asyncio': (['asgi.py'], {}),
+}
+
+def process_usage(pid):
+    """(cpu_seconds, rss_mb, peak_rss_mb) of a process from /proc, or Nones where unavailable."""
+    try:
+        with open(f'/proc/{pid}/stat') as stat: fields = stat.read().rsplit(')', 1)[1].split()
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK') # utime + stime
+        with open(f'/proc/{pid}/status') as status:
+            memory = {line.split(':')[0]: int(line.split()[1]) for line in status if line.startswith(('VmRSS', 'VmHWM'))}
+        return cpu_seconds, round(memory['VmRSS'] / 1024, 1), round(memory['VmHWM'] / 1024, 1)
+    except (OSError, KeyError, IndexError, ValueError):
+        return None, None, None
+
+def wait_for_ready(url, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url + '/ready', timeout=2): return True
+        except Exception: eventlet.sleep(0.2)
+    return False
+
+def run_child(*arguments):
+    """Runs this script with --json in a fresh process (bots never share a hub with the orchestrator) and returns its result."""
+    output = subprocess.run([sys.executable, '-W', 'ignore', os.path.abspath(__file__), *map(str, arguments), '--json'],
+                            capture_output=True, text=True).stdout.strip().splitlines()
+    return json.loads(output[-1]) if output else None
+
+def compare(modes, num_players, seconds, max_connections, step, timing_scale, seed, port, out_path):
+    """Benchmarks each mode in turn and writes one comparable record per mode to out_path (JSON)."""
+    results = []
+    for mode in modes:
+        script, mode_env = BACKEND_COMMANDS[mode]
+        env = dict(os.environ, HFF_PORT=str(port), HFF_TIMING_SCALE=str(timing_scale), HFF_RANDOM_SEED=str(seed), **mode_env)
+        env.pop('HFF_MESSAGE_QUEUE', None)
+        server = subprocess.Popen([sys.executable, '-W', 'ignore', *script], cwd=script_dir, env=env,
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        url = f'http://127.0.0.1:{port}'
+        try:
+            if not wait_for_ready(url): print(f"{mode}: server did not come up"); continue
+            cpu_before, _, _ = process_usage(server.pid)
+            games = run_child('--url', url, '--players', num_players, '--seconds', seconds, '--seed', seed)
+            cpu_after, rss_mb, _ = process_usage(server.pid)
+            held = run_child('--url', url, '--capacity', max_connections, '--step', step)
+            _, _, peak_rss_mb = process_usage(server.pid)
+            record = {'mode': mode, 'players': num_players, 'seconds': seconds, 'timing_scale': timing_scale, 'seed': seed,
+                      **(games or {}), 'connections_per_process': (held or {}).get('connections'),
+                      'capacity_probe_p99_ms': (held or {}).get('p99_ms'), 'rss_mb': rss_mb, 'peak_rss_mb': peak_rss_mb,
+                      'cpu_ms_per_game_minute': round((cpu_after - cpu_before) * 1000 / (seconds / 60), 1) if cpu_before is not None else None}
+            results.append(record)
+            print(f"{mode}: {record}")
+        finally:
+            server.terminate(); server.wait(timeout=20)
+    report = {'generated_at': datetime.now().isoformat(timespec='seconds'), 'python': sys.version.split()[0],
+              'cpus': os.cpu_count(), 'max_connections_tried': max_connections, 'results': results}
+    with open(out_path, 'w') as out: json.dump(report, out, indent=2)
+    columns = [('mode', 10), ('games', 6), ('submit_ack_p50_ms', 8), ('submit_ack_p99_ms', 8), ('results_p50_ms', 8), ('results_p99_ms', 8),
+               ('cpu_ms_per_game_minute', 10), ('rss_mb', 7), ('peak_rss_mb', 8), ('connections_per_process', 8)]
+    headers = ['mode', 'games', 'ack p50', 'ack p99', 'res p50', 'res p99', 'cpu ms/gm', 'rss MB', 'peak MB', 'conns']
+    print(' '.join(f"{header:>{width}}" for header, (_, width) in zip(headers, columns)))
+    for record in results: print(' '.join(f"{str(record.get(key)):>{width}}" for key, width in columns))
+    print(f"Written to {out_path}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Bot main screens and phones playing full games.")
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help="app.py or router.py to drive")
+    parser.add_argument('--venues', type=int, default=1)
+    parser.add_argument('--players', type=int, default=6)
+    parser.add_argument('--seconds', type=float, default=60)
+    parser.add_argument('--bench', type=int, metavar='MAX_WORKERS', help="Start router.py with 1..MAX_WORKERS workers and report scaling")
+    parser.add_argument('--timing-scale', type=float, default=0.05, help="HFF_TIMING_SCALE for --bench workers")
+    parser.add_argument('--message-queue', help="HFF_MESSAGE_QUEUE for --bench workers")
+    parser.add_argument('--json', action='store_true', help="Print the result as one JSON line only")
+    parser.add_argument('--capacity', type=int, metavar='MAX_CONNECTIONS', help="Open idle connections up to this many and report latency per step")
+    parser.add_argument('--step', type=int, default=250, help="Connections added per --capacity step")
+    parser.add_argument('--compare', nargs='*', choices=sorted(BACKEND_COMMANDS), metavar='MODE',
+                        help=f"Benchmark these async modes (default: all of {', '.join(BACKEND_COMMANDS)}) and write --out")
+    parser.add_argument('--out', default='backend_comparison.json', help="Where --compare writes its results")
+    parser.add_argument('--port', type=int, default=5900, help="Port for --compare servers")
+    parser.add_argument('--seed', type=int, default=1, help="Seeds the bots (and, with --compare, the server) so runs repeat")
+    args = parser.parse_args()
+    random.seed(args.seed)
+    if args.compare is not None:
+        compare(args.compare or list(BACKEND_COMMANDS), args.players, args.seconds, args.capacity or 2000, args.step,
+                args.timing_scale, args.seed, args.port, args.out)
+    elif args.bench: bench(args.bench, args.players, args.seconds, args.timing_scale, args.message_queue)
+    elif args.capacity:
+        held = capacity(args.url, args.capacity, args.step, quiet=args.json)
+        if args.json: print(json.dumps(held))
+    else:
+        stats = run_venues(args.url, args.venues, args.players, args.seconds)
+        if args.json: print(json.dumps(stats)); sys.exit(0)
+        print(f"{args.venues} venues, {stats['games']} games in {args.seconds:.0f}s ({stats['games'] * 60 / args.seconds:.1f}/min), "
+              f"clock_sync p50 {stats['clock_sync_p50_ms']:.1f}ms p99 {stats['clock_sync_p99_ms']:.1f}ms, "
+              f"submit ack p50 {stats['submit_ack_p50_ms']:.1f}ms p99 {stats['submit_ack_p99_ms']:.1f}ms, "
+              f"results p50 {stats['results_p50_ms']:.1f}ms p99 {stats['results_p99_ms']:.1f}ms")
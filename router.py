@@ -0,0 +1,152 @@
+import os
+import sys
+import json
+import random
+import signal
+import subprocess
+import time
+import urllib.request
+import eventlet
+eventlet.monkey_patch()
+import eventlet.hubs
+import eventlet.wsgi
+from flask import Flask, jsonify, redirect, request
+from flask_socketio import SocketIO
+
+# --- Configuration ---
+# One app.py worker is one process, one core and one venue. The router hands each main screen a free
+# worker and sends phones to the worker that owns their room code. Sockets go straight to the worker,
+# so the router is only on the path for the initial HTTP redirect.
+ROUTER_PORT = int(os.environ.get('HFF_ROUTER_PORT', '8000'))
+WORKER_COUNT = int(os.environ.get('HFF_WORKERS', str(os.cpu_count() or 1)))
+WORKER_BASE_PORT = int(os.environ.get('HFF_WORKER_BASE_PORT', '5001'))
+WORKER_HOST = os.environ.get('HFF_WORKER_HOST', '127.0.0.1')
+MESSAGE_QUEUE = os.environ.get('HFF_MESSAGE_QUEUE') # Shared with the workers so the router can emit into any venue
+READY_TIMEOUT = 120 # Seconds to wait for every worker's /ready
+ROOM_CODE_LETTERS = 'BCDFGHJKLMNPQRSTVWXZ' # Same alphabet as app.py
+# Pre-fork: load and freeze the banks here once, then fork workers that share them copy-on-write.
+# Needs os.fork (not on Windows); HFF_PREFORK=0 starts each worker as its own app.py instead.
+PREFORK = hasattr(os, 'fork') and os.environ.get('HFF_PREFORK', '1') != '0'
+
+blocking_time = eventlet.patcher.original('time')
+script_dir = os.path.dirname(os.path.abspath(__file__))
+app = Flask(__name__)
+workers = {} # {room_code: {'port': int, 'process': Popen}}
+main_screen_claims = {} # {room_code: monotonic time handed out}, so two screens opening at once get different venues
+CLAIM_SECONDS = 30 # How long a handed-out venue stays reserved before its main screen has to have registered
+
+class ForkedWorker:
+    """The bits of Popen's interface shutdown() uses, for a worker made with os.fork."""
+
+    def __init__(self, pid):
+        self.pid = pid
+
+    def terminate(self):
+        try: os.kill(self.pid, signal.SIGTERM)
+        except ProcessLookupError: pass
+
+    def wait(self, timeout=None):
+        deadline = time.monotonic() + (timeout or 0)
+        while True:
+            try:
+                if os.waitpid(self.pid, os.WNOHANG)[0]: return
+            except ChildProcessError: return
+            if timeout is not None and time.monotonic() > deadline: raise subprocess.TimeoutExpired(str(self.pid), timeout)
+            blocking_time.sleep(0.1) # shutdown() runs in the hub's signal handler, where green sleeps are refused
+
+def spawn_workers(count):
+    """Start `count` workers, each with its own port and room code."""
+    codes = set()
+    while len(codes) < count: codes.add(''.join(random.choices(ROOM_CODE_LETTERS, k=4)))
+    if PREFORK: fork_workers(sorted(codes))
+    else:
+        for index, code in enumerate(sorted(codes)):
+            env = dict(os.environ, HFF_PORT=str(WORKER_BASE_PORT + index), HFF_ROOM_CODE=code)
+            process = subprocess.Popen([sys.executable, os.path.join(script_dir, 'app.py')], cwd=script_dir, env=env,
+                                       stdout=subprocess.DEVNULL if os.environ.get('HFF_ROUTER_QUIET') else None)
+            workers[code] = {'port': WORKER_BASE_PORT + index, 'process': process}
+    print(f"[ROUTER] Spawned {count} workers ({'pre-forked' if PREFORK else 'separate processes'}): "
+          + ', '.join(f"{code}@{worker['port']}" for code, worker in workers.items()))
+
+def fork_workers(codes):
+    """
+    Loads every bank and template once, freezes them, then forks one worker per code. The workers
+    skip loading entirely, and only their own session state costs extra memory.
+    """
+    import app as game_server # Only the master of a pre-fork router imports the game
+    local_ip = game_server.run_startup()
+    frozen = game_server.freeze_shared_state()
+    print(f"[ROUTER] Banks loaded once in {game_server.startup_timings['total']*1000:.0f}ms; {frozen} objects frozen for sharing.")
+    for index, code in enumerate(codes):
+        port = WORKER_BASE_PORT + index
+        pid = os.fork()
+        if pid == 0:
+            try:
+                eventlet.hubs.use_hub() # A fresh hub: the inherited one shares its epoll instance with the master
+                if os.environ.get('HFF_ROUTER_QUIET'):
+                    devnull = os.open(os.devnull, os.O_WRONLY); os.dup2(devnull, 1)
+                game_server.configure_venue(code, port)
+                game_server.serve(local_ip)
+            finally:
+                os._exit(0) # Never fall back into the router's code
+        workers[code] = {'port': port, 'process': ForkedWorker(pid)}
+
+def worker_status(code):
+    """The worker's /ready body, or None while it is starting (503) or down."""
+    try:
+        with urllib.request.urlopen(f"http://{WORKER_HOST}:{workers[code]['port']}/ready", timeout=2) as response:
+            return json.loads(response.read())
+    except Exception:
+        return None
+
+def wait_for_workers():
+    deadline = time.monotonic() + READY_TIMEOUT
+    pending = set(workers)
+    while pending and time.monotonic() < deadline:
+        pending = {code for code in pending if not (worker_status(code) or {}).get('ready')}
+        if pending: eventlet.sleep(0.25)
+    if pending: print(f"[ROUTER] WARNING: workers not ready after {READY_TIMEOUT}s: {', '.join(sorted(pending))}")
+    else: print(f"[ROUTER] All {len(workers)} workers ready.")
+
+@app.route('/main')
+def main_screen_redirect():
+    """Give this main screen the first worker without one. Its join URL points phones back here."""
+    for code in workers:
+        if time.monotonic() - main_screen_claims.get(code, -CLAIM_SECONDS) < CLAIM_SECONDS: continue
+        status = worker_status(code)
+        if status and status.get('ready') and not status.get('main_screen'):
+            main_screen_claims[code] = time.monotonic()
+            join_url = f"http://{request.host}/{code}"
+            return redirect(f"http://{request.host.split(':')[0]}:{workers[code]['port']}/main?join={join_url}")
+    return "All venues are in use. Start the router with more workers (HFF_WORKERS).", 503
+
+@app.route('/rooms')
+def rooms():
+    return jsonify({code: dict(worker_status(code) or {'ready': False}, port=w['port']) for code, w in workers.items()})
+
+@app.route('/<code>')
+def player_redirect(code):
+    """Phones land here from the code on the main screen and are sent to that venue's worker."""
+    worker = workers.get(code.upper())
+    if not worker: return f"No game with room code {code.upper()}.", 404
+    return redirect(f"http://{request.host.split(':')[0]}:{worker['port']}/")
+
+def shutdown(*_):
+    """Tell every venue (through the queue, when there is one) before stopping the workers."""
+    if MESSAGE_QUEUE and MESSAGE_QUEUE != 'local://':
+        # Write-only manager: publishes into the workers' rooms without running a server of its own
+        announcer = SocketIO(message_queue=MESSAGE_QUEUE)
+        for code in workers:
+            announcer.emit('message', {'data': 'This server is shutting down.'}, to=f'players_room:{code}')
+    for worker in workers.values(): worker['process'].terminate()
+    for worker in workers.values(): worker['process'].wait(timeout=10)
+    print("[ROUTER] Workers stopped.")
+    sys.exit(0)
+
+if __name__ == '__main__':
+    spawn_workers(WORKER_COUNT)
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    wait_for_workers()
+    print(f"[ROUTER] Main screens: http://<this machine>:{ROUTER_PORT}/main  Status: /rooms")
+    eventlet.wsgi.server(eventlet.listen(('0.0.0.0', ROUTER_PORT)), app, log_output=False)